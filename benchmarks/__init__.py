@@ -0,0 +1,6 @@
+"""Benchmarks of the excel_in_python hot paths.
+
+Run them from the repository root with `python -m benchmarks run` and compare two runs with
+`python -m benchmarks compare`. The bench_*.py modules are not collected by the test suite,
+but `pytest benchmarks/bench_xmatch.py` runs a quick pass of one module as a smoke test.
+"""
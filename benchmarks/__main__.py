@@ -0,0 +1,79 @@
+"""Command line for the benchmarks: the run and compare commands of `python -m benchmarks`."""
+import argparse
+import importlib
+import pathlib
+import sys
+from benchmarks import harness
+
+
+def load_benchmarks():
+    """Imports every bench_*.py module of the package, registering its benchmarks."""
+    for path in sorted(pathlib.Path(__file__).parent.glob("bench_*.py")):
+        importlib.import_module(f"benchmarks.{path.stem}")
+
+
+def run(args):
+    """Times the benchmarks and optionally writes the results to a JSON file."""
+    load_benchmarks()
+    results = harness.run(args.filter, args.quick, args.repeat, args.min_time)
+    if args.output:
+        harness.save(results, args.output)
+        print(f"Saved {len(results['results'])} results to {args.output}")
+    return 0
+
+
+def compare(args):
+    """
+    Prints the change of each benchmark against a baseline and fails on regressions, or on
+    baseline cases missing from the current run with --require-all.
+    """
+    baseline, current = harness.load(args.baseline), harness.load(args.current)
+    rows = harness.compare(baseline, current, args.threshold)
+    for name, before, after, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{before:12.3e} {after:12.3e} {ratio:7.2f}x  {name} {flag}".rstrip())
+
+    missing = harness.missing(baseline, current)
+    for name in missing:
+        print(f"{'':12} {'':12} {'':8}  {name} MISSING")
+
+    regressions = sum(row[4] for row in rows)
+    print(f"{regressions} of {len(rows)} benchmarks more than "
+          f"{args.threshold:.0%} slower than the baseline")
+    if missing:
+        print(f"{len(missing)} baseline benchmarks missing from the current run")
+    return 1 if regressions or (missing and args.require_all) else 0
+
+
+def main(argv=None):
+    """Parses the command line and runs the chosen command, returning the exit status."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time the benchmarks")
+    run_parser.add_argument("-k", "--filter", help="only run cases whose name contains this")
+    run_parser.add_argument("-o", "--output", help="JSON file to write the results to")
+    run_parser.add_argument("--quick", action="store_true",
+                            help="only run the smallest size of each case")
+    run_parser.add_argument("--repeat", type=int, default=harness.REPEAT,
+                            help="timed repeats per case (default: %(default)s)")
+    run_parser.add_argument("--min-time", type=float, default=harness.MIN_TIME,
+                            help="seconds per repeat (default: %(default)s)")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="compare results with a baseline")
+    compare_parser.add_argument("baseline", help="JSON results of the baseline run")
+    compare_parser.add_argument("current", help="JSON results of the run to check")
+    compare_parser.add_argument("--threshold", type=float, default=harness.THRESHOLD,
+                                help="slowdown reported as a regression, as a fraction "
+                                     "(default: %(default)s)")
+    compare_parser.add_argument("--require-all", action="store_true",
+                                help="fail if a baseline case is missing from the current run")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Benchmarks of edate and eomonth over growing lists of dates, and of date over arrays."""
+from datetime import datetime, timedelta
+import numpy as np
+from benchmarks.data import SEED
+from benchmarks.harness import benchmark, smoke_test
+from excel_in_python.date import date, edate, eomonth
+
+SIZES = (10, 1_000, 100_000)
+FUNCTIONS = {"edate": edate, "eomonth": eomonth}
+
+
+def _start_dates(size):
+    """Returns a list of size datetimes spread over about 40 years."""
+    days = np.random.default_rng(SEED).integers(0, 15_000, size)
+    return [datetime(1990, 1, 1) + timedelta(days=int(day)) for day in days]
+
+
+@benchmark("edate_eomonth", function=tuple(FUNCTIONS), container=("list", "datetime64"),
+           size=SIZES)
+def setup_edate_eomonth(function, container, size):
+    """Shifts a list (or datetime64 array) of dates by a number of months."""
+    start_dates = _start_dates(size)
+    if container == "datetime64":
+        start_dates = np.array(start_dates, dtype="datetime64[D]")
+    return lambda: FUNCTIONS[function](start_dates, 7)
+
+
+@benchmark("date", dtype=("int64", "float64"), size=SIZES)
+def setup_date(dtype, size):
+    """Builds dates from arrays of years, months and days, some of them rolling over."""
+    rng = np.random.default_rng(SEED)
+    years = rng.integers(1900, 2100, size).astype(dtype)
+    months = rng.integers(1, 15, size).astype(dtype)
+    days = rng.integers(1, 35, size).astype(dtype)
+    return lambda: date(years, months, days)
+
+
+test_date = smoke_test("edate_eomonth", "date")
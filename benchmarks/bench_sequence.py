@@ -0,0 +1,26 @@
+"""Benchmarks of sequence up to MAX_ELEMENTS values, eager and lazy."""
+from benchmarks.harness import benchmark, smoke_test
+from excel_in_python import sequence
+from excel_in_python.sequence import MAX_ELEMENTS
+
+# (rows, columns) shapes from a thousand values up to the MAX_ELEMENTS limit
+SHAPES = ((100, 10), (1_000, 100), (MAX_ELEMENTS // 1_000, 1_000))
+DTYPES = ("int64", "float64", "int32")
+
+
+@benchmark("sequence", shape=SHAPES, dtype=DTYPES)
+def setup_sequence(shape, dtype):
+    """Builds a rows x columns sequence in dtype."""
+    rows, columns = shape
+    step = 0.5 if dtype == "float64" else 1
+    return lambda: sequence(rows, columns, start=1, step=step, dtype=dtype)
+
+
+@benchmark("sequence_lazy", shape=SHAPES)
+def setup_sequence_lazy(shape):
+    """Builds a lazy sequence and reads its last row."""
+    rows, columns = shape
+    return lambda: sequence(rows, columns, lazy=True)[-1]
+
+
+test_sequence = smoke_test("sequence", "sequence_lazy")
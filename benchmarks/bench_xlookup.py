@@ -0,0 +1,29 @@
+"""Benchmarks of single and batch xlookup with 1D and 2D return arrays."""
+import numpy as np
+from benchmarks.data import lookup_array, lookup_values
+from benchmarks.harness import benchmark, smoke_test
+from excel_in_python import xlookup
+from excel_in_python.enums import MatchMode
+
+SIZES = (1_000, 100_000)
+DTYPES = ("int64", "float64", "str")
+BATCH_SIZES = (1, 1_000)  # 1 is a scalar lookup value
+RETURN_COLUMNS = (1, 8)  # 1 is a 1D return array
+
+
+@benchmark("xlookup", match_mode=(MatchMode.EXACT, MatchMode.NEXT_SMALLER), batch=BATCH_SIZES,
+           columns=RETURN_COLUMNS, size=SIZES, dtype=DTYPES)
+def setup_xlookup(match_mode, batch, columns, size, dtype):
+    """Looks up a scalar or a batch of values, returning items or rows of the return array."""
+    array = lookup_array(size, dtype)
+    values = lookup_values(array, batch)
+    value = values[0] if batch == 1 else values
+
+    return_array = np.arange(size * columns, dtype=np.float64)
+    if columns > 1:
+        return_array = return_array.reshape(size, columns)
+
+    return lambda: xlookup(value, array, return_array, default=0, match_mode=match_mode)
+
+
+test_xlookup = smoke_test("xlookup")
@@ -0,0 +1,47 @@
+"""Benchmarks of xmatch and xmatch_many across match modes, search modes, sizes and dtypes."""
+from benchmarks.data import lookup_array, lookup_values
+from benchmarks.harness import benchmark, smoke_test
+from excel_in_python import xmatch, xmatch_many
+from excel_in_python.enums import MatchMode, SearchMode
+
+SIZES = (1_000, 100_000)
+DTYPES = ("int64", "float64", "str")
+BATCH_SIZE = 1_000
+PATTERN_BATCH_SIZE = 10  # Each pattern scans the whole lookup array
+
+PATTERNS = {MatchMode.WILDCARD: "k0000*5", MatchMode.REGEX: r"k0+\d5$"}
+
+
+def _applies(match_mode, search_mode, dtype):
+    """Returns True if match_mode and search_mode can be used together on dtype."""
+    if match_mode in PATTERNS:
+        return dtype == "str" and search_mode in (SearchMode.FROM_FIRST, SearchMode.FROM_LAST)
+    return True
+
+
+@benchmark("xmatch", match_mode=tuple(MatchMode), search_mode=tuple(SearchMode),
+           size=SIZES, dtype=DTYPES)
+def setup_xmatch(match_mode, search_mode, size, dtype):
+    """Looks up one value from the middle of the lookup array."""
+    if not _applies(match_mode, search_mode, dtype):
+        return None
+    array = lookup_array(size, dtype)
+    value = PATTERNS.get(match_mode, array[size // 2])
+    return lambda: xmatch(value, array, match_mode, search_mode)
+
+
+@benchmark("xmatch_many", match_mode=tuple(MatchMode), search_mode=tuple(SearchMode),
+           size=SIZES, dtype=DTYPES)
+def setup_xmatch_many(match_mode, search_mode, size, dtype):
+    """Looks up a batch of BATCH_SIZE values (or PATTERN_BATCH_SIZE patterns) at once."""
+    if not _applies(match_mode, search_mode, dtype):
+        return None
+    array = lookup_array(size, dtype)
+    if match_mode in PATTERNS:
+        values = [PATTERNS[match_mode]] * PATTERN_BATCH_SIZE
+    else:
+        values = lookup_values(array, BATCH_SIZE)
+    return lambda: xmatch_many(values, array, match_mode, search_mode)
+
+
+test_xmatch = smoke_test("xmatch", "xmatch_many")
@@ -0,0 +1,24 @@
+"""Deterministic inputs shared by the benchmarks."""
+import numpy as np
+
+SEED = 2024
+
+
+def lookup_array(size, dtype):
+    """Returns a sorted lookup array of size values with duplicates, as int64, float64 or str."""
+    values = np.sort(np.random.default_rng(SEED).integers(0, size, size))
+    if dtype == "str":
+        return np.char.add("k", np.char.zfill(values.astype(str), 9))
+    return values.astype(dtype)
+
+
+def lookup_values(array, count):
+    """Returns count values drawn from array, about one in ten of them missing from it."""
+    rng = np.random.default_rng(SEED + 1)
+    values = rng.choice(array, count)
+    missing = rng.random(count) < 0.1
+    if array.dtype.kind == "U":
+        values[missing] = "missing"
+    else:
+        values[missing] = -1
+    return values
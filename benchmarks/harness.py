@@ -0,0 +1,158 @@
+"""Registry, timer, JSON results and regression comparison for the benchmarks."""
+import itertools
+import json
+import platform
+import timeit
+from collections import namedtuple
+from datetime import datetime, timezone
+import numpy as np
+
+REPEAT = 5  # Number of timed repeats per case; the fastest is reported
+MIN_TIME = 0.05  # Seconds each repeat runs for, calling the case as many times as needed
+THRESHOLD = 0.25  # Relative slowdown over the baseline reported as a regression
+SIZE_PARAMS = ("size", "shape")  # Parameters of which quick runs only use the first value
+
+Case = namedtuple("Case", ["benchmark", "params", "setup"])
+
+BENCHMARKS = {}
+
+
+def benchmark(name, **params):
+    """
+    Registers setup as benchmark name, run for every combination of the params values.
+
+    setup is called with one value of each parameter and returns the zero-argument callable
+    to time, or None if the combination does not apply (e.g. a wildcard match on integers).
+    Size parameters (SIZE_PARAMS) should list the smallest value first, which is the only
+    one used by quick runs.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (params, setup)
+        return setup
+    return register
+
+
+def _label(value):
+    """Returns the name of a parameter value used in case names and results."""
+    if isinstance(value, tuple):
+        return "x".join(str(item) for item in value)
+    return getattr(value, "name", value)
+
+
+def case_name(case):
+    """Returns the unique name of case, e.g. xmatch[match_mode=EXACT,size=1000]."""
+    params = ",".join(f"{key}={_label(value)}" for key, value in case.params.items())
+    return f"{case.benchmark}[{params}]"
+
+
+def cases(pattern=None, quick=False, names=None):
+    """Returns the registered cases whose name contains pattern, smallest sizes only if quick.
+
+    names restricts the cases to those of the named benchmarks.
+    """
+    for name, (params, setup) in BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        values = [values[:1] if quick and key in SIZE_PARAMS else values
+                  for key, values in params.items()]
+        for combination in itertools.product(*values):
+            case = Case(name, dict(zip(params, combination)), setup)
+            if pattern is None or pattern in case_name(case):
+                yield case
+
+
+def time_case(case, repeat=REPEAT, min_time=MIN_TIME):
+    """Returns the timing result of case, or None if it does not apply."""
+    function = case.setup(**case.params)
+    if function is None:
+        return None
+
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time and number < 10**6:
+        number *= 10
+    times = np.array(timer.repeat(repeat, number)) / number
+
+    return {
+        "name": case_name(case),
+        "benchmark": case.benchmark,
+        "params": {key: _label(value) for key, value in case.params.items()},
+        "seconds": float(times.min()),
+        "median": float(np.median(times)),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(pattern=None, quick=False, repeat=REPEAT, min_time=MIN_TIME, report=print):
+    """Times the matching cases and returns the results with details of the environment."""
+    results = []
+    for case in cases(pattern, quick):
+        result = time_case(case, repeat, min_time)
+        if result is not None:
+            results.append(result)
+            report(f"{result['seconds']:12.3e} s  {result['name']}")
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def save(results, path):
+    """Writes run results to the JSON file at path."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+
+def load(path):
+    """Reads run results from the JSON file at path."""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """
+    Returns (name, baseline seconds, current seconds, ratio, regressed) for each case in
+    both runs.
+
+    A case has regressed when it is more than threshold (a fraction) slower than the
+    baseline. Cases missing from the current run are not compared; see missing().
+    """
+    baseline_seconds = {result["name"]: result["seconds"] for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        before = baseline_seconds.get(result["name"])
+        if before is None:
+            continue
+        ratio = result["seconds"] / before
+        rows.append((result["name"], before, result["seconds"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def missing(baseline, current):
+    """Returns the names of the baseline cases that are not in the current run, e.g. cases
+    renamed, deleted or filtered out with -k."""
+    current_names = {result["name"] for result in current["results"]}
+    return [result["name"] for result in baseline["results"]
+            if result["name"] not in current_names]
+
+
+def smoke_test(*names):
+    """Returns a pytest test that runs each quick case of the named benchmarks once."""
+    # imported here rather than at the top, so the command line runs without pytest
+    import pytest
+
+    def test_benchmark(case):
+        """Test that the benchmark case runs."""
+        function = case.setup(**case.params)
+        if function is not None:
+            function()
+
+    parametrize = pytest.mark.parametrize("case", list(cases(quick=True, names=names)),
+                                          ids=case_name)
+    return parametrize(test_benchmark)
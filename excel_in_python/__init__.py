@@ -1,3 +1,6 @@
 """ excel_in_python provides functions to perform Excel-like operations in Python. """
 from .xlookup import xlookup
-from .xmatch import xmatch
+from .xmatch import xmatch, xmatch_many
+from .lookup_index import LookupIndex
+from .sequence import sequence, SequenceArray
+from .async_lookup import AsyncLookup
@@ -0,0 +1,153 @@
+"""An asyncio facade that coalesces concurrent XLOOKUP calls into vectorized batches.
+
+Each awaited lookup is queued. A queue is resolved in one batch when it reaches
+max_batch_size values or max_wait seconds after its first value arrived, whichever comes
+first. The batch is resolved with a LookupIndex on an executor, off the event loop, and each
+caller receives its own result. Values of different types are resolved separately, so one
+caller's value never changes how another caller's value is converted or matched.
+"""
+import asyncio
+from collections import Counter, defaultdict, namedtuple
+import numpy as np
+from excel_in_python.enums import MatchMode, SearchMode
+from excel_in_python.lookup_index import LookupIndex
+from excel_in_python.utils import ensure_numpy_array
+from excel_in_python.xlookup import extract_result, get_orientation
+from excel_in_python.xmatch import NOT_FOUND, _resolve_modes
+
+MAX_BATCH_SIZE = 1024  # Default number of lookup values resolved in one batch
+MAX_WAIT = 0.001  # Default seconds a lookup waits for others to join its batch
+
+BatchInfo = namedtuple("BatchInfo", ["requests", "batches", "largest_batch", "batch_sizes"])
+_Failure = namedtuple("_Failure", ["error"])  # the error raised for one lookup value
+
+
+class AsyncLookup:
+    """
+    Resolves concurrent `await lookup(value)` calls in vectorized XLOOKUP batches.
+
+    The lookup array is indexed once. Each result is what xlookup(value, lookup_array,
+    return_array, default, match_mode, search_mode) returns for a single value. Batches run
+    on executor, or on the event loop's default executor when it is None.
+    """
+
+    def __init__(
+        self,
+        lookup_array,
+        return_array,
+        default=None,
+        match_mode=MatchMode.EXACT,
+        search_mode=SearchMode.FROM_FIRST,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_wait=MAX_WAIT,
+        executor=None,
+    ):
+        if isinstance(max_batch_size, bool) or not isinstance(max_batch_size, int) \
+                or max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer")
+        if isinstance(max_wait, bool) or not isinstance(max_wait, (int, float)) or max_wait < 0:
+            raise ValueError("max_wait must be a non-negative number of seconds")
+
+        self.index = LookupIndex(lookup_array)
+        self.return_array = ensure_numpy_array(return_array)
+        self.orientation = get_orientation(self.index.lookup_array, self.return_array)
+        self.default = default
+        self.match_mode, self.search_mode = _resolve_modes(match_mode, search_mode)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+
+        self._pending = []
+        self._timer = None
+        self._batch_sizes = Counter()
+
+    async def lookup(self, lookup_value):
+        """Returns the result for lookup_value once its batch has been resolved."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((lookup_value, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Sends the pending lookups to the executor as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self._batch_sizes[len(batch)] += 1
+        lookup_values = [value for value, _ in batch]
+        futures = [future for _, future in batch]
+
+        resolved = asyncio.get_running_loop().run_in_executor(
+            self.executor, self._resolve, lookup_values
+        )
+        resolved.add_done_callback(lambda done: self._fan_out(done, futures))
+
+    def _resolve(self, lookup_values):
+        """
+        Returns the result of each lookup value of a batch, as xlookup would, or a _Failure.
+
+        Values are grouped by type, so that e.g. an int is not converted to a string because
+        a string was looked up in the same batch. If a group cannot be resolved at once, its
+        values are resolved one at a time, so an error only reaches the caller it belongs to.
+        """
+        groups = defaultdict(list)
+        for position, lookup_value in enumerate(lookup_values):
+            groups[type(lookup_value)].append(position)
+
+        results = [None] * len(lookup_values)
+        for positions in groups.values():
+            values = [lookup_values[position] for position in positions]
+            try:
+                group_results = self._resolve_values(values)
+            except Exception:  # pylint: disable=broad-except
+                group_results = [self._resolve_value(value) for value in values]
+            for position, result in zip(positions, group_results):
+                results[position] = result
+        return results
+
+    def _resolve_value(self, lookup_value):
+        """Returns the result of a single lookup value, or a _Failure with its error."""
+        try:
+            return self._resolve_values([lookup_value])[0]
+        except Exception as error:  # pylint: disable=broad-except
+            return _Failure(error)
+
+    def _resolve_values(self, lookup_values):
+        """Returns the result of each of a list of lookup values of the same type."""
+        indices = self.index.xmatch_many(lookup_values, self.match_mode, self.search_mode)
+        missing = indices == NOT_FOUND
+        results = extract_result(self.return_array, np.where(missing, 0, indices),
+                                 self.orientation)
+        return [self.default if miss else result for miss, result in zip(missing, results)]
+
+    @staticmethod
+    def _fan_out(resolved, futures):
+        """Passes the result (or error) of each lookup value of a batch to its caller."""
+        error = resolved.exception()
+        results = [_Failure(error)] * len(futures) if error is not None else resolved.result()
+
+        for future, result in zip(futures, results):
+            if future.done():
+                continue  # the caller was cancelled
+            if isinstance(result, _Failure):
+                future.set_exception(result.error)
+            else:
+                future.set_result(result)
+
+    def info(self):
+        """Returns a BatchInfo of the requests and batches resolved so far, with the number of
+        batches of each size."""
+        sizes = dict(sorted(self._batch_sizes.items()))
+        return BatchInfo(sum(size * count for size, count in sizes.items()),
+                         sum(sizes.values()), max(sizes, default=0), sizes)
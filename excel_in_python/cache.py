@@ -0,0 +1,208 @@
+"""Cache of structures derived from lookup arrays, such as sort permutations.
+
+Sorting a lookup array (or building its occurrence tables) costs O(n log n), while searching
+the result costs O(log n). The module-level lookup_cache keeps recently used structures so
+repeated lookups against the same array skip the rebuild. It is bounded by entry count and
+by bytes, and evicts the least recently used entries first.
+"""
+import mmap
+import sys
+import threading
+import weakref
+import zlib
+from collections import OrderedDict, namedtuple
+import numpy as np
+from excel_in_python import instrumentation
+
+MAX_ENTRIES = 16  # Default number of derived structures kept in the cache
+MAX_BYTES = 256 * 2**20  # Default total size of the derived structures kept in the cache
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "entries", "nbytes",
+                                     "max_entries", "max_bytes"])
+
+
+_frozen_arrays = weakref.WeakValueDictionary()  # id -> arrays made read-only by freeze()
+
+
+def freeze(array):
+    """
+    Makes array read-only and returns it, trusting that it is never made writeable again.
+
+    NumPy lets the owner of an array turn its writeable flag back on, so a read-only flag
+    alone does not mean the contents cannot change. Arrays frozen here are identified in
+    O(1) by the lookup cache; only freeze arrays nothing will write to again.
+    """
+    array.flags.writeable = False
+    _frozen_arrays[id(array)] = array
+    return array
+
+
+def _is_read_only_buffer(buffer):
+    """Returns True if buffer exposes memory that cannot be written, e.g. bytes or a
+    read-only memory map."""
+    try:
+        with memoryview(buffer) as view:
+            return view.readonly
+    except TypeError:
+        return False
+
+
+def is_frozen(array):
+    """
+    Returns True if the contents of array cannot change.
+
+    array and every array it is a view of must be read-only, and the chain of bases must
+    end in an array passed to freeze() or in a read-only buffer such as bytes or a
+    memory map opened in read-only mode. An array that owns its data can be made writeable
+    again, so it is only frozen if freeze() was used.
+    """
+    while isinstance(array, np.ndarray):
+        if array.flags.writeable:
+            return False
+        if _frozen_arrays.get(id(array)) is array:
+            return True
+        array = array.base
+    return array is not None and _is_read_only_buffer(array)
+
+
+def array_fingerprint(array, hash_contents=True):
+    """
+    Returns a hashable key identifying the contents of array, or None.
+
+    Frozen arrays (see is_frozen) cannot change, so they are identified in O(1) by identity,
+    address, shape, strides and dtype. Other arrays are identified by a checksum of their
+    contents when hash_contents is True, which costs a pass over the data. Object arrays
+    hold pointers rather than values, so they cannot be checksummed and return None.
+    """
+    if is_frozen(array):
+        return ("frozen", id(array), array.__array_interface__["data"][0],
+                array.shape, array.strides, array.dtype.str)
+
+    if not hash_contents or array.dtype.kind == "O":
+        return None
+
+    data = np.ascontiguousarray(array)
+    if instrumentation.enabled and not array.flags.c_contiguous:
+        instrumentation.record_copy("array_fingerprint", data.nbytes)
+    return ("contents", array.shape, array.dtype.str, zlib.crc32(data), zlib.adler32(data))
+
+
+def _maps_file(array):
+    """Returns True if the chain of bases of array ends in a memory-mapped file."""
+    while isinstance(array, np.ndarray):
+        array = array.base
+    return isinstance(array, mmap.mmap)
+
+
+def estimate_nbytes(value):
+    """Returns an estimate of the memory held by a cached value.
+
+    Arrays that map a file are backed by the file rather than by process memory, so they
+    count as empty. Results of operations on np.memmap arrays, such as np.argsort, are
+    np.memmap instances too, but live in memory and are counted.
+    """
+    if isinstance(value, np.ndarray):
+        return 0 if _maps_file(value) else value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items()
+        )
+    if isinstance(getattr(value, "nbytes", None), int):
+        return value.nbytes  # e.g. arrays copied to shared memory
+    return sys.getsizeof(value)
+
+
+class ArrayCache:
+    """
+    A least-recently-used cache of values derived from arrays.
+
+    Entries are keyed on a name for the derived value and the array's fingerprint. Entries
+    for read-only arrays hold a weak reference to the array, so they are dropped when the
+    array is garbage collected and never served to a new array that reuses its id.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_build(self, name, array, fingerprint, build):
+        """Returns the cached value for (name, fingerprint), calling build(array) on a miss."""
+        key = (name, fingerprint)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                ref, value, _ = entry
+                if ref is None or ref() is array:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if instrumentation.enabled:
+                        instrumentation.record_cache(name, True)
+                    return value
+            self.misses += 1
+
+        if instrumentation.enabled:
+            instrumentation.record_cache(name, False)
+
+        value = build(array)
+        nbytes = estimate_nbytes(value)
+
+        if nbytes > self.max_bytes:
+            return value
+
+        ref = None
+        if fingerprint[0] == "frozen":
+            ref = weakref.ref(array, lambda _: self._discard(key))
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (ref, value, nbytes)
+            self.nbytes += nbytes
+
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self.nbytes > self.max_bytes):
+                self._discard(next(iter(self._entries)))
+
+        return value
+
+    def _discard(self, key):
+        """Removes the entry for key, if there is one."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.nbytes -= entry[2]
+
+    def info(self):
+        """Returns a CacheInfo snapshot of the cache statistics."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, len(self._entries), self.nbytes,
+                             self.max_entries, self.max_bytes)
+
+    def clear(self):
+        """Removes all entries from the cache and resets its statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.nbytes = 0
+
+
+lookup_cache = ArrayCache()
+
+
+def cache_info():
+    """Returns the hit/miss counts, size and limits of the lookup cache."""
+    return lookup_cache.info()
+
+
+def cache_clear():
+    """Removes all entries from the lookup cache and resets its statistics."""
+    lookup_cache.clear()
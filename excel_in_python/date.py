@@ -1,45 +1,63 @@
 """Date related Excel functions"""
-from datetime import datetime
+from datetime import date as date_class, datetime
+import functools
 import math  # For NaN
+import numbers
+from collections import namedtuple
 from collections.abc import Iterable
 import numpy as np
-from dateutil.relativedelta import relativedelta
 
-def date(year, month, day):
-    """Creates valid dates from year, month, and day inputs, handling overflows and sequences."""
+# Epochs of Excel's date systems. In the 1900 system serial 1 is 1900-01-01, but Excel treats
+# 1900 as a leap year, so from 1900-03-01 on the effective epoch is 1899-12-30.
+EXCEL_EPOCHS = {1900: np.datetime64("1899-12-30", "D"), 1904: np.datetime64("1904-01-01", "D")}
+LEAP_YEAR_BUG_END = np.datetime64("1900-03-01", "D")  # First date after Excel's 1900-02-29
+MONTH_TABLE_YEARS = (1900, 2200)  # Years covered by the precomputed month table
 
-    # Ensure only one argument is an array
-    array_args = [isinstance(arg, np.ndarray) for arg in (year, month, day)]
+def _date_from_parts(year, month, day):
+    """Vectorized DATE kernel over integer arrays.
 
-    if sum(array_args) > 1:
-        raise ValueError("Only one of year, month, or day may be an array.")
+    Months and days outside their usual range roll over, because the year and month are
+    combined into a count of months since 1970-01 and the day is added as an offset from
+    the start of that month.
+    """
+    months = (year - 1970) * 12 + (month - 1)
+    return months.astype("datetime64[M]").astype("datetime64[D]") + (day - 1)
+
+
+def date(year, month, day, as_serial=False, date_system=1900):
+    """Creates valid dates from year, month, and day inputs, handling overflows and sequences.
+
+    Any of year, month and day may be arrays, which are broadcast against each other, and
+    the result is a datetime64[D] array. If all arguments are scalars a datetime is returned.
+    Like Excel, months and days outside their usual range roll over into the adjacent months
+    and years, e.g. date(2024, 14, 35) is 2025-03-07 and day 0 is the last day of the
+    previous month. Fractional arguments are truncated. With `as_serial=True`, Excel serial
+    numbers in `date_system` are returned instead of dates.
+    """
 
     # If an argument is an array, ensure it is at most 2D
     for arg in (year, month, day):
         if isinstance(arg, np.ndarray) and arg.ndim > 2:
             raise ValueError("year, month, and day must be scalars or 1D or 2D arrays.")
 
-    # Convert the array argument to at least 1D, but leave scalars untouched
-    if isinstance(year, np.ndarray):
-        array_arg, fixed1, fixed2 = year, month, day
-        def func(y):
-            return datetime(y, fixed1, fixed2)
-    elif isinstance(month, np.ndarray):
-        array_arg, fixed1, fixed2 = month, year, day
-        def func(m):
-            return datetime(fixed1, m, fixed2)
-    elif isinstance(day, np.ndarray):
-        array_arg, fixed1, fixed2 = day, year, month
-        def func(d):
-            return datetime(fixed1, fixed2, d)
-    else:
-        # If all arguments are scalars, just return a single datetime object
-        return datetime(year, month, day)
+    args = [np.asarray(arg) for arg in (year, month, day)]
+    if not all(arg.dtype.kind in "biuf" for arg in args):
+        raise ValueError("year, month, and day must be numeric.")
 
-    # Vectorize the function for broadcasting
-    vectorized_func = np.vectorize(func)
+    year, month, day = (np.trunc(arg).astype(np.int64) for arg in args)
+    dates = _date_from_parts(year, month, day)
 
-    return vectorized_func(array_arg)
+    if as_serial:
+        return to_serial(dates, date_system)
+
+    if dates.ndim > 0:
+        return dates
+
+    # If all arguments are scalars, just return a single datetime object
+    value = dates.item()
+    if value is None or isinstance(value, int):
+        raise ValueError("year, month, and day must give a date between years 1 and 9999.")
+    return datetime(value.year, value.month, value.day)
 
 
 def _adjust_date(start_date, months, day=None):
@@ -48,38 +66,646 @@ def _adjust_date(start_date, months, day=None):
     If `day` is specified (e.g., 31), it moves to the last day of the target month (EOMONTH).
     If `day` is None, it keeps the same day of the month if possible (EDATE).
     """
+    # dateutil is imported here so that importing the package stays cheap
+    from dateutil.relativedelta import relativedelta  # pylint: disable=import-outside-toplevel
+
     if isinstance(start_date, datetime):
         if day is None:
             return (start_date + relativedelta(months=months)).date()
         return (start_date + relativedelta(months=months, day=31)).date()
     return math.nan  # Return NaN for invalid elements
 
-def _adjust_month(start_date, months, day=None):
+def _is_date_array(start_date):
+    """Returns True for NumPy arrays and array-likes such as pandas DatetimeIndex or Series."""
+    return hasattr(start_date, "__array__") and np.ndim(start_date) > 0
+
+
+def _to_datetime64(start_date, unit="D"):
+    """Converts dates to a datetime64 array, with NaT for elements that are not dates.
+
+    datetime.date elements are converted too; a datetime is also a date.
+    """
+    if getattr(getattr(start_date, "dtype", None), "kind", None) == "M":
+        return np.asarray(start_date).astype(f"datetime64[{unit}]")
+
+    values = np.asarray(start_date, dtype=object)
+    dates = [value if isinstance(value, (date_class, np.datetime64)) else None
+             for value in values.ravel().tolist()]
+    return np.array(dates, dtype=f"datetime64[{unit}]").reshape(values.shape)
+
+
+MonthTable = namedtuple("MonthTable", ["first_day", "month_starts", "day_months"])
+
+
+@functools.lru_cache(maxsize=4)
+def month_table(first_year, last_year):
+    """Returns a precomputed MonthTable for the years first_year..last_year.
+
+    - `first_day` is the first day of the table as days since 1970-01-01.
+    - `month_starts[i]` is the first day of month i of the table as days since 1970-01-01,
+      with one extra entry for the month after the last, so the length of month i is
+      `month_starts[i + 1] - month_starts[i]`.
+    - `day_months[d]` is the month of the table containing day `first_day + d`.
+
+    Tables are built once and shared across calls.
+    """
+    months = np.arange((first_year - 1970) * 12, (last_year - 1970 + 1) * 12 + 1)
+    month_starts = months.astype("datetime64[M]").astype("datetime64[D]").view(np.int64)
+    day_months = np.repeat(np.arange(len(months) - 1, dtype=np.int32), np.diff(month_starts))
+
+    month_starts.flags.writeable = False
+    day_months.flags.writeable = False
+    return MonthTable(int(month_starts[0]), month_starts, day_months)
+
+
+def _shift_months_general(start_date, months, end_of_month):
+    """Vectorized EDATE / EOMONTH over a datetime64[D] array for dates of any year.
+
+    Month arithmetic is done on datetime64[M] values, and the day of the month is clamped
+    to the length of the target month. NaT elements stay NaT.
+    """
+    month = start_date.astype("datetime64[M]")
+    target = month + months
+    next_month_start = (target + 1).astype("datetime64[D]")
+
+    if end_of_month:
+        return next_month_start - 1
+
+    target_start = target.astype("datetime64[D]")
+    day_offset = start_date - month.astype("datetime64[D]")
+    return target_start + np.minimum(day_offset, next_month_start - target_start - 1)
+
+
+def _shift_months(start_date, months, end_of_month):
+    """Vectorized EDATE / EOMONTH over a datetime64[D] array.
+
+    Month starts and lengths are looked up in the shared month table, so clamping the day
+    of the month is integer indexing rather than calendar arithmetic. Arrays with dates
+    (before or after shifting) outside MONTH_TABLE_YEARS use the general path.
+    """
+    start_date = np.asarray(start_date, dtype="datetime64[D]")
+    first_day, month_starts, day_months = month_table(*MONTH_TABLE_YEARS)
+
+    missing = np.isnat(start_date)
+    day_idx = np.where(missing, first_day, start_date.view(np.int64)) - first_day
+
+    if not np.all((day_idx >= 0) & (day_idx < len(day_months))):
+        return _shift_months_general(start_date, months, end_of_month)
+
+    month_idx = day_months[day_idx]
+    target_idx = month_idx + months
+
+    if not np.all((target_idx >= 0) & (target_idx < len(month_starts) - 1)):
+        return _shift_months_general(start_date, months, end_of_month)
+
+    next_month_start = month_starts[target_idx + 1]
+
+    if end_of_month:
+        days = next_month_start - 1
+    else:
+        target_start = month_starts[target_idx]
+        day_offset = day_idx + first_day - month_starts[month_idx]
+        days = target_start + np.minimum(day_offset, next_month_start - target_start - 1)
+
+    shifted = np.where(missing, np.datetime64("NaT", "D"), np.asarray(days).view("datetime64[D]"))
+    return shifted if shifted.ndim > 0 else shifted[()]
+
+
+def _validate_months(months):
+    """Returns months as an int, or as an int64 array when an array of months is given."""
+    if isinstance(months, (int, np.integer)):
+        return int(months)
+
+    if isinstance(months, (np.ndarray, list, tuple)):
+        months = np.asarray(months)
+        if months.dtype.kind in "iu":
+            return months.astype(np.int64)
+
+    raise ValueError("months must be an integer.")
+
+
+def _adjust_month(start_date, months, day=None, as_serial=False, date_system=1900):
     """Adjusts the date by a given number of months.
 
     - If `day=None`, it behaves like `EDATE`.
     - If `day=31`, it behaves like `EOMONTH`.
 
-    If `start_date` is an iterable, applies the function to each element.
-    Returns NaN for invalid elements in iterables.
+    If `start_date` is a NumPy array of datetime64 values or a pandas DatetimeIndex or Series,
+    or if `months` is an array, the months are shifted in one vectorized step and a
+    datetime64[D] array is returned, with NaT for invalid elements. `start_date` and
+    `months` are broadcast against each other, so e.g. a column of start dates and a row of
+    months give a 2D schedule. A numeric NumPy array of `start_date` values is read as Excel
+    serial numbers in `date_system`, and `as_serial=True` returns serial numbers instead of
+    dates.
+
+    If `start_date` is any other iterable, applies the function to each element and returns
+    a list. Returns NaN for invalid elements in iterables.
     """
+    months = _validate_months(months)
+    end_of_month = day is not None
+
+    if isinstance(start_date, np.ndarray) and start_date.dtype.kind in "iuf":
+        start_date = from_serial(start_date, date_system, unit="D")
+
+    if isinstance(start_date, datetime) and (as_serial or isinstance(months, np.ndarray)):
+        start_date = np.datetime64(start_date, "D")
+
+    is_iterable = isinstance(start_date, Iterable) and not isinstance(start_date, (str, datetime))
+    vectorized = (
+        _is_date_array(start_date)
+        or isinstance(start_date, np.datetime64)
+        or (is_iterable and (as_serial or isinstance(months, np.ndarray)))
+    )
 
-    if isinstance(start_date, Iterable) and not isinstance(start_date, (str, datetime)):
-        return [_adjust_date(date, months, day) for date in start_date]
+    if vectorized:
+        shifted = _shift_months(_to_datetime64(start_date), months, end_of_month)
+        return to_serial(shifted, date_system) if as_serial else shifted
+
+    if is_iterable:
+        shifted = _shift_months(_to_datetime64(list(start_date)), months, end_of_month)
+        return [math.nan if date is None else date for date in shifted.tolist()]
 
     if not isinstance(start_date, datetime):
         raise ValueError("start_date must be a datetime object.")
-    if not isinstance(months, int):
-        raise ValueError("months must be an integer.")
 
     return _adjust_date(start_date, months, day)
 
+
 # Define EDATE and EOMONTH using the helper function
-def edate(start_date, months):
+def edate(start_date, months, as_serial=False, date_system=1900):
     """Returns the date that is the indicated number of months before or after start_date."""
-    return _adjust_month(start_date, months, day=None)
+    return _adjust_month(start_date, months, day=None,
+                         as_serial=as_serial, date_system=date_system)
 
-def eomonth(start_date, months):
+def eomonth(start_date, months, as_serial=False, date_system=1900):
     """Returns the last day of the month that is the indicated number of months before or
     after start_date."""
-    return _adjust_month(start_date, months, day=31)
+    return _adjust_month(start_date, months, day=31,
+                         as_serial=as_serial, date_system=date_system)
+
+
+# Excel's WORKDAY.INTL / NETWORKDAYS.INTL weekend codes, as weekend strings of seven 0/1 flags
+# for Monday..Sunday, where 1 marks a weekend day.
+WEEKEND_CODES = {
+    1: "0000011", 2: "1000001", 3: "1100000", 4: "0110000", 5: "0011000", 6: "0001100",
+    7: "0000110", 11: "0000001", 12: "1000000", 13: "0100000", 14: "0010000", 15: "0001000",
+    16: "0000100", 17: "0000010",
+}
+CALENDAR_CACHE_SIZE = 32  # Number of holiday calendars kept by holiday_calendar
+
+
+def _weekend_string(weekend):
+    """Returns weekend (an Excel weekend code or weekend string) as a weekend string."""
+    if isinstance(weekend, (int, np.integer)) and int(weekend) in WEEKEND_CODES:
+        return WEEKEND_CODES[int(weekend)]
+
+    if (isinstance(weekend, str) and len(weekend) == 7 and set(weekend) <= {"0", "1"}
+            and weekend != "1111111"):
+        return weekend
+
+    raise ValueError("weekend must be a weekend code or a string of seven 0s and 1s "
+                     "with at least one workday.")
+
+
+def _holiday_days(holidays, date_system=1900):
+    """Returns holidays as a sorted tuple of unique days since 1970-01-01.
+
+    Holidays may be dates or Excel serial numbers in `date_system`. Missing values (None,
+    NaT and NaN) are ignored, and a ValueError is raised for anything else that is not a date.
+    """
+    if holidays is None:
+        return ()
+    if isinstance(holidays, (date_class, np.datetime64, numbers.Number)):
+        holidays = [holidays]
+    elif not hasattr(holidays, "__array__") and not isinstance(holidays, (list, tuple)):
+        holidays = list(holidays)  # e.g. a set of dates
+
+    values = np.asarray(holidays)
+    if values.dtype.kind in "iuf":
+        days = np.asarray(from_serial(values, date_system, unit="D")).ravel()
+        missing = np.isnan(values.astype(np.float64)).ravel()
+    else:
+        days = _to_datetime64(values).ravel()
+        # None, or values that are not equal to themselves, such as NaT and NaN
+        missing = np.array([value is None or value != value
+                            for value in values.astype(object).ravel().tolist()], dtype=bool)
+
+    if (np.isnat(days) & ~missing).any():
+        raise ValueError("holidays must be dates or Excel serial numbers.")
+
+    days = days[~np.isnat(days)].astype(np.int64)
+    return tuple(np.unique(days).tolist())
+
+
+class HolidayCalendar:
+    """
+    A business-day calendar of weekend days and holidays, wrapping np.busdaycalendar.
+
+    `weekend` is an Excel weekend code (1 for Saturday and Sunday, the default) or a weekend
+    string such as "0000011". Build calendars with holiday_calendar(), which caches them by
+    weekend and holiday set, so repeated WORKDAY and NETWORKDAYS calls over the same holidays
+    reuse one calendar instead of rebuilding it. Numeric holidays are read as Excel serial
+    numbers in `date_system`.
+    """
+
+    def __init__(self, holidays=None, weekend=1, date_system=1900):
+        self.weekend = _weekend_string(weekend)
+        self.holiday_days = _holiday_days(holidays, date_system)
+        self.busdaycalendar = np.busdaycalendar(
+            weekmask="".join("1" if flag == "0" else "0" for flag in self.weekend),
+            holidays=np.array(self.holiday_days, dtype=np.int64).view("datetime64[D]"),
+        )
+
+    @property
+    def holidays(self):
+        """The holidays of the calendar that are workdays, as a sorted datetime64[D] array."""
+        return self.busdaycalendar.holidays
+
+    def __repr__(self):
+        return f"HolidayCalendar(holidays={len(self.holidays)} days, weekend='{self.weekend}')"
+
+
+@functools.lru_cache(maxsize=CALENDAR_CACHE_SIZE)
+def _cached_calendar(weekend, holiday_days):
+    """Returns the HolidayCalendar for a weekend string and a tuple of holiday days."""
+    return HolidayCalendar(np.array(holiday_days, dtype=np.int64).view("datetime64[D]"), weekend)
+
+
+def holiday_calendar(holidays=None, weekend=1, date_system=1900):
+    """Returns a cached HolidayCalendar for the holidays and weekend.
+
+    `holidays` may be a date, an iterable or array of dates or of Excel serial numbers in
+    `date_system`, or a HolidayCalendar, whose holidays are combined with `weekend`.
+    Calendars are cached on the weekend string and the set of holiday days, so the same
+    holidays give the same calendar whatever their order.
+    """
+    weekend = _weekend_string(weekend)
+    if isinstance(holidays, HolidayCalendar):
+        if holidays.weekend == weekend:
+            return holidays
+        return _cached_calendar(weekend, holidays.holiday_days)
+    return _cached_calendar(weekend, _holiday_days(holidays, date_system))
+
+
+def _business_dates(dates, date_system):
+    """Converts dates, or a numeric array of Excel serial numbers, to a datetime64[D] array."""
+    if isinstance(dates, np.ndarray) and dates.dtype.kind in "iuf":
+        return np.asarray(from_serial(dates, date_system, unit="D"))
+    return _to_datetime64(dates)
+
+
+def _by_weekend(kernel, weekend, holidays, *arrays, date_system=1900):
+    """Calls kernel(calendar, *arrays), once per distinct weekend if weekend is an array."""
+    if np.ndim(weekend) == 0:
+        weekend = weekend.item() if isinstance(weekend, np.generic) else weekend
+        return kernel(holiday_calendar(holidays, weekend, date_system), *arrays)
+
+    if not isinstance(weekend, np.ndarray):
+        weekend = np.array(weekend, dtype=object)  # keep weekend codes apart from strings
+    *arrays, weekend = np.broadcast_arrays(*arrays, weekend)
+    # object arrays may mix weekend codes and weekend strings, which cannot be sorted
+    codes = set(weekend.ravel().tolist()) if weekend.dtype.kind == "O" else np.unique(weekend)
+    result = None
+    for code in codes:
+        selected = weekend == code
+        code = code.item() if isinstance(code, np.generic) else code
+        part = kernel(holiday_calendar(holidays, code, date_system),
+                      *(array[selected] for array in arrays))
+        if result is None:
+            result = np.empty(weekend.shape, dtype=part.dtype)
+        elif result.dtype != part.dtype:
+            result = result.astype(np.result_type(result, part))
+        result[selected] = part
+    return result
+
+
+def _workday_kernel(calendar, start, days):
+    """Moves each start date by days workdays of calendar."""
+    start, days = np.broadcast_arrays(start, days)
+    result = start.copy()
+
+    # busday_offset counts from a workday, so non-workday starts roll towards the offset
+    for selected, roll in ((days > 0, "backward"), (days < 0, "forward")):
+        if selected.any():
+            result[selected] = np.busday_offset(start[selected], days[selected], roll=roll,
+                                                busdaycal=calendar.busdaycalendar)
+    return result
+
+
+def _networkdays_kernel(calendar, start, end):
+    """Counts the workdays of calendar from start to end inclusive, negative if end < start."""
+    start, end = np.broadcast_arrays(start, end)
+    missing = np.isnat(start) | np.isnat(end)
+    if missing.any():
+        start = np.where(missing, np.datetime64(0, "D"), start)
+        end = np.where(missing, np.datetime64(0, "D"), end)
+
+    earlier, later = np.minimum(start, end), np.maximum(start, end)
+    count = np.busday_count(earlier, later + 1, busdaycal=calendar.busdaycalendar)
+    count = np.where(start <= end, count, -count)
+
+    return np.where(missing, np.nan, count) if missing.any() else count
+
+
+def _validate_days(days):
+    """Returns days as an int64 array, truncating fractional days as Excel does."""
+    days = np.asarray(days)
+    if days.dtype.kind not in "biuf":
+        raise ValueError("days must be numeric.")
+    if days.dtype.kind == "f":
+        if not np.isfinite(days).all():
+            raise ValueError("days must be numeric.")
+        days = np.trunc(days)
+    return days.astype(np.int64)
+
+
+def workday_intl(start_date, days, weekend=1, holidays=None, as_serial=False,
+                 date_system=1900):
+    """Returns the date that is the indicated number of workdays before or after start_date.
+
+    Weekend days are given by `weekend`, an Excel weekend code or weekend string, and
+    `holidays` may be dates, Excel serial numbers or a HolidayCalendar. `start_date`, `days`
+    and `weekend` are broadcast against each other, and a datetime64[D] array is returned,
+    with NaT for invalid dates. A numeric NumPy array of `start_date` values is read as Excel
+    serial numbers, and `as_serial=True` returns serial numbers instead. If all arguments are
+    scalars, a datetime is returned.
+    """
+    start = _business_dates(start_date, date_system)
+    result = _by_weekend(_workday_kernel, weekend, holidays, start, _validate_days(days),
+                         date_system=date_system)
+
+    if as_serial:
+        return to_serial(result, date_system)
+    if result.ndim > 0:
+        return result
+    if np.isnat(result):
+        raise ValueError("start_date must be a datetime object.")
+    return datetime.combine(result.item(), datetime.min.time())
+
+
+def workday(start_date, days, holidays=None, as_serial=False, date_system=1900):
+    """Returns the date that is the indicated number of workdays before or after start_date,
+    with Saturday and Sunday as the weekend."""
+    return workday_intl(start_date, days, 1, holidays, as_serial, date_system)
+
+
+def networkdays_intl(start_date, end_date, weekend=1, holidays=None, date_system=1900):
+    """Returns the number of workdays from start_date to end_date, inclusive.
+
+    The count is negative when end_date is before start_date. Weekend days are given by
+    `weekend`, an Excel weekend code or weekend string, and `holidays` may be dates, Excel
+    serial numbers or a HolidayCalendar. The dates and `weekend` are broadcast against each
+    other and an int64 array is returned, or a float64 array with NaN where a date is
+    invalid. If all arguments are scalars, an int is returned.
+    """
+    start = _business_dates(start_date, date_system)
+    end = _business_dates(end_date, date_system)
+    result = _by_weekend(_networkdays_kernel, weekend, holidays, start, end,
+                         date_system=date_system)
+
+    if result.ndim > 0:
+        return result
+    if np.isnan(result):
+        raise ValueError("start_date and end_date must be datetime objects.")
+    return int(result)
+
+
+def networkdays(start_date, end_date, holidays=None, date_system=1900):
+    """Returns the number of workdays from start_date to end_date, inclusive, with Saturday
+    and Sunday as the weekend."""
+    return networkdays_intl(start_date, end_date, 1, holidays, date_system)
+
+
+DATEDIF_UNITS = ("Y", "M", "D", "MD", "YM", "YD")
+
+
+MONTH_LENGTHS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def _date_parts(dates):
+    """Returns the years, months (1-12) and days (1-31) of a datetime64[D] array.
+
+    Dates within MONTH_TABLE_YEARS are split with the shared month table.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    first_day, month_starts, day_months = month_table(*MONTH_TABLE_YEARS)
+    day_idx = dates.view(np.int64) - first_day
+
+    if np.all((day_idx >= 0) & (day_idx < len(day_months))):
+        month_idx = day_months[day_idx].astype(np.int64)
+        days = day_idx + first_day - month_starts[month_idx] + 1
+        month_numbers = month_idx + (MONTH_TABLE_YEARS[0] - 1970) * 12
+    else:
+        months = dates.astype("datetime64[M]")
+        days = (dates - months).astype(np.int64) + 1
+        month_numbers = months.astype(np.int64)
+
+    return month_numbers // 12 + 1970, month_numbers % 12 + 1, days
+
+
+def _is_leap_year(years):
+    """Returns True where years are leap years in the Gregorian calendar."""
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+def _year_starts(years):
+    """Returns January 1 of years as days since 1970-01-01."""
+    def leap_years_before(year):
+        return (year - 1) // 4 - (year - 1) // 100 + (year - 1) // 400
+
+    return 365 * (years - 1970) + leap_years_before(years) - leap_years_before(1970)
+
+
+def _days_in_month(years, months):
+    """Returns the number of days in the given months (1-12) of years."""
+    return MONTH_LENGTHS[months - 1] + ((months == 2) & _is_leap_year(years))
+
+
+def _date_pairs(start_date, end_date, date_system):
+    """Returns the broadcast datetime64[D] start and end dates and a mask of missing pairs.
+
+    Missing pairs are replaced by 1970-01-01 so they pass through the kernels harmlessly.
+    """
+    start, end = np.broadcast_arrays(_business_dates(start_date, date_system),
+                                     _business_dates(end_date, date_system))
+    missing = np.isnat(start) | np.isnat(end)
+    if missing.any():
+        start = np.where(missing, np.datetime64(0, "D"), start)
+        end = np.where(missing, np.datetime64(0, "D"), end)
+    return start, end, missing
+
+
+def _days_360(start, end, european):
+    """Returns the days from start to end (start <= end) in a 30/360 day count.
+
+    The US (NASD) method follows Excel's YEARFRAC, in which the end-of-February adjustments
+    only apply when neither date is the 31st.
+    """
+    year1, month1, day1 = _date_parts(start)
+    year2, month2, day2 = _date_parts(end)
+
+    if european:
+        day1, day2 = np.minimum(day1, 30), np.minimum(day2, 30)
+    else:
+        both_31 = (day1 == 31) & (day2 == 31)
+        start_31 = (day1 == 31) & ~both_31
+        end_31 = (day1 == 30) & (day2 == 31)
+        rest = ~(both_31 | start_31 | end_31)
+        start_feb_end = rest & (month1 == 2) & (day1 == _days_in_month(year1, 2))
+        both_feb_end = start_feb_end & (month2 == 2) & (day2 == _days_in_month(year2, 2))
+
+        day1 = np.where(both_31 | start_31 | start_feb_end, 30, day1)
+        day2 = np.where(both_31 | end_31 | both_feb_end, 30, day2)
+
+    return (year2 - year1) * 360 + (month2 - month1) * 30 + (day2 - day1)
+
+
+def _actual_year_length(start, end):
+    """Returns the year length used by the actual/actual basis for start <= end."""
+    year1, month1, day1 = _date_parts(start)
+    year2, month2, day2 = _date_parts(end)
+
+    within_a_year = (year1 == year2) | (
+        (year1 + 1 == year2) & ((month1 > month2) | ((month1 == month2) & (day1 >= day2)))
+    )
+    leap1, leap2 = _is_leap_year(year1), _is_leap_year(year2)
+    year_start1, year_start2 = _year_starts(year1), _year_starts(year2)
+    spans_leap_day = (
+        ((year1 == year2) & leap1)
+        | (leap1 & (start.view(np.int64) < year_start1 + 60))  # on or before February 29
+        | (leap2 & (end.view(np.int64) >= year_start2 + 59))  # on or after February 29
+    )
+    short_length = np.where(spans_leap_day, 366.0, 365.0)
+
+    # otherwise the average length of the calendar years from year1 to year2
+    years_days = year_start2 + 365 + leap2 - year_start1
+    average_length = years_days / (year2 - year1 + 1)
+
+    return np.where(within_a_year, short_length, average_length)
+
+
+def yearfrac(start_date, end_date, basis=0, date_system=1900):
+    """Returns the fraction of a year between start_date and end_date.
+
+    `basis` is the day count basis: 0 for US (NASD) 30/360, 1 for actual/actual, 2 for
+    actual/360, 3 for actual/365 and 4 for European 30/360. As in Excel, the order of the
+    dates does not matter. The dates are broadcast against each other and a float64 array is
+    returned, with NaN where a date is invalid. If both dates are scalars, a float is
+    returned.
+    """
+    if basis not in (0, 1, 2, 3, 4) or isinstance(basis, bool):
+        raise ValueError("basis must be 0, 1, 2, 3 or 4.")
+
+    start, end, missing = _date_pairs(start_date, end_date, date_system)
+    start, end = np.minimum(start, end), np.maximum(start, end)
+    days = (end - start).astype(np.int64)
+
+    match basis:
+        case 0 | 4:
+            fraction = _days_360(start, end, european=basis == 4) / 360
+        case 1:
+            fraction = days / _actual_year_length(start, end)
+        case 2:
+            fraction = days / 360
+        case 3:
+            fraction = days / 365
+
+    fraction = np.where(missing, np.nan, fraction)
+    return fraction if fraction.ndim > 0 else float(fraction)
+
+
+def datedif(start_date, end_date, unit, date_system=1900):
+    """Returns the number of complete years, months or days between start_date and end_date.
+
+    `unit` is one of "Y" (years), "M" (months), "D" (days), "MD" (days, ignoring months and
+    years), "YM" (months, ignoring years) or "YD" (days, ignoring years). As in Excel, "MD"
+    can be negative when the start day is later than the days in the month before end_date.
+    The dates are broadcast against each other and an int64 array is returned, or a float64
+    array with NaN where a date is invalid or start_date is after end_date. If both dates are
+    scalars, an int is returned.
+    """
+    unit = unit.upper() if isinstance(unit, str) else unit
+    if unit not in DATEDIF_UNITS:
+        raise ValueError('unit must be one of "Y", "M", "D", "MD", "YM" or "YD".')
+
+    start, end, missing = _date_pairs(start_date, end_date, date_system)
+    missing = missing | (start > end)
+    year1, month1, day1 = _date_parts(start)
+    year2, month2, day2 = _date_parts(end)
+    months = (year2 - year1) * 12 + (month2 - month1) - (day2 < day1)
+
+    match unit:
+        case "Y":
+            result = months // 12
+        case "M":
+            result = months
+        case "D":
+            result = (end - start).astype(np.int64)
+        case "MD":
+            end_month = end.astype("datetime64[M]")
+            days_in_previous_month = (end_month.astype("datetime64[D]")
+                                      - (end_month - 1).astype("datetime64[D]")).astype(np.int64)
+            result = day2 - day1 + np.where(day2 < day1, days_in_previous_month, 0)
+        case "YM":
+            result = months % 12
+        case "YD":
+            anniversary = _date_from_parts(year2, month1, day1)
+            anniversary = np.where(anniversary > end,
+                                   _date_from_parts(year2 - 1, month1, day1), anniversary)
+            result = (end - anniversary).astype(np.int64)
+
+    if np.ndim(result) == 0 and not missing:
+        return int(result)
+    if np.ndim(result) == 0:
+        raise ValueError("start_date and end_date must be datetime objects, "
+                         "with start_date on or before end_date.")
+    return np.where(missing, np.nan, result) if missing.any() else result
+
+
+def _epoch(date_system):
+    """Returns the datetime64 epoch of an Excel date system."""
+    if date_system not in EXCEL_EPOCHS:
+        raise ValueError("date_system must be 1900 or 1904.")
+    return EXCEL_EPOCHS[date_system]
+
+
+def to_serial(dates, date_system=1900):
+    """Converts dates to Excel serial numbers, i.e. float64 days since the date system's epoch.
+
+    Times of day are kept as fractions of a day. In the 1900 date system, dates before
+    1900-03-01 are shifted by a day to reproduce Excel's fictitious 1900-02-29. Dates before
+    the start of the date system and invalid dates give NaN.
+    """
+    epoch = _epoch(date_system)
+
+    if getattr(getattr(dates, "dtype", None), "kind", None) == "M":
+        dates = np.asarray(dates)
+    else:
+        dates = _to_datetime64(dates, unit="us")
+
+    serials = (dates - epoch) / np.timedelta64(1, "D")
+
+    if date_system == 1900:
+        serials = serials - (dates < LEAP_YEAR_BUG_END)
+
+    serials = np.where(serials >= 0, serials, np.nan)
+    return serials if serials.ndim > 0 else float(serials)
+
+
+def from_serial(serials, date_system=1900, unit="ms"):
+    """Converts Excel serial numbers to a datetime64 array in the given unit.
+
+    Fractions of a day are kept as times, rounded to the millisecond. In the 1900 date system,
+    serial numbers below 60 are shifted by a day to skip Excel's fictitious 1900-02-29, which
+    itself maps to 1900-02-28. Negative and NaN serial numbers give NaT.
+    """
+    epoch = _epoch(date_system)
+    serials = np.asarray(serials, dtype=np.float64)
+
+    days = np.where(serials < 60, serials + 1, serials) if date_system == 1900 else serials
+    invalid = ~(serials >= 0)
+    milliseconds = np.round(np.where(invalid, 0, days) * 86_400_000).astype(np.int64)
+
+    dates = epoch.astype("datetime64[ms]") + milliseconds.astype("timedelta64[ms]")
+    dates = np.where(invalid, np.datetime64("NaT"), dates).astype(f"datetime64[{unit}]")
+    return dates if dates.ndim > 0 else dates[()]
@@ -0,0 +1,251 @@
+"""Opt-in instrumentation of the lookup hot paths.
+
+While instrumentation is enabled, excel_in_python records how much time each phase of a
+lookup takes (validation, conversion to NumPy arrays, sorting, searching and extraction of
+results). It also records calls per match and search mode, input sizes, array copies and
+lookup cache hits and misses. Use stats() for a snapshot of everything recorded since the
+last reset(), profile() to record a block of code on its own, and add_hook() to forward each
+event to a callback.
+
+Calls are counted per public function, including nested ones: a batch xlookup also counts
+the xmatch_many call it makes. Copies are the arrays allocated from the inputs: lists
+converted to arrays, contiguous copies checksummed for the lookup cache, sorted, lower-cased,
+string-cast and shared memory copies of lookup arrays, and results promoted for a default.
+
+Instrumentation costs nothing while it is disabled. Phase functions are registered with the
+phase decorator, and only enable() swaps them for timing wrappers in the package's modules;
+disable() restores the originals. Other events are recorded behind a single check of
+`enabled`. Phase times are exclusive: time spent in a nested phase, such as the conversion
+inside validation, counts only towards the nested phase. Work done in worker processes is
+not recorded.
+"""
+import contextlib
+import functools
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, namedtuple
+
+PHASES = ("validation", "conversion", "sort", "search", "extraction")
+
+Event = namedtuple("Event", ["kind", "name", "value", "details"])
+PhaseStats = namedtuple("PhaseStats", ["calls", "seconds"])
+CacheStats = namedtuple("CacheStats", ["hits", "misses", "hit_rate"])
+Stats = namedtuple("Stats", ["calls", "modes", "phases", "lookup_values",
+                             "lookup_array_elements", "largest_lookup_array", "copies",
+                             "copied_bytes", "cache", "cache_hit_rate"])
+
+enabled = False  # True while instrumentation is recording; read it, use enable() to set it
+
+_phase_functions = {}  # id of each registered function -> (function, phase)
+_wrappers = {}  # id of each timing wrapper -> (wrapper, original function)
+_local = threading.local()
+_lock = threading.Lock()
+_hooks = []
+
+
+def _hit_rate(hits, misses):
+    """Returns the fraction of lookups that were hits, or None if there were none."""
+    return hits / (hits + misses) if hits + misses else None
+
+
+class Recorder:
+    """Accumulates instrumentation events into counters for a Stats snapshot."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discards everything recorded so far."""
+        with self._lock:
+            self._calls = Counter()
+            self._modes = Counter()
+            self._phase_calls = Counter()
+            self._phase_seconds = defaultdict(float)
+            self._lookup_values = self._lookup_array_elements = self._largest = 0
+            self._copies = self._copied_bytes = 0
+            self._cache = defaultdict(lambda: [0, 0])
+
+    def record(self, event):
+        """Adds event to the counters."""
+        with self._lock:
+            match event.kind:
+                case "phase":
+                    self._phase_calls[event.name] += 1
+                    self._phase_seconds[event.name] += event.value
+                case "call":
+                    size = event.details["lookup_array_size"]
+                    self._calls[event.name] += 1
+                    self._modes[event.details["match_mode"], event.details["search_mode"]] += 1
+                    self._lookup_values += event.value
+                    self._lookup_array_elements += size
+                    self._largest = max(self._largest, size)
+                case "copy":
+                    self._copies += 1
+                    self._copied_bytes += event.value
+                case "cache":
+                    self._cache[event.name][0 if event.value else 1] += 1
+
+    def stats(self):
+        """Returns a Stats snapshot of the counters."""
+        with self._lock:
+            cache = {name: CacheStats(hits, misses, _hit_rate(hits, misses))
+                     for name, (hits, misses) in self._cache.items()}
+            return Stats(
+                calls=dict(self._calls),
+                modes=dict(self._modes),
+                phases={name: PhaseStats(self._phase_calls[name], self._phase_seconds[name])
+                        for name in PHASES if name in self._phase_calls},
+                lookup_values=self._lookup_values,
+                lookup_array_elements=self._lookup_array_elements,
+                largest_lookup_array=self._largest,
+                copies=self._copies,
+                copied_bytes=self._copied_bytes,
+                cache=cache,
+                cache_hit_rate=_hit_rate(sum(entry.hits for entry in cache.values()),
+                                         sum(entry.misses for entry in cache.values())),
+            )
+
+
+_recorder = Recorder()
+_recorders = (_recorder,)
+
+
+def _emit(kind, name, value, details=None):
+    """Passes an event to the active recorders and hooks."""
+    event = Event(kind, name, value, details)
+    for recorder in _recorders:
+        recorder.record(event)
+    for hook in _hooks:
+        hook(event)
+
+
+def record_call(function, match_mode, search_mode, lookup_array_size, lookup_values):
+    """Records a call of a lookup function. Only call it while instrumentation is enabled."""
+    _emit("call", function, lookup_values, {"match_mode": match_mode,
+                                            "search_mode": search_mode,
+                                            "lookup_array_size": lookup_array_size})
+
+
+def record_copy(where, nbytes):
+    """Records an array copy of nbytes bytes. Only call it while instrumentation is enabled."""
+    _emit("copy", where, nbytes)
+
+
+def record_cache(name, hit):
+    """Records a lookup cache hit or miss. Only call it while instrumentation is enabled."""
+    _emit("cache", name, hit)
+
+
+def phase(name):
+    """Registers the decorated function as part of phase name; it is timed while enabled."""
+    if name not in PHASES:
+        raise ValueError(f"phase must be one of {', '.join(PHASES)}")
+
+    def register(function):
+        _phase_functions[id(function)] = (function, name)
+        return function
+    return register
+
+
+def _timed(function, name):
+    """Returns a wrapper of function that records the exclusive time spent in it."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stack = _local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            _emit("phase", name, elapsed - nested, {"function": function.__qualname__})
+    return wrapper
+
+
+def _swap_functions(replacements):
+    """Replaces the functions in replacements (by id) throughout the package's modules."""
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not (module_name == __package__
+                                  or module_name.startswith(__package__ + ".")):
+            continue
+        namespace = vars(module)
+        for attribute, value in list(namespace.items()):
+            replacement = replacements.get(id(value))
+            if replacement is not None and replacement[0] is value:
+                namespace[attribute] = replacement[1]
+
+
+def enable():
+    """Starts recording, swapping the registered phase functions for timing wrappers."""
+    global enabled
+    with _lock:
+        if enabled:
+            return
+        replacements = {}
+        for function, name in _phase_functions.values():
+            wrapper = _timed(function, name)
+            replacements[id(function)] = (function, wrapper)
+            _wrappers[id(wrapper)] = (wrapper, function)
+        _swap_functions(replacements)
+        enabled = True
+
+
+def disable():
+    """Stops recording and restores the original phase functions."""
+    global enabled
+    with _lock:
+        if not enabled:
+            return
+        enabled = False
+        _swap_functions(_wrappers)
+        _wrappers.clear()
+
+
+def stats():
+    """Returns a Stats snapshot of everything recorded since the last reset()."""
+    return _recorder.stats()
+
+
+def reset():
+    """Discards everything recorded so far."""
+    _recorder.reset()
+
+
+def add_hook(callback):
+    """Calls callback(event) with an Event for each phase, call, copy and cache lookup."""
+    global _hooks
+    _hooks = _hooks + [callback]
+
+
+def remove_hook(callback):
+    """Stops calling callback for events."""
+    global _hooks
+    _hooks = [hook for hook in _hooks if hook != callback]
+
+
+@contextlib.contextmanager
+def profile():
+    """
+    Records the enclosed block on its own, yielding a Recorder whose stats() covers it.
+
+    Instrumentation is enabled for the block, and disabled again afterwards unless it was
+    already enabled. Events in the block are also recorded in the global stats(). Events
+    from every thread are recorded while the block runs, so the worker threads of lookups
+    with workers= are included, as are lookups that other threads make meanwhile.
+    """
+    global _recorders
+    recorder = Recorder()
+    was_enabled = enabled
+    _recorders = _recorders + (recorder,)
+    enable()
+    try:
+        yield recorder
+    finally:
+        _recorders = tuple(active for active in _recorders if active is not recorder)
+        if not was_enabled:
+            disable()
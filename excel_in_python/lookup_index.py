@@ -0,0 +1,291 @@
+"""A reusable index over a lookup array for repeated XMATCH and XLOOKUP calls.
+
+An index over a lookup array stored in a .npy file can be saved next to it as a sidecar
+directory of .npy files, which later processes open memory-mapped instead of re-sorting.
+"""
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from excel_in_python import instrumentation
+from excel_in_python.cache import array_fingerprint, lookup_cache
+from excel_in_python.enums import MatchMode, SearchMode
+from excel_in_python.utils import ensure_numpy_array
+from excel_in_python.xmatch import (
+    NOT_FOUND,
+    OccurrenceTable,
+    _argsort,
+    _exact_index,
+    _match_many,
+    _occurrence_runs,
+    _occurrence_tables,
+    _pattern_index,
+    _resolve_modes,
+    _sort_lookup_array,
+    _validate_lookup_array,
+)
+from excel_in_python.xlookup import gather_results, get_orientation
+
+SIDECAR_VERSION = 1  # Format version of index sidecars; older sidecars are rebuilt
+SIDECAR_SUFFIX = ".index"  # Appended to the lookup array's file name to name its sidecar
+SIDECAR_ARRAYS = ("sorted_indices", "sorted_lookup_array", "unique_values",
+                  "first_indices", "last_indices")
+HASH_CHUNK_SIZE = 2**22  # Number of bytes read at a time when hashing a lookup array file
+
+
+def _file_signature(path, with_hash=True):
+    """Returns the size, modification time and (optionally) SHA-256 of the file at path."""
+    stat = os.stat(path)
+    signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            while chunk := file.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        signature["sha256"] = digest.hexdigest()
+
+    return signature
+
+
+def _read_sidecar(path, lookup_array, verify_hash):
+    """Returns the memory-mapped arrays of the sidecar of path, or None if it is missing,
+    from another format version or stale."""
+    sidecar = path + SIDECAR_SUFFIX
+    try:
+        with open(os.path.join(sidecar, "meta.json"), encoding="utf-8") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    signature = _file_signature(path, with_hash=verify_hash)
+    expected = {key: meta.get("source", {}).get(key) for key in signature}
+    if (meta.get("version") != SIDECAR_VERSION or signature != expected
+            or meta.get("dtype") != lookup_array.dtype.str
+            or meta.get("length") != len(lookup_array)):
+        return None
+
+    try:
+        return {name: np.load(os.path.join(sidecar, f"{name}.npy"), mmap_mode="r")
+                for name in SIDECAR_ARRAYS}
+    except (OSError, ValueError):
+        return None
+
+
+def _sidecar_arrays(sorted_indices, sorted_lookup_array):
+    """Returns the arrays stored in an index sidecar."""
+    run_starts, run_ends = _occurrence_runs(sorted_lookup_array)
+    return {
+        "sorted_indices": sorted_indices,
+        "sorted_lookup_array": sorted_lookup_array,
+        "unique_values": sorted_lookup_array[run_starts],
+        "first_indices": sorted_indices[run_starts],
+        "last_indices": sorted_indices[run_ends],
+    }
+
+
+def _write_sidecar(path, arrays):
+    """Writes arrays and their metadata to the sidecar of path, replacing any old sidecar."""
+    sidecar = path + SIDECAR_SUFFIX
+    staging = f"{sidecar}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    for name in SIDECAR_ARRAYS:
+        np.save(os.path.join(staging, f"{name}.npy"), arrays[name])
+
+    meta = {"version": SIDECAR_VERSION, "source": _file_signature(path),
+            "dtype": arrays["sorted_lookup_array"].dtype.str,
+            "length": len(arrays["sorted_lookup_array"])}
+    with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+
+    shutil.rmtree(sidecar, ignore_errors=True)
+    os.replace(staging, sidecar)
+
+
+class LookupIndex:
+    """
+    A lookup array prepared once for many XMATCH and XLOOKUP calls.
+
+    The lookup array is validated and converted once, and its sort permutation, sorted values
+    and value -> first/last index tables are computed when the index is built. Lookups then
+    only pay for the search itself. The match and search modes behave as in xmatch and xlookup.
+    Object arrays whose elements cannot be ordered, such as None among strings, have no sort
+    permutation, and exact matches against them are resolved value by value as in xmatch.
+    """
+
+    def __init__(self, lookup_array):
+        self.lookup_array = _validate_lookup_array(lookup_array)
+        try:
+            self.sorted_indices, self.sorted_lookup_array = _sort_lookup_array(
+                self.lookup_array, SearchMode.FROM_FIRST
+            )
+        except TypeError:
+            self.sorted_indices = self.sorted_lookup_array = None
+            self.first_index = self.last_index = None
+        else:
+            self.first_index, self.last_index = _occurrence_tables(
+                self.sorted_indices, self.sorted_lookup_array
+            )
+
+    def __len__(self):
+        return self.lookup_array.size
+
+    def save(self, path):
+        """Saves the lookup array to the .npy file at path, with an index sidecar for open().
+
+        As with np.save, ".npy" is appended to path if it does not already end with it.
+        """
+        if self.lookup_array.dtype.kind == "O":
+            raise ValueError("lookup arrays of Python objects cannot be saved")
+
+        path = os.fspath(path)
+        if not path.endswith(".npy"):
+            path += ".npy"
+        np.save(path, self.lookup_array)
+        _write_sidecar(path, _sidecar_arrays(self.sorted_indices, self.sorted_lookup_array))
+
+    @classmethod
+    def open(cls, path, rebuild=True, verify_hash=False):
+        """
+        Opens the lookup array in the .npy file at path memory-mapped, with its index sidecar.
+
+        The sidecar (the directory path + ".index") holds the sort permutation, sorted values
+        and first/last occurrences of each unique value. It is used if its format version
+        matches and the file's size and modification time (and SHA-256, if verify_hash is
+        True) are the ones it was built for. Otherwise the index is rebuilt and saved when
+        rebuild is True, or a ValueError is raised. The opened index is also registered in
+        the lookup cache, so xmatch and xlookup on its memory-mapped lookup_array do not
+        sort it either.
+        """
+        path = os.fspath(path)
+        lookup_array = _validate_lookup_array(np.load(path, mmap_mode="r"))
+
+        if lookup_array.dtype.kind == "O":
+            raise ValueError("lookup arrays of Python objects cannot be memory-mapped")
+
+        arrays = _read_sidecar(path, lookup_array, verify_hash)
+        if arrays is None:
+            if not rebuild:
+                raise ValueError(f"index sidecar for {path} is missing or out of date")
+            _write_sidecar(path, _sidecar_arrays(*_argsort(np.asarray(lookup_array))))
+            arrays = _read_sidecar(path, lookup_array, verify_hash=False)
+
+        index = cls.__new__(cls)
+        index.lookup_array = lookup_array
+        index.sorted_indices = arrays["sorted_indices"]
+        index.sorted_lookup_array = arrays["sorted_lookup_array"]
+        index.first_index = OccurrenceTable(arrays["unique_values"], arrays["first_indices"])
+        index.last_index = OccurrenceTable(arrays["unique_values"], arrays["last_indices"])
+
+        fingerprint = array_fingerprint(lookup_array)
+        lookup_cache.get_or_build("sort", lookup_array, fingerprint,
+                                  lambda _: (index.sorted_indices, index.sorted_lookup_array))
+        lookup_cache.get_or_build("occurrence_tables", lookup_array, fingerprint,
+                                  lambda _: (index.first_index, index.last_index))
+        return index
+
+    def _sorted_lookup(self, search_mode):
+        """Returns the (sorted_indices, sorted_lookup_array) pair used for search_mode."""
+        if search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.BINARY_FROM_LAST):
+            # the data are assumed to be already sorted, as in xmatch
+            return None, self.lookup_array
+        if self.sorted_lookup_array is None:
+            return None  # sorted (and failing to sort) as in xmatch_many
+        return self.sorted_indices, self.sorted_lookup_array
+
+    def xmatch(
+        self, lookup_value, match_mode=MatchMode.EXACT, search_mode=SearchMode.FROM_FIRST
+    ):
+        """Returns the index of the match for lookup_value, or None if there is no match."""
+        match_mode, search_mode = _resolve_modes(match_mode, search_mode)
+
+        if instrumentation.enabled:
+            instrumentation.record_call("LookupIndex.xmatch", match_mode, search_mode,
+                                        self.lookup_array.size, 1)
+
+        match match_mode:
+            case MatchMode.EXACT if (
+                self.first_index is not None
+                and search_mode in (SearchMode.FROM_FIRST, SearchMode.FROM_LAST)
+            ):
+                table = (self.first_index
+                         if search_mode == SearchMode.FROM_FIRST
+                         else self.last_index)
+                try:
+                    return table.get(lookup_value)
+                except TypeError:
+                    pass  # unhashable lookup values fall back to the binary search
+
+            case MatchMode.REGEX | MatchMode.WILDCARD:
+                return _pattern_index(lookup_value, self.lookup_array, match_mode, search_mode)
+
+        idx = self.xmatch_many([lookup_value], match_mode, search_mode)[0]
+        return None if idx == NOT_FOUND else int(idx)
+
+    def xmatch_many(
+        self,
+        lookup_values,
+        match_mode=MatchMode.EXACT,
+        search_mode=SearchMode.FROM_FIRST,
+        workers=None,
+        executor=None,
+    ):
+        """Returns an array of match indices, with NOT_FOUND (-1) where there is no match.
+
+        workers and executor resolve large batches in parallel, as in xmatch_many.
+        """
+        match_mode, search_mode = _resolve_modes(match_mode, search_mode)
+        lookup_values = np.atleast_1d(ensure_numpy_array(lookup_values))
+
+        if lookup_values.ndim != 1:
+            raise ValueError("lookup_values must be 1D")
+
+        if instrumentation.enabled:
+            instrumentation.record_call("LookupIndex.xmatch_many", match_mode, search_mode,
+                                        self.lookup_array.size, lookup_values.size)
+
+        if (self.sorted_lookup_array is None and match_mode == MatchMode.EXACT
+                and search_mode in (SearchMode.FROM_FIRST, SearchMode.FROM_LAST)):
+            indices = [_exact_index(value, self.lookup_array, search_mode)
+                       for value in lookup_values]
+            return np.array([NOT_FOUND if idx is None else idx for idx in indices],
+                            dtype=np.intp)
+
+        return _match_many(
+            lookup_values, self.lookup_array, match_mode, search_mode,
+            sorted_lookup=self._sorted_lookup(search_mode), workers=workers, executor=executor,
+        )
+
+    def xlookup(
+        self,
+        lookup_value,
+        return_array,
+        default=None,
+        match_mode=MatchMode.EXACT,
+        search_mode=SearchMode.FROM_FIRST,
+        workers=None,
+        executor=None,
+    ):
+        """Returns the item(s) of return_array corresponding to the match(es) for lookup_value.
+
+        workers and executor resolve large batches in parallel, as in xlookup.
+        """
+        return_array = ensure_numpy_array(return_array)
+        orientation = get_orientation(self.lookup_array, return_array)
+
+        if instrumentation.enabled:
+            instrumentation.record_call("LookupIndex.xlookup",
+                                        *_resolve_modes(match_mode, search_mode),
+                                        self.lookup_array.size, np.size(lookup_value))
+
+        if np.ndim(lookup_value) == 0:
+            idx = self.xmatch(lookup_value, match_mode, search_mode)
+            indices = np.array([NOT_FOUND if idx is None else idx])
+        else:
+            indices = self.xmatch_many(lookup_value, match_mode, search_mode, workers, executor)
+
+        return gather_results(lookup_value, indices, return_array, orientation, default,
+                              workers=workers, executor=executor)
@@ -0,0 +1,220 @@
+"""Parallel execution of batch lookups on thread and process pools.
+
+Binary searches, comparisons and np.take release the GIL, so a batch of lookup values split
+into chunks can be resolved on several cores at once by threads sharing the same read-only
+lookup array. Chunks are contiguous and their results are assembled in chunk order, so the
+output does not depend on how the work is scheduled.
+
+Regex matching holds the GIL, so WILDCARD and REGEX scans are spread over a pool of worker
+processes instead. The lookup array is copied once into shared memory, which every worker
+maps without copying, and each worker scans one contiguous partition of it. Process pools
+and the SHARED_ARRAYS most recently used shared copies are kept and reused across calls.
+"""
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import functools
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+import os
+import threading
+import weakref
+import numpy as np
+from excel_in_python import instrumentation
+from excel_in_python.cache import freeze
+
+MIN_CHUNK_SIZE = 2**14  # Fewest lookup values worth handing to a thread
+SHARED_ARRAYS = 4  # Number of shared copies of lookup arrays kept for worker processes
+
+
+def _validate_workers(workers):
+    """Returns workers, raising ValueError unless it is None or a positive integer."""
+    if workers is not None and (
+        isinstance(workers, bool) or not isinstance(workers, int) or workers < 1
+    ):
+        raise ValueError("workers must be a positive integer")
+    return workers
+
+
+@functools.lru_cache(maxsize=8)
+def shared_executor(workers):
+    """Returns a pool of workers threads, shared by every call that asks for as many."""
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="excel_in_python")
+
+
+def chunk_bounds(size, chunks):
+    """Returns (start, stop) pairs splitting range(size) into contiguous, near-equal chunks."""
+    edges = [size * i // chunks for i in range(chunks + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def run_chunks(function, size, workers=None, executor=None):
+    """
+    Calls function(start, stop) over contiguous chunks of range(size) and returns the results
+    in chunk order.
+
+    The chunks run on executor if one is given, or otherwise on a shared pool of workers
+    threads. With neither, with workers=1, or when size is too small to be worth splitting
+    into chunks of MIN_CHUNK_SIZE, function is called once in the calling thread.
+    """
+    workers = _validate_workers(workers)
+    if executor is None and workers in (None, 1):
+        return [function(0, size)]
+
+    chunks = min(workers or os.cpu_count() or 1, max(1, size // MIN_CHUNK_SIZE))
+    if chunks == 1:
+        return [function(0, size)]
+
+    executor = executor or shared_executor(workers)
+    futures = [executor.submit(function, start, stop)
+               for start, stop in chunk_bounds(size, chunks)]
+    return [future.result() for future in futures]
+
+
+def _validate_processes(processes):
+    """Returns processes, raising ValueError unless it is a positive integer."""
+    if isinstance(processes, bool) or not isinstance(processes, int) or processes < 1:
+        raise ValueError("processes must be a positive integer")
+    return processes
+
+
+def _release_shared_memory(memory):
+    """Closes and removes a shared memory block created by this process."""
+    memory.close()
+    memory.unlink()
+
+
+class SharedArray:
+    """
+    A read-only copy of an array in shared memory, for worker processes to map by name.
+
+    The shared memory is removed when the SharedArray is garbage collected (or at exit), so
+    keeping it in the shared array registry (see share_array) ties its lifetime to the entry.
+    """
+
+    def __init__(self, array):
+        self._memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=self._memory.buf)[...] = array
+        self.descriptor = (self._memory.name, array.shape, array.dtype.str)
+        weakref.finalize(self, _release_shared_memory, self._memory)
+
+    @property
+    def nbytes(self):
+        """The size of the shared copy."""
+        return self._memory.size
+
+
+def _untrack_shared_memory():
+    """
+    Worker process initializer: stops Python < 3.13 from tracking the shared memory that
+    workers attach to, so their resource tracker never removes memory the parent owns.
+    """
+    register = resource_tracker.register
+
+    def register_unless_shared_memory(name, rtype):
+        if rtype != "shared_memory":
+            register(name, rtype)
+
+    resource_tracker.register = register_unless_shared_memory
+
+
+_shared_arrays = OrderedDict()  # fingerprint -> (weak reference or None, SharedArray)
+_shared_arrays_lock = threading.Lock()
+
+
+def share_array(array, fingerprint):
+    """
+    Returns a SharedArray copy of array, reusing the copy made for the same fingerprint.
+
+    Shared copies are kept in a registry of their own rather than in the lookup cache, as
+    the huge arrays worth sharing would not fit within its byte limit. The SHARED_ARRAYS
+    most recently used copies are kept; older ones are removed from shared memory. Copies of
+    frozen arrays are dropped when the array is garbage collected, like lookup cache entries.
+    """
+    with _shared_arrays_lock:
+        entry = _shared_arrays.get(fingerprint)
+        if entry is not None and (entry[0] is None or entry[0]() is array):
+            _shared_arrays.move_to_end(fingerprint)
+            return entry[1]
+
+        shared = SharedArray(array)
+        if instrumentation.enabled:
+            instrumentation.record_copy("share_array", array.nbytes)
+        ref = None
+        if fingerprint[0] == "frozen":
+            ref = weakref.ref(array, lambda _: _discard_shared_array(fingerprint, shared))
+        _shared_arrays[fingerprint] = (ref, shared)
+        while len(_shared_arrays) > SHARED_ARRAYS:
+            _shared_arrays.popitem(last=False)
+        return shared
+
+
+def _discard_shared_array(fingerprint, shared):
+    """Removes the registry entry for fingerprint if it still holds shared."""
+    with _shared_arrays_lock:
+        entry = _shared_arrays.get(fingerprint)
+        if entry is not None and entry[1] is shared:
+            del _shared_arrays[fingerprint]
+
+
+def shared_array_names():
+    """Returns the names of the shared memory blocks of the shared copies still kept."""
+    with _shared_arrays_lock:
+        return frozenset(shared.descriptor[0] for _, shared in _shared_arrays.values())
+
+
+def clear_shared_arrays():
+    """Drops every shared copy kept, removing it from shared memory once unused."""
+    with _shared_arrays_lock:
+        _shared_arrays.clear()
+
+
+_attached = {}  # Shared arrays mapped by this (worker) process, by name
+
+
+def _detach(name):
+    """Unmaps the shared array name in this (worker) process."""
+    memory, array = _attached.pop(name)
+    del array
+    try:
+        memory.close()
+    except BufferError:
+        pass  # still in use by a running task; it is closed when collected
+
+
+def attach_shared_array(descriptor, live_names=None):
+    """Returns a read-only view of the shared array with the given descriptor, in a worker.
+
+    Arrays stay mapped, so repeated tasks over the same lookup array map it once. live_names
+    are the names of the shared arrays the parent still keeps (see shared_array_names);
+    arrays mapped earlier that are no longer among them are unmapped, so workers do not pin
+    memory the parent has removed.
+    """
+    name, shape, dtype = descriptor
+    if live_names is not None:
+        for old_name in [old_name for old_name in _attached
+                         if old_name != name and old_name not in live_names]:
+            _detach(old_name)
+
+    if name not in _attached:
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # before Python 3.13, tracking is turned off by the initializer
+            memory = shared_memory.SharedMemory(name=name)
+        array = freeze(np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+        _attached[name] = (memory, array)
+
+    return _attached[name][1]
+
+
+@functools.lru_cache(maxsize=4)
+def shared_process_pool(processes):
+    """Returns a pool of processes worker processes, shared by every call that asks for as
+    many, so workers are started once rather than on every call.
+
+    Workers are spawned, which is safe whatever threads the parent process is running.
+    """
+    return ProcessPoolExecutor(
+        max_workers=_validate_processes(processes),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_untrack_shared_memory,
+    )
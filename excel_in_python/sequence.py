@@ -16,29 +16,380 @@ Excel has limited support for dynamic arrays between workbooks, and this scenari
 supported when both workbooks are open. If you close the source workbook, any linked dynamic 
 array formulas will return a #REF! error when they are refreshed.
 """
+from datetime import date, datetime, timedelta
+import numbers
 import numpy as np
 
 MAX_ELEMENTS = 10**7  # Safety limit to prevent excessive memory usage
+CHUNK_ELEMENTS = 2**16  # Default number of elements in each block from sequence_chunks
 
-def sequence(rows=1, columns=1, start=1, step=1):
-    """Return a 2D array of sequential numbers, mimicking Excel's SEQUENCE behavior."""
 
+def _as_numpy_scalar(value):
+    """Converts Python dates and timedeltas to their NumPy equivalents."""
+    if isinstance(value, datetime):
+        return np.datetime64(value, "us")
+    if isinstance(value, date):
+        return np.datetime64(value, "D")
+    if isinstance(value, timedelta):
+        whole_days = not (value.seconds or value.microseconds)
+        return np.timedelta64(value.days, "D") if whole_days else np.timedelta64(value, "us")
+    return value
 
-    if not all(isinstance(arg, (int, float)) for arg in (rows, columns, start, step)):
+
+def _validate_ranges(start, step, rows, columns):
+    """Returns array start and step broadcast to a (rows, 1) or (1, columns) shape.
+
+    1D arrays give one value per row; pass a (1, columns) array for one value per column.
+    A single value in an array is returned as a scalar.
+    """
+    start, step = np.asarray(start), np.asarray(step)
+
+    if start.dtype.kind == "M":
+        if step.dtype.kind != "m":
+            raise ValueError("step must be a timedelta when start is a date")
+    elif start.dtype.kind not in "iuf" or step.dtype.kind not in "iuf":
+        raise ValueError("All arguments must be numeric")
+
+    start, step = (x.reshape(-1, 1) if x.ndim == 1 else x for x in (start, step))
+    try:
+        shape = np.broadcast_shapes(start.shape, step.shape, (1, 1))
+    except ValueError:
+        shape = None
+
+    if shape == (1, 1):
+        return start.reshape(-1)[0], step.reshape(-1)[0]
+    if shape not in ((rows, 1), (1, columns)):
+        raise ValueError("start and step must have one value per row or one value per column")
+
+    return np.broadcast_to(start, shape), np.broadcast_to(step, shape)
+
+
+def _validate_arguments(rows, columns, start, step):
+    """Returns rows and columns floored to integers, and start and step as NumPy-compatible
+    scalars or (rows, 1) / (1, columns) arrays, raising ValueError for invalid arguments."""
+    if not all(isinstance(arg, (int, float)) for arg in (rows, columns)):
         raise ValueError("All arguments must be numeric")
 
     if rows < 1 or columns < 1:
         raise ValueError("rows and columns must be at least 1")
 
     rows, columns = int(np.floor(rows)), int(np.floor(columns))
-    total_elements = rows * columns
+    start, step = _as_numpy_scalar(start), _as_numpy_scalar(step)
+
+    if np.ndim(start) > 0 or np.ndim(step) > 0:
+        return (rows, columns) + _validate_ranges(start, step, rows, columns)
+
+    if isinstance(start, np.datetime64):
+        if not isinstance(step, np.timedelta64):
+            raise ValueError("step must be a timedelta when start is a date")
+    elif not all(isinstance(arg, (int, float, np.number)) for arg in (start, step)):
+        raise ValueError("All arguments must be numeric")
+
+    return rows, columns, start, step
+
+
+def _is_ranges(start):
+    """Returns True if start is an array of per-row or per-column starts."""
+    return isinstance(start, np.ndarray) and start.ndim == 2
+
+
+def _sequence_dtype(start, step, dtype=None):
+    """Returns the dtype of a sequence, which by default is the dtype of start + step * i."""
+    if dtype is not None:
+        return np.dtype(dtype)
+    return _sequence_values(start, step, np.arange(1)).dtype
+
+
+def _check_dtype_range(start, step, shape, dtype):
+    """Raises ValueError if the first or last value of a sequence (or of any of its per-row
+    or per-column ranges) overflows an integer dtype."""
+    if dtype.kind not in "iu":
+        return
+
+    if _is_ranges(start):
+        length = shape[1] if start.shape[1] == 1 else shape[0]
+    else:
+        length = shape[0] * shape[1]
+
+    info = np.iinfo(dtype)
+    for value in (start, start + step * (length - 1)):
+        if np.min(value) < info.min or np.max(value) > info.max:
+            raise ValueError(f"sequence values do not fit in dtype {dtype}")
+
+
+def _sequence_values(start, step, indices):
+    """Returns the values of a sequence at the given (row-major) element indices."""
+    if np.ndim(step) == 0 and step == 0:
+        return np.full(np.shape(indices), start)  # Fill with `start` if step is 0
+    return start + step * indices
+
+
+def _range_values(start, step, rows, columns):
+    """Returns the values at row positions rows and column positions columns (broadcast
+    against each other) of a sequence with per-row or per-column start and step arrays."""
+    if start.shape[1] == 1:
+        return start[rows, 0] + step[rows, 0] * columns
+    return start[0, columns] + step[0, columns] * rows
 
-    if total_elements > MAX_ELEMENTS:
-        raise MemoryError("Requested array is too large")
 
+def _fill_sequence(out, start, step, indices):
+    """Writes the sequence values at indices into the 1D array out.
+
+    When out has the natural dtype of the sequence the values are computed in place, without
+    temporaries; otherwise they are computed in the natural dtype and then cast into out.
+    """
     if step == 0:
-        values = np.full(total_elements, start)  # Fill with `start` if step is 0
+        out.fill(start)
+    elif out.dtype == _sequence_dtype(start, step) and out.dtype.kind in "iuf":
+        np.multiply(indices, step, out=out)
+        np.add(out, start, out=out)
     else:
-        values = start + step * np.arange(total_elements)
+        out[...] = _sequence_values(start, step, indices)
+
+
+def _fill_block(block, start, step, first_row, offsets, indices):
+    """Writes the rows of a sequence from first_row on into the C-contiguous 2D array block.
+
+    offsets holds 0, 1, 2, ... and indices is scratch space, each of at least block.size.
+    """
+    count, columns = block.size, block.shape[1]
+
+    if _is_ranges(start):
+        rows = np.arange(first_row, first_row + block.shape[0])[:, np.newaxis]
+        block[...] = _range_values(start, step, rows, offsets[np.newaxis, :columns])
+    else:
+        np.add(offsets[:count], first_row * columns, out=indices[:count])
+        _fill_sequence(block.reshape(-1), start, step, indices[:count])
+
+
+def _fill_rows(out, start, step):
+    """Fills the 2D array out with the sequence, a block of about CHUNK_ELEMENTS at a time."""
+    rows, columns = out.shape
+    chunk_rows = min(rows, max(1, CHUNK_ELEMENTS // columns))
+    offsets = np.arange(chunk_rows * columns)
+    indices = np.empty_like(offsets)
+    buffer = None if out.flags.c_contiguous else np.empty((chunk_rows, columns), out.dtype)
+
+    for first_row in range(0, rows, chunk_rows):
+        block = out[first_row:first_row + chunk_rows]
+        if buffer is None:
+            _fill_block(block, start, step, first_row, offsets, indices)
+        else:
+            _fill_block(buffer[:len(block)], start, step, first_row, offsets, indices)
+            block[...] = buffer[:len(block)]
+
+
+def _axis_indices(key, length):
+    """Returns the positions selected by an integer or slice key along an axis of length."""
+    try:
+        positions = range(length)[key]
+    except TypeError:
+        raise IndexError("SequenceArray indices must be integers or slices") from None
+
+    if isinstance(positions, int):
+        return np.int64(positions)
+    return np.arange(positions.start, positions.stop, positions.step, dtype=np.int64)
+
+
+class SequenceArray:
+    """
+    A lazy SEQUENCE result, storing only its rows, columns, start, step and dtype.
+
+    Elements are computed when the sequence is indexed, sliced or iterated, and np.asarray()
+    materializes the whole grid, so sequences far larger than MAX_ELEMENTS can be described
+    and only the parts that are used are realized. Adding, subtracting, multiplying or
+    dividing by a scalar, and negation, return another SequenceArray.
+    """
+
+    ndim = 2
+
+    def __init__(self, rows=1, columns=1, start=1, step=1, dtype=None):
+        self.rows, self.columns, self.start, self.step = _validate_arguments(
+            rows, columns, start, step
+        )
+        self.dtype = _sequence_dtype(self.start, self.step, dtype)
+
+    @property
+    def shape(self):
+        """The (rows, columns) shape of the sequence."""
+        return (self.rows, self.columns)
+
+    @property
+    def size(self):
+        """The number of elements in the sequence."""
+        return self.rows * self.columns
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield self[row]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > 2:
+            raise IndexError("too many indices for SequenceArray")
+        key = key + (slice(None),) * (2 - len(key))
+
+        rows, columns = (_axis_indices(k, n) for k, n in zip(key, self.shape))
+        if _is_ranges(self.start):
+            values = _range_values(self.start, self.step, rows.reshape(-1, 1),
+                                   columns.reshape(1, -1)).reshape(rows.shape + columns.shape)
+        else:
+            values = _sequence_values(self.start, self.step,
+                                      np.add.outer(rows * self.columns, columns))
+        values = np.asarray(values).astype(self.dtype, copy=False)
+        return values if values.ndim > 0 else values[()]
+
+    def __array__(self, dtype=None, copy=None):
+        values = sequence(self.rows, self.columns, self.start, self.step,
+                          out=np.empty(self.shape, dtype=self.dtype))
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # NumPy scalars on either side of + - * / keep the sequence lazy
+        operators = {np.add: ("__add__", "__radd__"), np.subtract: ("__sub__", "__rsub__"),
+                     np.multiply: ("__mul__", "__rmul__"),
+                     np.true_divide: ("__truediv__", "__rtruediv__")}
+
+        if method == "__call__" and not kwargs:
+            if ufunc is np.negative and len(inputs) == 1:
+                return -self
+            if ufunc in operators and len(inputs) == 2:
+                left, right = inputs
+                if left is self:
+                    return getattr(self, operators[ufunc][0])(right)
+                return getattr(self, operators[ufunc][1])(left)
+
+        inputs = tuple(np.asarray(x) if isinstance(x, SequenceArray) else x for x in inputs)
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def _lazy(self, start, step):
+        """Returns a SequenceArray of the same shape with a new start and step."""
+        start, step = (x.item() if isinstance(x, np.generic) else x for x in (start, step))
+        return SequenceArray(self.rows, self.columns, start, step)  # dtype follows the values
+
+    def __add__(self, other):
+        if isinstance(other, numbers.Real):
+            return self._lazy(self.start + other, self.step)
+        return np.asarray(self) + other
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        if isinstance(other, numbers.Real):
+            return self._lazy(self.start - other, self.step)
+        return np.asarray(self) - other
+
+    def __rsub__(self, other):
+        if isinstance(other, numbers.Real):
+            return self._lazy(other - self.start, -self.step)
+        return other - np.asarray(self)
+
+    def __mul__(self, other):
+        if isinstance(other, numbers.Real):
+            return self._lazy(self.start * other, self.step * other)
+        return np.asarray(self) * other
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        if isinstance(other, numbers.Real) and other != 0:
+            return self._lazy(self.start / other, self.step / other)
+        return np.asarray(self) / other
+
+    def __rtruediv__(self, other):
+        return other / np.asarray(self)
+
+    def __neg__(self):
+        return self._lazy(-self.start, -self.step)
+
+    def chunks(self, chunk_rows=None):
+        """Yields the sequence in blocks of rows, as sequence_chunks does."""
+        return sequence_chunks(self.rows, self.columns, self.start, self.step, chunk_rows,
+                               dtype=self.dtype)
+
+    def __repr__(self):
+        return (f"SequenceArray(rows={self.rows}, columns={self.columns}, "
+                f"start={self.start}, step={self.step}, dtype={self.dtype})")
+
+
+def sequence(rows=1, columns=1, start=1, step=1, lazy=False, dtype=None, out=None):
+    """Return a 2D array of sequential numbers, mimicking Excel's SEQUENCE behavior.
+
+    `dtype` sets the dtype of the result, e.g. np.int32 or np.float32; values are computed
+    in the natural dtype of start + step * i and cast a block at a time, so no full-size
+    temporary is made. `start` may be a date, with a timedelta `step`, for a datetime64
+    sequence.
+
+    `start` and `step` may also be arrays with one value per row (1D or (rows, 1) arrays),
+    making each row an independent range along the columns, or one value per column
+    ((1, columns) arrays), making each column a range down the rows.
+
+    With `out`, the sequence is written into that preallocated (rows, columns) array, such as
+    a memory map, which is returned; as the caller owns that memory, MAX_ELEMENTS does not
+    apply.
+
+    With lazy=True a SequenceArray is returned instead, which computes elements on access
+    and is not subject to MAX_ELEMENTS.
+    """
+    if lazy:
+        if out is not None:
+            raise ValueError("out cannot be used with lazy=True")
+        return SequenceArray(rows, columns, start, step, dtype)
+
+    rows, columns, start, step = _validate_arguments(rows, columns, start, step)
+    total_elements = rows * columns
+
+    if out is None:
+        if total_elements > MAX_ELEMENTS:
+            raise MemoryError("Requested array is too large")
+        if dtype is None and not _is_ranges(start):
+            return _sequence_values(start, step, np.arange(total_elements)).reshape(
+                (rows, columns))
+        out = np.empty((rows, columns), dtype=_sequence_dtype(start, step, dtype))
+
+    elif out.shape != (rows, columns):
+        raise ValueError("out must have shape (rows, columns)")
+    elif dtype is not None and np.dtype(dtype) != out.dtype:
+        raise ValueError("dtype must match the dtype of out")
+
+    _check_dtype_range(start, step, out.shape, out.dtype)
+    _fill_rows(out, start, step)
+    return out
+
+
+def _generate_chunks(rows, columns, start, step, chunk_rows, dtype):
+    """Generator behind sequence_chunks, for validated arguments."""
+    buffer = np.empty((chunk_rows, columns), dtype=dtype)
+    offsets = np.arange(chunk_rows * columns)
+    indices = np.empty_like(offsets)
+
+    for first_row in range(0, rows, chunk_rows):
+        block = buffer[:min(chunk_rows, rows - first_row)]
+        _fill_block(block, start, step, first_row, offsets, indices)
+        yield block
+
+
+def sequence_chunks(rows=1, columns=1, start=1, step=1, chunk_rows=None, dtype=None):
+    """Yields the rows of sequence(rows, columns, start, step) in blocks of chunk_rows rows.
+
+    Every block is a view of the same preallocated buffer and is overwritten by the next
+    block, so memory use stays constant however many rows there are; copy a block to keep
+    it. By default blocks hold about CHUNK_ELEMENTS values. Like lazy sequences, chunked
+    sequences are not subject to MAX_ELEMENTS.
+    """
+    rows, columns, start, step = _validate_arguments(rows, columns, start, step)
+    dtype = _sequence_dtype(start, step, dtype)
+    _check_dtype_range(start, step, (rows, columns), dtype)
+
+    if chunk_rows is None:
+        chunk_rows = max(1, CHUNK_ELEMENTS // columns)
+    elif not isinstance(chunk_rows, int) or chunk_rows < 1:
+        raise ValueError("chunk_rows must be an integer of at least 1")
 
-    return values.reshape((rows, columns))
+    return _generate_chunks(rows, columns, start, step, min(chunk_rows, rows), dtype)
@@ -1,6 +1,14 @@
 """Utility functions for the Excel in Python series."""
 import numpy as np
+from excel_in_python import instrumentation
 
+@instrumentation.phase("conversion")
 def ensure_numpy_array(obj):
     """Converts the input to a NumPy array if it isn't one already."""
-    return obj if isinstance(obj, np.ndarray) else np.array(obj)
+    if isinstance(obj, np.ndarray):
+        return obj
+
+    array = np.array(obj)
+    if instrumentation.enabled:
+        instrumentation.record_copy("ensure_numpy_array", array.nbytes)
+    return array
@@ -1,39 +1,58 @@
 """Implementation of the XLOOKUP function in Python."""
 import numpy as np
-from excel_in_python.xmatch import xmatch
+from excel_in_python import instrumentation
+from excel_in_python.xmatch import xmatch, xmatch_many, NOT_FOUND, _resolve_modes
 from excel_in_python.enums import MatchMode, SearchMode
+from excel_in_python.parallel import run_chunks
 from excel_in_python.utils import ensure_numpy_array
 
 
+@instrumentation.phase("extraction")
 def extract_result(return_array, selector, orientation):
     """
     Helper function to extract results from return_array based on the index selector.
+
+    The selector may be a single index or an array of indices. Results are gathered with a
+    single np.take along the lookup axis and stacked along the first axis, one per index.
     """
+    axis = 0 if orientation == "vertical" else 1
+    return np.moveaxis(np.take(return_array, selector, axis=axis), axis, 0)
 
-    return return_array[selector] if orientation == "vertical" else return_array[:, selector]
 
+def fill_default(results, missing, default):
+    """
+    Helper function to replace the results flagged in the missing mask with default.
 
+    The results keep their dtype when default can be represented in it, otherwise they are
+    promoted to a common dtype (or object, e.g. when default is None).
+    """
+    default_dtype = np.asarray(default).dtype
 
-def xlookup(
-    lookup_value,
-    lookup_array,
-    return_array,
-    default=None,
-    match_mode=MatchMode.EXACT,
-    search_mode=SearchMode.FROM_FIRST,
-):
+    # NumPy would promote numbers and strings to a string dtype, so keep them apart
+    if (results.dtype.kind in "US") != (default_dtype.kind in "US"):
+        dtype = np.dtype(object)
+    else:
+        try:
+            dtype = np.result_type(results.dtype, default_dtype)
+        except TypeError:
+            dtype = np.dtype(object)
+
+    if instrumentation.enabled and dtype != results.dtype:
+        instrumentation.record_copy("fill_default", results.size * dtype.itemsize)
+
+    results = results.astype(dtype, copy=False)
+    results[missing] = default
+    return results
+
+
+@instrumentation.phase("validation")
+def get_orientation(lookup_array, return_array):
     """
-    Performs an XLOOKUP operation using xmatch to find the index.
+    Helper function to validate return_array against lookup_array and return its orientation.
     """
-    lookup_array = ensure_numpy_array(lookup_array)
-    return_array = ensure_numpy_array(return_array)
-
-    if lookup_array.size == 0 or return_array.size == 0:
+    if return_array.size == 0:
         raise ValueError("lookup_array and return_array must not be empty")
 
-    if lookup_array.ndim != 1:
-        raise ValueError("lookup_array must be 1D")
-
     if (
         return_array.ndim > 1
         and return_array.shape[0] != lookup_array.shape[0]
@@ -49,15 +68,80 @@ def xlookup(
 
     # If len lookup_array is the same as the first dimension of return_array
     # then the orientation is vertical, otherwise it is horizontal
-    orientation = "vertical" if return_array.shape[0] == lookup_array.size else "horizontal"
+    return "vertical" if return_array.shape[0] == lookup_array.size else "horizontal"
+
+
+@instrumentation.phase("extraction")
+def gather_results(lookup_value, indices, return_array, orientation, default,
+                   workers=None, executor=None):
+    """
+    Helper function to gather the results for the indices found for lookup_value.
+
+    A single lookup value returns its result (or default), while an array of lookup values
+    returns one result per value with misses filled from default. With workers or an
+    executor, chunks of the results are extracted in parallel into one output array.
+    """
+    missing = indices == NOT_FOUND
+    selector = np.where(missing, 0, indices)
+
+    if np.ndim(lookup_value) == 0 or (workers is None and executor is None):
+        results = extract_result(return_array, selector, orientation)
+    else:
+        results = extract_result(return_array, selector[:0], orientation)
+        results = np.empty((len(selector),) + results.shape[1:], dtype=results.dtype)
+
+        def extract_chunk(start, stop):
+            results[start:stop] = extract_result(return_array, selector[start:stop], orientation)
+
+        run_chunks(extract_chunk, len(selector), workers, executor)
+
+    if np.ndim(lookup_value) == 0:
+        return default if missing[0] else results[0]
+
+    return fill_default(results, missing, default) if missing.any() else results
+
+
+def xlookup(
+    lookup_value,
+    lookup_array,
+    return_array,
+    default=None,
+    match_mode=MatchMode.EXACT,
+    search_mode=SearchMode.FROM_FIRST,
+    workers=None,
+    executor=None,
+    processes=None,
+):
+    """
+    Performs an XLOOKUP operation using xmatch (for a single lookup value) or xmatch_many
+    (for an array of lookup values) to find the indices.
+
+    With workers (a number of threads) or an executor, a large batch of lookup values is
+    matched and gathered in parallel chunks; the result is the same as without. With
+    processes, WILDCARD and REGEX scans are split across that many worker processes.
+    """
+    lookup_array = ensure_numpy_array(lookup_array)
+    return_array = ensure_numpy_array(return_array)
+
+    if lookup_array.size == 0 or return_array.size == 0:
+        raise ValueError("lookup_array and return_array must not be empty")
+
+    if lookup_array.ndim != 1:
+        raise ValueError("lookup_array must be 1D")
+
+    orientation = get_orientation(lookup_array, return_array)
 
-    indices = np.array([
-        xmatch(val, lookup_array, match_mode, search_mode)
-        for val in np.atleast_1d(lookup_value)
-    ])
+    if instrumentation.enabled:
+        instrumentation.record_call("xlookup", *_resolve_modes(match_mode, search_mode),
+                                    lookup_array.size, np.size(lookup_value))
 
-    results = np.array([
-        extract_result(return_array, idx, orientation) if idx is not None else default for idx in indices
-    ])
+    if np.ndim(lookup_value) == 0:
+        # a single value avoids sorting the lookup array for exact matches
+        idx = xmatch(lookup_value, lookup_array, match_mode, search_mode, processes=processes)
+        indices = np.array([NOT_FOUND if idx is None else idx])
+    else:
+        indices = xmatch_many(lookup_value, lookup_array, match_mode, search_mode,
+                              workers=workers, executor=executor, processes=processes)
 
-    return results if isinstance(lookup_value, list) else results[0]
+    return gather_results(lookup_value, indices, return_array, orientation, default,
+                          workers=workers, executor=executor)
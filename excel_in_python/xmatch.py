@@ -1,17 +1,30 @@
 """Implementation of the XMATCH function in Python."""
-import bisect
+import functools
 import re
+import sys
 import numpy as np
-import pandas as pd
+from excel_in_python import instrumentation
+from excel_in_python.cache import array_fingerprint, estimate_nbytes, freeze, lookup_cache
 from excel_in_python.enums import MatchMode, SearchMode
+from excel_in_python.parallel import (
+    attach_shared_array,
+    chunk_bounds,
+    run_chunks,
+    share_array,
+    shared_array_names,
+    shared_process_pool,
+)
 from excel_in_python.utils import ensure_numpy_array
 
-def xmatch(
-    lookup_value, lookup_array, match_mode=MatchMode.EXACT, search_mode=SearchMode.FROM_FIRST
-):
-    """
-    Performs an XMATCH operation, returning the index of the found match.
-    """
+NOT_FOUND = -1  # Sentinel used by xmatch_many for lookup values with no match
+HASHABLE_KINDS = "biufcUS"  # dtype kinds that get occurrence tables for exact matches
+PATTERN_CACHE_SIZE = 256  # Number of compiled WILDCARD / REGEX patterns to keep
+SCAN_CHUNK_SIZE = 4096  # Number of elements converted at a time when scanning for a pattern
+
+
+@instrumentation.phase("validation")
+def _resolve_modes(match_mode, search_mode):
+    """Converts integer match and search modes to their enum members."""
     if isinstance(search_mode, int):
         try:
             search_mode = SearchMode(search_mode)
@@ -24,6 +37,12 @@ def xmatch(
         except ValueError as e:
             raise ValueError(f"Invalid match_mode: {match_mode}") from e
 
+    return match_mode, search_mode
+
+
+@instrumentation.phase("validation")
+def _validate_lookup_array(lookup_array):
+    """Converts lookup_array to a NumPy array and checks that it is a non-empty 1D array."""
     if not hasattr(lookup_array, "__iter__"):
         raise TypeError("lookup_array must be iterable")
 
@@ -35,91 +54,575 @@ def xmatch(
     if lookup_array.ndim != 1:
         raise ValueError("lookup_array must be 1D")
 
-    # exact_match_indices = np.flatnonzero(lookup_array == lookup_value)
-    # if exact_match_indices.size > 0:
-    #     match search_mode:
-    #         case SearchMode.FROM_FIRST | SearchMode.BINARY_FROM_FIRST:
-    #             return exact_match_indices[0]
-    #         case SearchMode.FROM_LAST | SearchMode.BINARY_FROM_LAST:
-    #             return exact_match_indices[-1]
+    return lookup_array
+
+
+@instrumentation.phase("sort")
+def _sort_lookup_array(lookup_array, search_mode):
+    """Returns the sort permutation and sorted values of lookup_array.
+
+    Binary search modes assume the data are already sorted, so the permutation is None.
+    A stable sort keeps duplicates in their original order, so the first (or last) of a
+    run of equal values in the sorted array is also the first (or last) in lookup_array.
+    Results are kept in the lookup cache, so repeated lookups against the same array only
+    pay for the sort once.
+    """
+    if search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.BINARY_FROM_LAST):
+        return None, lookup_array
+
+    fingerprint = array_fingerprint(lookup_array)
+    if fingerprint is None:
+        return _argsort(lookup_array)
+
+    return lookup_cache.get_or_build("sort", lookup_array, fingerprint, _argsort)
+
+
+@instrumentation.phase("sort")
+def _argsort(lookup_array):
+    """Returns the stable sort permutation and sorted values of lookup_array, read-only."""
+    sorted_indices = np.argsort(lookup_array, kind="stable")
+    sorted_lookup_array = lookup_array[sorted_indices]
+    if instrumentation.enabled:
+        instrumentation.record_copy("_argsort", sorted_lookup_array.nbytes)
+    return freeze(sorted_indices), freeze(sorted_lookup_array)
+
+
+def _occurrence_runs(sorted_lookup_array):
+    """Returns the start and end positions of the runs of equal values in a sorted array.
+
+    Each run of equal values in a stably sorted array starts at the first occurrence of the
+    value and ends at its last occurrence.
+    """
+    run_starts = np.flatnonzero(
+        np.concatenate(([True], sorted_lookup_array[1:] != sorted_lookup_array[:-1]))
+    )
+    run_ends = np.append(run_starts[1:] - 1, len(sorted_lookup_array) - 1)
+    return run_starts, run_ends
+
+
+class OccurrenceTable:
+    """
+    A read-only value -> index mapping over sorted unique values, with a dict-style get.
+
+    A lookup is a binary search over the unique values. The table is held in two arrays,
+    a few bytes per unique value, rather than a dict of Python objects, so it stays small
+    enough to cache for large arrays and can be memory-mapped.
+    """
+
+    def __init__(self, unique_values, indices):
+        self.unique_values = unique_values
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.unique_values)
+
+    @property
+    def nbytes(self):
+        """The memory held by the table, as counted by the lookup cache."""
+        return estimate_nbytes(self.unique_values) + estimate_nbytes(self.indices)
+
+    def get(self, value, default=None):
+        """Returns the index for value, or default if value does not occur.
+
+        Like dict.get with an unhashable key, raises TypeError if value is not a scalar.
+        """
+        if np.ndim(value) != 0:
+            raise TypeError("OccurrenceTable keys must be scalars")
+
+        position = np.searchsorted(self.unique_values, value)
+        if position < len(self.unique_values) and self.unique_values[position] == value:
+            return int(self.indices[position])
+        return default
+
+
+def _occurrence_tables(sorted_indices, sorted_lookup_array):
+    """Builds value -> first index and value -> last index OccurrenceTables.
+
+    Returns (None, None) for dtypes whose Python equality does not agree with NumPy's, e.g.
+    object or datetime arrays.
+    """
+    if sorted_lookup_array.dtype.kind not in HASHABLE_KINDS:
+        return None, None
+
+    run_starts, run_ends = _occurrence_runs(sorted_lookup_array)
+    unique_values = sorted_lookup_array[run_starts]
+
+    return (OccurrenceTable(unique_values, sorted_indices[run_starts]),
+            OccurrenceTable(unique_values, sorted_indices[run_ends]))
+
+
+@instrumentation.phase("sort")
+def _exact_tables(lookup_array):
+    """Returns cached value -> first/last index tables for a read-only lookup_array.
+
+    Building the tables costs a sort, so they are only built for arrays that can be
+    identified without a pass over their contents, and whose tables are certain to fit in
+    the lookup cache. Returns (None, None) otherwise.
+    """
+    if lookup_array.dtype.kind not in HASHABLE_KINDS:
+        return None, None  # no tables are built for these dtypes, so skip the sort
+
+    # unique values and first and last indices, with every element unique at worst
+    table_nbytes = lookup_array.size * (lookup_array.dtype.itemsize + 2 * np.intp().itemsize)
+    if table_nbytes > lookup_cache.max_bytes:
+        return None, None  # the tables would be built and then dropped by the cache
+
+    fingerprint = array_fingerprint(lookup_array, hash_contents=False)
+    if fingerprint is None:
+        return None, None
+
+    return lookup_cache.get_or_build(
+        "occurrence_tables", lookup_array, fingerprint,
+        lambda array: _occurrence_tables(*_sort_lookup_array(array, SearchMode.FROM_FIRST)),
+    )
+
+
+@instrumentation.phase("search")
+def _exact_indices(lookup_values, sorted_indices, sorted_lookup_array, search_mode):
+    """Resolves exact matches for an array of lookup values with one binary search."""
+    last = len(sorted_lookup_array) - 1
+
+    if search_mode in (SearchMode.FROM_FIRST, SearchMode.BINARY_FROM_FIRST):
+        idx = np.searchsorted(sorted_lookup_array, lookup_values, side="left")
+    else:
+        idx = np.searchsorted(sorted_lookup_array, lookup_values, side="right") - 1
+
+    in_range = (idx >= 0) & (idx <= last)
+    idx = np.clip(idx, 0, last)
+    found = in_range & (sorted_lookup_array[idx] == lookup_values)
+
+    if sorted_indices is not None:
+        idx = sorted_indices[idx]
+
+    return np.where(found, idx, NOT_FOUND)
+
+
+@instrumentation.phase("search")
+def _approximate_indices(
+    lookup_values, sorted_indices, sorted_lookup_array, match_mode, search_mode
+):
+    """Resolves NEXT_LARGER / NEXT_SMALLER matches for an array of lookup values.
+
+    NumPy would silently compare strings with numbers as strings, so they raise a TypeError
+    instead, as Python's own comparisons do.
+    """
+    kinds = {lookup_values.dtype.kind, sorted_lookup_array.dtype.kind}
+    if kinds & set("US") and kinds & set("biufc"):
+        raise TypeError(f"lookup values of dtype {lookup_values.dtype} cannot be ordered "
+                        f"against a lookup array of dtype {sorted_lookup_array.dtype}")
+
+    last = len(sorted_lookup_array) - 1
+
+    # Find the positions in the sorted array
+    side = (
+        "left"
+        if search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.FROM_FIRST)
+        else "right"
+    )
+    idx = np.searchsorted(sorted_lookup_array, lookup_values, side=side)
+
+    # Ensure indices stay within valid range, preferring an exact match where one exists
+    if match_mode == MatchMode.NEXT_LARGER:
+        check_exact_idx = np.maximum(idx - 1, 0)
+        idx = np.where(sorted_lookup_array[check_exact_idx] == lookup_values,
+                       check_exact_idx, np.minimum(idx, last))
+    else:  # NEXT_SMALLER
+        check_exact_idx = np.minimum(idx, last)
+        idx = np.where(sorted_lookup_array[check_exact_idx] == lookup_values,
+                       check_exact_idx, np.maximum(idx - 1, 0))
+
+    # Map back to original indices
+    return idx if sorted_indices is None else sorted_indices[idx]
+
+
+def wildcard_to_regex(lookup_value):
+    """
+    Translates an Excel wildcard pattern into a regular expression.
+
+    * matches any sequence of characters and ? matches any single character. A tilde escapes
+    the character after it, so ~*, ~? and ~~ match a literal *, ? and ~.
+    """
+    parts = []
+    chars = iter(str(lookup_value))
+    for char in chars:
+        if char == "~":
+            char = next(chars, "~")
+            parts.append(re.escape(char))
+        elif char == "*":
+            parts.append(".*")
+        elif char == "?":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def wildcard_prefix(lookup_value):
+    """Returns the literal text before the first unescaped * or ? in an Excel wildcard pattern."""
+    prefix = []
+    chars = iter(str(lookup_value))
+    for char in chars:
+        if char == "~":
+            char = next(chars, "~")
+        elif char in "*?":
+            break
+        prefix.append(char)
+    return "".join(prefix)
+
+
+def _prefix_upper_bound(prefix):
+    """Returns the smallest string greater than every string that starts with prefix, or None."""
+    chars = list(prefix)
+    while chars:
+        if ord(chars[-1]) < sys.maxunicode:
+            chars[-1] = chr(ord(chars[-1]) + 1)
+            return "".join(chars)
+        chars.pop()
+    return None
+
+
+@instrumentation.phase("sort")
+def _folded_sort(lookup_array):
+    """
+    Returns the sort permutation and sorted lower-cased values of an ASCII string array.
+
+    Returns None when any element is not ASCII: outside ASCII, Python's case-insensitive
+    regex matching does not always agree with str.lower, so a lower-cased prefix range could
+    miss matches.
+    """
+    if not all(value.isascii() for value in lookup_array.tolist()):
+        return None
+
+    folded = np.strings.lower(lookup_array)
+    if instrumentation.enabled:
+        instrumentation.record_copy("_folded_sort", folded.nbytes)
+    return _argsort(folded)
+
+
+def _prefix_candidates(lookup_value, lookup_array):
+    """
+    Returns the ascending positions of the elements that start with the literal prefix of a
+    wildcard pattern, or None when the prefix cannot narrow the search.
+
+    The lower-cased array is sorted once (and cached), so the candidates are found with two
+    binary searches over the prefix range instead of a regex over every element.
+    """
+    prefix = wildcard_prefix(lookup_value).lower()
+    if not prefix or not prefix.isascii() or lookup_array.dtype.kind != "U":
+        return None
+
+    fingerprint = array_fingerprint(lookup_array)
+    if fingerprint is None:
+        return None
+
+    folded_sort = lookup_cache.get_or_build(
+        "folded_sort", lookup_array, fingerprint, _folded_sort
+    )
+    if folded_sort is None:
+        return None
+
+    sorted_indices, sorted_folded = folded_sort
+    upper_bound = _prefix_upper_bound(prefix)
+    start = np.searchsorted(sorted_folded, prefix, side="left")
+    stop = (len(sorted_folded) if upper_bound is None
+            else np.searchsorted(sorted_folded, upper_bound, side="left"))
+
+    return np.sort(sorted_indices[start:stop])
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(lookup_value, match_mode):
+    """Returns the compiled regex for a WILDCARD or REGEX lookup value.
+
+    As in Excel, wildcards match case-insensitively and regular expressions are
+    case-sensitive.
+    """
+    if match_mode == MatchMode.WILDCARD:
+        return re.compile(f'^{wildcard_to_regex(lookup_value)}$', re.IGNORECASE)
+    return re.compile(f'^{lookup_value}$')
+
+
+def _scan_pattern(regex, lookup_array, search_mode):
+    """
+    Returns the index of the first (FROM_FIRST) or last (FROM_LAST) string matching regex.
+
+    The array is converted to Python strings a chunk at a time, scanning forwards or
+    backwards, so the scan stops at the first match instead of visiting every element.
+    Elements that are not strings never match.
+    """
+    size = len(lookup_array)
+
+    if search_mode == SearchMode.FROM_FIRST:
+        for start in range(0, size, SCAN_CHUNK_SIZE):
+            chunk = lookup_array[start:start + SCAN_CHUNK_SIZE].tolist()
+            for offset, value in enumerate(chunk):
+                if isinstance(value, str) and regex.match(value):
+                    return start + offset
+    else:
+        for stop in range(size, 0, -SCAN_CHUNK_SIZE):
+            start = max(stop - SCAN_CHUNK_SIZE, 0)
+            chunk = lookup_array[start:stop].tolist()
+            for offset in range(len(chunk) - 1, -1, -1):
+                value = chunk[offset]
+                if isinstance(value, str) and regex.match(value):
+                    return start + offset
+
+    return None
+
+
+def _check_pattern_search_mode(search_mode):
+    """Raises ValueError for the BINARY search modes, which patterns cannot use."""
+    if search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.BINARY_FROM_LAST):
+        raise ValueError(
+            "BINARY search modes are not supported for WILDCARD or REGEX match modes"
+        )
+
+
+@instrumentation.phase("search")
+def _pattern_index(lookup_value, lookup_array, match_mode, search_mode):
+    """Returns the index of the first or last WILDCARD / REGEX match, or None."""
+    _check_pattern_search_mode(search_mode)
+
+    regex = compile_pattern(str(lookup_value), match_mode)
+
+    if match_mode == MatchMode.WILDCARD:
+        candidates = _prefix_candidates(lookup_value, lookup_array)
+        if candidates is not None:
+            idx = _scan_pattern(regex, lookup_array[candidates], search_mode)
+            return None if idx is None else int(candidates[idx])
+
+    return _scan_pattern(regex, lookup_array, search_mode)
+
+
+def _scan_shared_partition(descriptor, live_names, start, stop, patterns, search_mode):
+    """
+    Process pool task: scans lookup_array[start:stop] of a shared lookup array for each
+    (lookup_value, match_mode) pattern, returning the absolute index of the first or last
+    match of each, or None. live_names are passed on to attach_shared_array.
+    """
+    partition = attach_shared_array(descriptor, live_names)[start:stop]
+    indices = []
+    for lookup_value, match_mode in patterns:
+        idx = _scan_pattern(compile_pattern(lookup_value, match_mode), partition, search_mode)
+        indices.append(None if idx is None else start + idx)
+    return indices
+
+
+@instrumentation.phase("search")
+def _pattern_indices_in_processes(lookup_values, lookup_array, match_mode, search_mode,
+                                  processes):
+    """
+    Resolves WILDCARD / REGEX lookup values with a pool of worker processes.
+
+    The lookup array is copied to shared memory as a fixed-width string array (once, as the
+    copy is kept by share_array) and split into one contiguous partition per process.
+    Each worker reports the first or last match in its partition, and the earliest (for
+    FROM_FIRST) or latest (for FROM_LAST) partition with a match wins. Arrays holding
+    anything but strings are scanned in this process, as non-strings never match.
+    """
+    _check_pattern_search_mode(search_mode)
+
+    if lookup_array.dtype.kind == "O" and all(
+        isinstance(value, str) for value in lookup_array.tolist()
+    ):
+        lookup_array = lookup_array.astype(str)
+        if instrumentation.enabled:
+            instrumentation.record_copy("_pattern_indices_in_processes", lookup_array.nbytes)
+
+    if lookup_array.dtype.kind != "U":
+        return [_pattern_index(value, lookup_array, match_mode, search_mode)
+                for value in lookup_values]
+
+    shared = share_array(lookup_array, array_fingerprint(lookup_array))
+    live_names = shared_array_names()
+    pool = shared_process_pool(processes)
+    patterns = [(str(value), match_mode) for value in lookup_values]
+
+    futures = [pool.submit(_scan_shared_partition, shared.descriptor, live_names, start, stop,
+                           patterns, search_mode)
+               for start, stop in chunk_bounds(len(lookup_array), processes)]
+    partitions = [future.result() for future in futures]
+
+    if search_mode == SearchMode.FROM_LAST:
+        partitions.reverse()
+    return [next((idx for idx in matches if idx is not None), None)
+            for matches in zip(*partitions)]
+
+
+def _match_many(lookup_values, lookup_array, match_mode, search_mode, sorted_lookup=None,
+                workers=None, executor=None, processes=None):
+    """Resolves an array of lookup values against a validated lookup array.
+
+    sorted_lookup is an optional precomputed (sorted_indices, sorted_lookup_array) pair, as
+    returned by _sort_lookup_array for search_mode. It is computed here when omitted.
+    With workers or executor, chunks of lookup values are resolved in parallel threads
+    against the same sorted lookup array, as in run_chunks. With processes, WILDCARD and
+    REGEX scans are spread over that many worker processes.
+    """
+    if processes is not None and match_mode in (MatchMode.REGEX, MatchMode.WILDCARD):
+        indices = _pattern_indices_in_processes(
+            lookup_values, lookup_array, match_mode, search_mode, processes
+        )
+        return np.array([NOT_FOUND if idx is None else idx for idx in indices], dtype=np.intp)
+
+    if workers is not None or executor is not None:
+        if sorted_lookup is None and match_mode in (
+            MatchMode.EXACT, MatchMode.NEXT_LARGER, MatchMode.NEXT_SMALLER
+        ):
+            try:
+                sorted_lookup = _sort_lookup_array(lookup_array, search_mode)
+            except TypeError:
+                # elements that cannot be ordered are resolved value by value instead
+                return _match_many(lookup_values, lookup_array, match_mode, search_mode)
+
+        def match_chunk(start, stop):
+            return _match_many(lookup_values[start:stop], lookup_array, match_mode,
+                               search_mode, sorted_lookup)
+
+        return np.concatenate(run_chunks(match_chunk, len(lookup_values), workers, executor))
 
     match match_mode:
         case MatchMode.EXACT:
-            # if from first or from last, use flatnonzero to find the first or last match
-            match search_mode:
-                case SearchMode.FROM_FIRST:
-                    exact_match_indices = np.flatnonzero(lookup_array == lookup_value)
-                    if exact_match_indices.size > 0:
-                        return exact_match_indices[0]
-                case SearchMode.FROM_LAST:
-                    exact_match_indices = np.flatnonzero(lookup_array == lookup_value)
-                    if exact_match_indices.size > 0:
-                        return exact_match_indices[-1]
-                case SearchMode.BINARY_FROM_FIRST:
-                    # Binary search for the first occurrence
-                    idx = np.searchsorted(lookup_array, lookup_value, side='left')
-                    if idx < len(lookup_array) and lookup_array[idx] == lookup_value:
-                        return idx
-                case SearchMode.BINARY_FROM_LAST:
-                    # Binary search for the last occurrence
-                    idx = np.searchsorted(lookup_array, lookup_value, side='right') - 1
-                    if idx >= 0 and lookup_array[idx] == lookup_value:
-                        return idx
-
-            return None
+            try:
+                sorted_indices, sorted_lookup_array = (
+                    sorted_lookup or _sort_lookup_array(lookup_array, search_mode)
+                )
+                return _exact_indices(
+                    lookup_values, sorted_indices, sorted_lookup_array, search_mode
+                )
+            except TypeError:
+                # e.g. None among strings in an object array, which cannot be ordered
+                indices = [_exact_index(val, lookup_array, search_mode) for val in lookup_values]
+                return np.array(
+                    [NOT_FOUND if idx is None else idx for idx in indices], dtype=np.intp
+                )
 
         case MatchMode.NEXT_LARGER | MatchMode.NEXT_SMALLER:
-            # Store original indices before sorting
-            if search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.BINARY_FROM_LAST):
-                # the data are assumed to be already sorted, so don't sort
-                sorted_indices = np.arange(len(lookup_array))  # Identity mapping
-                sorted_lookup_array = lookup_array
-            else:
-                sorted_indices = np.argsort(lookup_array)  # Indices of lookup_array after sorting
-                sorted_lookup_array = lookup_array[sorted_indices]  # Sorted values
-
-            # Find the position in the sorted array
-            idx = (
-                bisect.bisect_left(sorted_lookup_array, lookup_value)
-                if search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.FROM_FIRST)
-                else bisect.bisect_right(sorted_lookup_array, lookup_value)
+            sorted_indices, sorted_lookup_array = (
+                sorted_lookup or _sort_lookup_array(lookup_array, search_mode)
+            )
+            return _approximate_indices(
+                lookup_values, sorted_indices, sorted_lookup_array, match_mode, search_mode
             )
-
-            # Ensure index stays within valid range
-            if match_mode == MatchMode.NEXT_LARGER:
-                check_exact_idx = max(idx - 1, 0)
-                idx = (check_exact_idx
-                       if sorted_lookup_array[check_exact_idx] == lookup_value
-                       else min(idx, len(lookup_array) - 1))
-            else:  # NEXT_SMALLER
-                check_exact_idx = min(idx, len(lookup_array) - 1)
-                idx = (check_exact_idx
-                       if sorted_lookup_array[check_exact_idx] == lookup_value
-                       else max(idx - 1, 0))
-
-            # Map back to original index
-            return int(sorted_indices[idx])
 
         case MatchMode.REGEX | MatchMode.WILDCARD:
-            if search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.BINARY_FROM_LAST):
-                raise ValueError(
-                    "BINARY search modes are not supported for WILDCARD or REGEX match modes"
-                )
+            indices = [
+                _pattern_index(val, lookup_array, match_mode, search_mode)
+                for val in lookup_values
+            ]
+            return np.array(
+                [NOT_FOUND if idx is None else idx for idx in indices], dtype=np.intp
+            )
 
-            print(re.escape(str(lookup_value)).replace(r'\\*', '.*').replace(r'\\?', '.'))
+    return np.full(lookup_values.shape, NOT_FOUND, dtype=np.intp)
 
-            pattern = (
-                re.escape(str(lookup_value)).replace(r'\*', '.*').replace(r'\?', '.')
-                if match_mode == MatchMode.WILDCARD
-                else str(lookup_value)
-            )
 
-            regex = re.compile(f'^{pattern}$', re.IGNORECASE)
+@instrumentation.phase("search")
+def _exact_index(lookup_value, lookup_array, search_mode):
+    """Returns the index of the exact match for a single lookup value, or None."""
+    # if from first or from last, use the cached occurrence tables where available
+    # and otherwise flatnonzero to find the first or last match
+    if search_mode in (SearchMode.FROM_FIRST, SearchMode.FROM_LAST):
+        first_index, last_index = _exact_tables(lookup_array)
+        if first_index is not None:
+            table = first_index if search_mode == SearchMode.FROM_FIRST else last_index
+            try:
+                return table.get(lookup_value)
+            except TypeError:
+                pass  # unhashable lookup values fall back to flatnonzero
+
+    match search_mode:
+        case SearchMode.FROM_FIRST:
+            exact_match_indices = np.flatnonzero(lookup_array == lookup_value)
+            if exact_match_indices.size > 0:
+                return int(exact_match_indices[0])
+        case SearchMode.FROM_LAST:
+            exact_match_indices = np.flatnonzero(lookup_array == lookup_value)
+            if exact_match_indices.size > 0:
+                return int(exact_match_indices[-1])
+        case SearchMode.BINARY_FROM_FIRST:
+            # Binary search for the first occurrence
+            idx = np.searchsorted(lookup_array, lookup_value, side='left')
+            if idx < len(lookup_array) and lookup_array[idx] == lookup_value:
+                return int(idx)
+        case SearchMode.BINARY_FROM_LAST:
+            # Binary search for the last occurrence
+            idx = np.searchsorted(lookup_array, lookup_value, side='right') - 1
+            if idx >= 0 and lookup_array[idx] == lookup_value:
+                return int(idx)
+
+    return None
+
+
+def xmatch(
+    lookup_value,
+    lookup_array,
+    match_mode=MatchMode.EXACT,
+    search_mode=SearchMode.FROM_FIRST,
+    processes=None,
+):
+    """
+    Performs an XMATCH operation, returning the index of the found match.
+
+    With processes, a WILDCARD or REGEX scan is split across that many worker processes
+    sharing the lookup array; other match modes ignore it.
+    """
+    match_mode, search_mode = _resolve_modes(match_mode, search_mode)
+    lookup_array = _validate_lookup_array(lookup_array)
+
+    if instrumentation.enabled:
+        instrumentation.record_call("xmatch", match_mode, search_mode, lookup_array.size, 1)
+
+    match match_mode:
+        case MatchMode.EXACT:
+            return _exact_index(lookup_value, lookup_array, search_mode)
+
+        case MatchMode.NEXT_LARGER | MatchMode.NEXT_SMALLER:
+            sorted_indices, sorted_lookup_array = _sort_lookup_array(lookup_array, search_mode)
+            idx = _approximate_indices(
+                np.atleast_1d(lookup_value), sorted_indices, sorted_lookup_array,
+                match_mode, search_mode
+            )
+            return int(idx[0])
 
-            matches = pd.Series(lookup_array).str.match(regex.pattern, na=False)
-            if matches.any():
-                return (matches.idxmax()
-                        if search_mode == SearchMode.FROM_FIRST
-                        else matches[::-1].idxmax())
+        case MatchMode.REGEX | MatchMode.WILDCARD:
+            if processes is not None:
+                return _pattern_indices_in_processes(
+                    [lookup_value], lookup_array, match_mode, search_mode, processes
+                )[0]
+            return _pattern_index(lookup_value, lookup_array, match_mode, search_mode)
 
     return None
+
+
+def xmatch_many(
+    lookup_values,
+    lookup_array,
+    match_mode=MatchMode.EXACT,
+    search_mode=SearchMode.FROM_FIRST,
+    workers=None,
+    executor=None,
+    processes=None,
+):
+    """
+    Performs an XMATCH operation for many lookup values at once.
+
+    The lookup array is validated and sorted once and all values are resolved with a single
+    binary search. Returns an integer array of indices, with NOT_FOUND (-1) for lookup values
+    that have no match. With workers (a number of threads) or an executor, large batches are
+    split into chunks resolved in parallel; the result is the same as without. With
+    processes, WILDCARD and REGEX scans are split across that many worker processes.
+    """
+    match_mode, search_mode = _resolve_modes(match_mode, search_mode)
+    lookup_array = _validate_lookup_array(lookup_array)
+    lookup_values = np.atleast_1d(ensure_numpy_array(lookup_values))
+
+    if lookup_values.ndim != 1:
+        raise ValueError("lookup_values must be 1D")
+
+    if instrumentation.enabled:
+        instrumentation.record_call("xmatch_many", match_mode, search_mode, lookup_array.size,
+                                    lookup_values.size)
+
+    return _match_many(lookup_values, lookup_array, match_mode, search_mode,
+                       workers=workers, executor=executor, processes=processes)
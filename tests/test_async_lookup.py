@@ -0,0 +1,184 @@
+"""Tests for the micro-batching asyncio lookup facade."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import numpy as np
+from excel_in_python import AsyncLookup, xlookup
+from excel_in_python.enums import MatchMode, SearchMode
+
+
+@pytest.fixture
+def data():
+    """Fixture to provide a lookup array with duplicates, a return array and lookup values."""
+    rng = np.random.default_rng(0)
+    lookup_array = rng.integers(0, 50, 200)
+    return lookup_array, np.arange(200) * 10, rng.integers(-5, 55, 100)
+
+
+async def lookup_all(service, lookup_values):
+    """Awaits one lookup per value concurrently, as independent callers would."""
+    return await asyncio.gather(*(service.lookup(value) for value in lookup_values))
+
+
+@pytest.mark.parametrize(
+    "match_mode, search_mode",
+    [
+        (MatchMode.EXACT, SearchMode.FROM_FIRST),
+        (MatchMode.EXACT, SearchMode.FROM_LAST),
+        (MatchMode.NEXT_SMALLER, SearchMode.FROM_FIRST),
+        (MatchMode.NEXT_LARGER, SearchMode.FROM_LAST),
+    ],
+)
+def test_results_match_xlookup(data, match_mode, search_mode):
+    """Test that each caller receives what xlookup returns for its value."""
+    lookup_array, return_array, lookup_values = data
+    service = AsyncLookup(lookup_array, return_array, "-", match_mode, search_mode)
+
+    results = asyncio.run(lookup_all(service, lookup_values))
+
+    expected = [xlookup(value, lookup_array, return_array, "-", match_mode, search_mode)
+                for value in lookup_values]
+    assert results == expected
+
+
+def test_wildcard_results():
+    """Test that wildcard patterns are resolved in batches too."""
+    service = AsyncLookup(np.array(["apple", "banana", "cherry"]), np.array([1, 2, 3]),
+                          match_mode=MatchMode.WILDCARD)
+
+    results = asyncio.run(lookup_all(service, ["b*", "*rr*", "z?"]))
+
+    assert results == [2, 3, None]
+
+
+def test_2d_return_array(data):
+    """Test that each caller receives the row of a 2D return array for its match."""
+    lookup_array, return_array, lookup_values = data
+    return_array = np.column_stack([return_array, -return_array])
+    service = AsyncLookup(lookup_array, return_array, default=0)
+
+    results = asyncio.run(lookup_all(service, lookup_values))
+
+    for value, result in zip(lookup_values, results):
+        expected = xlookup(value, lookup_array, return_array, default=0)
+        np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize(
+    "max_batch_size, batch_sizes",
+    [
+        (1000, {100: 1}),
+        (32, {4: 1, 32: 3}),
+        (1, {1: 100}),
+    ],
+)
+def test_requests_are_coalesced(data, max_batch_size, batch_sizes):
+    """Test that concurrent lookups are resolved in batches of at most max_batch_size."""
+    lookup_array, return_array, lookup_values = data
+    service = AsyncLookup(lookup_array, return_array, max_batch_size=max_batch_size)
+
+    asyncio.run(lookup_all(service, lookup_values))
+
+    info = service.info()
+    assert info.batch_sizes == batch_sizes
+    assert info.requests == 100
+    assert info.batches == sum(batch_sizes.values())
+    assert info.largest_batch == max(batch_sizes)
+
+
+def test_max_wait_flushes_a_partial_batch(data):
+    """Test that a lone lookup is resolved after max_wait without filling a batch."""
+    lookup_array, return_array, _ = data
+    service = AsyncLookup(lookup_array, return_array, max_wait=0.01)
+
+    async def lookup_twice():
+        first = await service.lookup(lookup_array[0])
+        second = await service.lookup(lookup_array[1])
+        return first, second
+
+    assert asyncio.run(lookup_twice()) == (return_array[0], return_array[1])
+    assert service.info().batch_sizes == {1: 2}
+
+
+def test_custom_executor(data):
+    """Test that batches are resolved on the given executor."""
+    lookup_array, return_array, lookup_values = data
+
+    with ThreadPoolExecutor(1, thread_name_prefix="batch") as executor:
+        service = AsyncLookup(lookup_array, return_array, executor=executor)
+        results = asyncio.run(lookup_all(service, lookup_values))
+
+    assert results == [xlookup(value, lookup_array, return_array) for value in lookup_values]
+
+
+def test_errors_only_reach_their_caller():
+    """Test that an error resolving one value is raised only in that value's caller."""
+    service = AsyncLookup(np.array(["apple", "banana"]), np.array([1, 2]),
+                          match_mode=MatchMode.REGEX)
+
+    async def lookup_bad_pattern():
+        return await asyncio.gather(service.lookup("("), service.lookup("b.*"),
+                                    service.lookup("c.*"), return_exceptions=True)
+
+    bad, good, missing = asyncio.run(lookup_bad_pattern())
+
+    assert isinstance(bad, Exception)
+    assert (good, missing) == (2, None)
+    assert service.info().batches == 1
+
+
+def test_mixed_value_types_in_one_batch():
+    """Test that values of different types in one batch do not affect each other's results."""
+    lookup_array, return_array = np.array([1, 2, 3]), np.array([10, 20, 30])
+    service = AsyncLookup(lookup_array, return_array, default="-")
+    lookup_values = [1, "x", None, 2.0, np.int64(3), "1", True]
+
+    results = asyncio.run(lookup_all(service, lookup_values))
+
+    assert results == [xlookup(value, lookup_array, return_array, "-")
+                       for value in lookup_values]
+    assert results == [10, "-", "-", 20, 30, "-", 10]
+    assert service.info().batch_sizes == {7: 1}
+
+
+def test_unsortable_lookup_array():
+    """Test that lookup arrays of objects that cannot be ordered are matched value by value."""
+    service = AsyncLookup(["a", None, "b"], [1, 2, 3], default=0)
+
+    assert asyncio.run(lookup_all(service, ["b", "c", "a"])) == [3, 0, 1]
+
+
+def test_cancelled_callers_are_skipped(data):
+    """Test that cancelling one caller does not affect the others in its batch."""
+    lookup_array, return_array, _ = data
+    service = AsyncLookup(lookup_array, return_array, max_wait=0.01)
+
+    async def cancel_one():
+        cancelled = asyncio.ensure_future(service.lookup(lookup_array[0]))
+        kept = asyncio.ensure_future(service.lookup(lookup_array[1]))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await kept
+
+    assert asyncio.run(cancel_one()) == return_array[1]
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"max_batch_size": 0}, "max_batch_size must be a positive integer"),
+        ({"max_batch_size": 2.5}, "max_batch_size must be a positive integer"),
+        ({"max_wait": -1}, "max_wait must be a non-negative number of seconds"),
+        ({"max_wait": "1"}, "max_wait must be a non-negative number of seconds"),
+    ],
+)
+def test_invalid_arguments(kwargs, message):
+    """Test that invalid batch limits raise a ValueError."""
+    with pytest.raises(ValueError, match=message):
+        AsyncLookup([1, 2, 3], [4, 5, 6], **kwargs)
+
+
+def test_mismatched_return_array():
+    """Test that a return array of the wrong length is rejected up front."""
+    with pytest.raises(ValueError):
+        AsyncLookup([1, 2, 3], [4, 5])
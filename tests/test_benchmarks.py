@@ -0,0 +1,70 @@
+"""Tests for the benchmark harness and its regression comparison."""
+import json
+import pytest
+from benchmarks import harness
+from benchmarks.__main__ import main
+
+
+def results(**seconds):
+    """Returns run results with the given seconds per case name."""
+    return {"results": [{"name": name, "seconds": value} for name, value in seconds.items()]}
+
+
+@pytest.mark.parametrize(
+    "current, regressed",
+    [
+        (1.0, False),
+        (1.2, False),
+        (0.5, False),
+        (1.3, True),
+    ],
+)
+def test_compare_flags_regressions(current, regressed):
+    """Test that cases more than the threshold slower than the baseline are flagged."""
+    rows = harness.compare(results(a=1.0), results(a=current), threshold=0.25)
+
+    assert rows == [("a", 1.0, current, current, regressed)]
+
+
+def test_compare_skips_cases_missing_from_the_baseline():
+    """Test that only cases present in both runs are compared."""
+    rows = harness.compare(results(a=1.0, b=1.0), results(b=1.0, c=9.0))
+
+    assert [row[0] for row in rows] == ["b"]
+    assert harness.missing(results(a=1.0, b=1.0), results(b=1.0, c=9.0)) == ["a"]
+
+
+def test_run_and_compare_commands(tmp_path, capsys):
+    """Test that the run command saves JSON results and compare exits 1 on a regression."""
+    baseline = tmp_path / "baseline.json"
+    assert main(["run", "--quick", "--repeat", "1", "--min-time", "0", "-k", "sequence[",
+                 "-o", str(baseline)]) == 0
+
+    saved = json.loads(baseline.read_text())
+    assert [result["params"]["dtype"] for result in saved["results"]] == [
+        "int64", "float64", "int32"
+    ]
+    assert saved["numpy"]
+
+    slower = dict(saved, results=[dict(result, seconds=result["seconds"] * 2)
+                                  for result in saved["results"]])
+    current = tmp_path / "current.json"
+    current.write_text(json.dumps(slower))
+
+    assert main(["compare", str(baseline), str(baseline)]) == 0
+    assert main(["compare", str(baseline), str(current)]) == 1
+    assert "3 of 3 benchmarks" in capsys.readouterr().out
+
+
+def test_compare_reports_missing_cases(tmp_path, capsys):
+    """Test that compare reports baseline cases missing from the current run, and fails on
+    them with --require-all."""
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps(results(a=1.0, b=1.0)))
+    current.write_text(json.dumps(results(b=1.0)))
+
+    assert main(["compare", str(baseline), str(current)]) == 0
+    output = capsys.readouterr().out
+    assert "a MISSING" in output
+    assert "1 baseline benchmarks missing from the current run" in output
+    assert main(["compare", str(baseline), str(current), "--require-all"]) == 1
@@ -0,0 +1,164 @@
+"""Tests for the array cache used by the lookup functions."""
+import gc
+import numpy as np
+from excel_in_python import xmatch
+from excel_in_python.cache import (
+    ArrayCache, array_fingerprint, cache_clear, cache_info, estimate_nbytes, freeze, is_frozen,
+    lookup_cache,
+)
+from excel_in_python.enums import MatchMode
+
+
+def frozen(values):
+    """Returns a frozen NumPy array of values."""
+    return freeze(np.array(values))
+
+
+def test_is_frozen(tmp_path):
+    """Test that arrays are only frozen when their contents cannot change."""
+    array = np.arange(5)
+    view = array[1:]
+    view.flags.writeable = False
+
+    assert not is_frozen(array)
+    assert not is_frozen(view)
+    assert is_frozen(frozen([1, 2, 3]))
+    assert is_frozen(frozen([1, 2, 3])[1:])
+    assert is_frozen(np.frombuffer(b"abcdefgh", dtype=np.int32))
+    assert not is_frozen(np.frombuffer(bytearray(b"abcdefgh"), dtype=np.int32))
+
+    np.save(tmp_path / "array.npy", array)
+    assert is_frozen(np.load(tmp_path / "array.npy", mmap_mode="r"))
+    assert not is_frozen(np.load(tmp_path / "array.npy", mmap_mode="c"))
+
+
+def test_read_only_flag_is_not_trusted():
+    """Test that an array whose owner can turn writes back on is not served stale results."""
+    array = np.array([1, 3, 5])
+    array.flags.writeable = False
+
+    assert not is_frozen(array)
+    assert xmatch(3, array) == 1
+
+    array.flags.writeable = True
+    array[1] = 7
+    array.flags.writeable = False
+
+    assert xmatch(3, array) is None
+    assert xmatch(7, array) == 1
+    assert xmatch(6, array, MatchMode.NEXT_LARGER) == 1
+
+
+def test_array_fingerprint():
+    """Test fingerprints of read-only, writeable and object arrays."""
+    array = np.array([3, 1, 2])
+
+    assert array_fingerprint(array) == array_fingerprint(array.copy())
+    assert array_fingerprint(array, hash_contents=False) is None
+    assert array_fingerprint(np.array([3, 1, 4])) != array_fingerprint(array)
+    assert array_fingerprint(np.array([3, 1, 2], dtype=object)) is None
+    assert array_fingerprint(frozen([3, 1, 2]), hash_contents=False)[0] == "frozen"
+
+
+def test_array_cache_hits_and_eviction():
+    """Test that the cache reuses built values and evicts the least recently used."""
+    cache = ArrayCache(max_entries=2)
+    builds = []
+
+    def build(array):
+        builds.append(array)
+        return array.sum()
+
+    arrays = [np.arange(n) for n in (3, 4, 5)]
+    for array in arrays + arrays[-1:]:
+        cache.get_or_build("sum", array, array_fingerprint(array), build)
+
+    assert len(builds) == 3
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_array_cache_drops_collected_arrays():
+    """Test that entries for read-only arrays are dropped when the array is collected."""
+    cache = ArrayCache()
+    array = frozen([1, 2, 3])
+    cache.get_or_build("sum", array, array_fingerprint(array), lambda a: a.sum())
+
+    assert len(cache) == 1
+
+    del array
+    gc.collect()
+
+    assert len(cache) == 0
+
+
+def test_array_cache_max_bytes():
+    """Test that the cache stays within its byte limit and skips oversized values."""
+    cache = ArrayCache(max_entries=10, max_bytes=100)
+    arrays = [np.arange(n, dtype=np.int64) for n in (5, 6, 7, 20)]
+
+    for array in arrays:
+        cache.get_or_build("copy", array, array_fingerprint(array), np.copy)
+
+    info = cache.info()
+    assert info.nbytes <= 100
+    assert info.entries == 1  # only the 7 element copy fits, 20 elements never do
+    assert info.misses == 4
+
+
+def test_sort_cache_info():
+    """Test that approximate matches reuse the cached sort and report hits and misses."""
+    cache_clear()
+    lookup_array = np.array([30, 10, 40, 20])
+
+    assert xmatch(25, lookup_array, MatchMode.NEXT_LARGER) == 0
+    assert xmatch(25, lookup_array, MatchMode.NEXT_SMALLER) == 3
+
+    info = cache_info()
+    assert (info.hits, info.misses, info.entries) == (1, 1, 1)
+    assert info.nbytes > 0
+
+    # a changed array must not be served the stale permutation
+    lookup_array[0] = 5
+    assert xmatch(25, lookup_array, MatchMode.NEXT_LARGER) == 2
+    assert cache_info().misses == 2
+
+    cache_clear()
+    assert cache_info() == (0, 0, 0, 0, lookup_cache.max_entries, lookup_cache.max_bytes)
+
+
+def test_occurrence_tables_are_compact_arrays():
+    """Test that cached occurrence tables are counted at a few bytes per unique value."""
+    cache_clear()
+    lookup_array = frozen(np.arange(10_000) % 1_000)
+
+    assert xmatch(7, lookup_array) == 7
+
+    info = cache_info()
+    assert info.entries == 2  # the sort and the occurrence tables
+    sort_nbytes = lookup_array.size * (lookup_array.itemsize + np.intp().itemsize)
+    assert info.nbytes - sort_nbytes <= 2 * 1_000 * (8 + np.intp().itemsize)
+
+
+def test_oversized_occurrence_tables_are_not_built(monkeypatch):
+    """Test that arrays whose tables could not be cached are searched without sorting."""
+    cache_clear()
+    monkeypatch.setattr(lookup_cache, "max_bytes", 1_000)
+    lookup_array = frozen(np.arange(1_000)[::-1])
+
+    assert xmatch(7, lookup_array) == 992
+    assert cache_info().misses == 0
+
+
+def test_estimate_nbytes_of_memory_maps(tmp_path):
+    """Test that file mappings count as empty but in-memory results of memmaps do not."""
+    np.save(tmp_path / "array.npy", np.arange(1_000))
+    mapped = np.load(tmp_path / "array.npy", mmap_mode="r")
+    permutation = np.argsort(mapped)
+
+    assert isinstance(permutation, np.memmap)
+    assert estimate_nbytes(mapped) == 0
+    assert estimate_nbytes(mapped[10:]) == 0
+    assert estimate_nbytes(permutation) == permutation.nbytes
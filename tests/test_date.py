@@ -12,35 +12,78 @@ from excel_in_python.date import date  # Replace with actual module name
 
         # Year as array
         (np.array([2000, 2001, 2002]), 5, 20,
-         [datetime(2000, 5, 20), datetime(2001, 5, 20), datetime(2002, 5, 20)]),
+         np.array(["2000-05-20", "2001-05-20", "2002-05-20"], dtype="datetime64[D]")),
 
         # Month as array
         (2023, np.array([1, 2, 3]), 15,
-         [datetime(2023, 1, 15), datetime(2023, 2, 15), datetime(2023, 3, 15)]),
+         np.array(["2023-01-15", "2023-02-15", "2023-03-15"], dtype="datetime64[D]")),
 
         # Day as array
         (2023, 5, np.array([10, 20, 30]),
-         [datetime(2023, 5, 10), datetime(2023, 5, 20), datetime(2023, 5, 30)]),
+         np.array(["2023-05-10", "2023-05-20", "2023-05-30"], dtype="datetime64[D]")),
+
+        # More than one array input, broadcast against each other
+        (np.array([2020, 2021]), np.array([5, 6]), 10,
+         np.array(["2020-05-10", "2021-06-10"], dtype="datetime64[D]")),
+        (np.array([2020, 2021]), 5, np.array([10, 15]),
+         np.array(["2020-05-10", "2021-05-15"], dtype="datetime64[D]")),
+        (np.array([[2020], [2021]]), np.array([1, 12]), np.array([31, 1]),
+         np.array([["2020-01-31", "2020-12-01"], ["2021-01-31", "2021-12-01"]],
+                  dtype="datetime64[D]")),
     ]
 )
 def test_date_valid_cases(year, month, day, expected):
     """Test the date function with valid inputs."""
     result = date(year, month, day)
     if isinstance(result, np.ndarray):
-        result = result.tolist()  # Convert NumPy array to list for comparison
-    assert result == expected
+        assert result.dtype == np.dtype("datetime64[D]")
+        np.testing.assert_array_equal(result, expected)
+    else:
+        assert result == expected
+
+
+@pytest.mark.parametrize(
+    "year, month, day, expected",
+    [
+        # Month and day overflow roll into the following months and years
+        (2024, 14, 35, datetime(2025, 3, 7)),
+        (2023, 2, 29, datetime(2023, 3, 1)),
+        (2023, 12, 32, datetime(2024, 1, 1)),
+
+        # Zero and negative months and days roll into the preceding months and years
+        (2024, 3, 0, datetime(2024, 2, 29)),
+        (2024, 0, 1, datetime(2023, 12, 1)),
+        (2024, -13, -1, datetime(2022, 10, 30)),
+
+        # Fractional arguments are truncated
+        (2024.9, 2.5, 29.99, datetime(2024, 2, 29)),
+    ]
+)
+def test_date_overflow(year, month, day, expected):
+    """Test that month and day overflow and underflow roll over like Excel's DATE."""
+    assert date(year, month, day) == expected
+
+
+def test_date_overflow_arrays():
+    """Test month and day overflow with broadcast arrays."""
+    result = date(2024, np.arange(1, 15), np.array([[0], [31]]))
+
+    assert result.shape == (2, 14)
+    assert result[0, 0] == np.datetime64("2023-12-31")
+    assert result[1, 1] == np.datetime64("2024-03-02")
+    assert result[1, 13] == np.datetime64("2025-03-03")
 
 
 @pytest.mark.parametrize(
     "year, month, day, expected_exception, expected_message",
     [
-        # More than one array input
-        (np.array([2020, 2021]), np.array([5, 6]), 10, ValueError,
-         "Only one of year, month, or day may be an array."),
-        (np.array([2020, 2021]), 5, np.array([10, 15]), ValueError,
-         "Only one of year, month, or day may be an array."),
-        (2023, np.array([5, 6]), np.array([10, 15]), ValueError,
-         "Only one of year, month, or day may be an array."),
+        # Non-numeric input
+        ("2023", 5, 20, ValueError, "year, month, and day must be numeric."),
+        (2023, np.array(["5"]), 20, ValueError, "year, month, and day must be numeric."),
+
+        # Scalar dates outside the range of datetime
+        (10000, 1, 1, ValueError,
+         "year, month, and day must give a date between years 1 and 9999."),
 
         # More than 2D arrays
         (np.array([[[2023]]]), 5, 20, ValueError,
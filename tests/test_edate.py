@@ -2,6 +2,7 @@
 from datetime import datetime
 import math
 import pytest
+import numpy as np
 from excel_in_python.date import edate  # Update with the actual module name
 
 @pytest.mark.parametrize(
@@ -75,3 +76,88 @@ def test_edate_invalid_inputs():
 
     with pytest.raises(ValueError, match="months must be an integer."):
         edate(datetime(2023, 1, 15), "2")  # Invalid months type
+
+# Test the datetime64 path with NumPy arrays
+@pytest.mark.parametrize(
+    "start_dates, months, expected",
+    [
+        (np.array(["2023-01-15", "2023-01-31", "2024-01-31", "NaT"], dtype="datetime64[D]"), 1,
+         np.array(["2023-02-15", "2023-02-28", "2024-02-29", "NaT"], dtype="datetime64[D]")),
+
+        # Times of day are dropped, as for datetime inputs
+        (np.array(["2023-03-31T18:30", "1969-12-31T23:59"], dtype="datetime64[m]"), -1,
+         np.array(["2023-02-28", "1969-11-30"], dtype="datetime64[D]")),
+
+        # 2D arrays keep their shape
+        (np.array([["2023-08-31", "2000-02-29"], ["2023-05-10", "2023-12-15"]],
+                  dtype="datetime64[D]"), 12,
+         np.array([["2024-08-31", "2001-02-28"], ["2024-05-10", "2024-12-15"]],
+                  dtype="datetime64[D]")),
+
+        # Object arrays with invalid elements
+        (np.array([datetime(2023, 1, 31), "invalid", None], dtype=object), 1,
+         np.array(["2023-02-28", "NaT", "NaT"], dtype="datetime64[D]")),
+    ]
+)
+def test_edate_datetime64(start_dates, months, expected):
+    """Test edate with NumPy arrays returns a datetime64[D] array."""
+    result = edate(start_dates, months)
+
+    assert result.dtype == np.dtype("datetime64[D]")
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_edate_pandas():
+    """Test edate with a pandas DatetimeIndex and Series."""
+    pd = pytest.importorskip("pandas")
+    index = pd.DatetimeIndex(["2023-01-31", None, "2024-03-31"])
+    expected = np.array(["2023-04-30", "NaT", "2024-06-30"], dtype="datetime64[D]")
+
+    np.testing.assert_array_equal(edate(index, 3), expected)
+    np.testing.assert_array_equal(edate(pd.Series(index), 3), expected)
+
+
+# Test broadcasting arrays of months against start dates
+@pytest.mark.parametrize(
+    "start_dates, months, expected",
+    [
+        # One start date, many months
+        (datetime(2024, 1, 31), np.array([0, 1, 2, -11]),
+         np.array(["2024-01-31", "2024-02-29", "2024-03-31", "2023-02-28"],
+                  dtype="datetime64[D]")),
+
+        # Each start date shifted by its own number of months
+        ([datetime(2023, 1, 31), datetime(2023, 5, 15), None], [1, 12, 3],
+         np.array(["2023-02-28", "2024-05-15", "NaT"], dtype="datetime64[D]")),
+
+        # Outer product of start dates and months
+        (np.array(["2023-01-31", "2023-03-15"], dtype="datetime64[D]")[:, None],
+         np.arange(3)[None, :],
+         np.array([["2023-01-31", "2023-02-28", "2023-03-31"],
+                   ["2023-03-15", "2023-04-15", "2023-05-15"]], dtype="datetime64[D]")),
+    ]
+)
+def test_edate_broadcast_months(start_dates, months, expected):
+    """Test edate with arrays of months broadcast against the start dates."""
+    result = edate(start_dates, months)
+
+    assert result.dtype == np.dtype("datetime64[D]")
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_edate_schedule():
+    """Test a start dates x 0..359 months schedule against scalar edate calls."""
+    start_dates = np.array(["2020-01-31", "2021-06-30", "2022-12-15"], dtype="datetime64[D]")
+    schedule = edate(start_dates[:, None], np.arange(360))
+
+    assert schedule.shape == (3, 360)
+    for i, start in enumerate(start_dates.tolist()):
+        for months in (0, 1, 13, 359):
+            start_datetime = datetime(start.year, start.month, start.day)
+            assert schedule[i, months] == edate(start_datetime, months)
+
+
+def test_edate_invalid_months_array():
+    """Test that arrays of non-integer months are rejected."""
+    with pytest.raises(ValueError, match="months must be an integer."):
+        edate(datetime(2023, 1, 15), np.array([1.5, 2.0]))
@@ -2,6 +2,7 @@
 from datetime import datetime
 import math
 import pytest
+import numpy as np
 from excel_in_python.date import eomonth  # Update with the actual module name
 
 @pytest.mark.parametrize(
@@ -75,3 +76,63 @@ def test_eomonth_invalid_inputs():
 
     with pytest.raises(ValueError, match="months must be an integer."):
         eomonth(datetime(2023, 1, 15), "2")  # Invalid months type
+
+# Test the datetime64 path with NumPy arrays
+@pytest.mark.parametrize(
+    "start_dates, months, expected",
+    [
+        (np.array(["2023-01-15", "2023-01-31", "2024-01-31", "NaT"], dtype="datetime64[D]"), 1,
+         np.array(["2023-02-28", "2023-02-28", "2024-02-29", "NaT"], dtype="datetime64[D]")),
+
+        (np.array(["2023-03-31T18:30", "1969-12-31T23:59"], dtype="datetime64[m]"), -1,
+         np.array(["2023-02-28", "1969-11-30"], dtype="datetime64[D]")),
+
+        (np.array([["2023-08-15", "2000-02-29"], ["2023-05-10", "2023-12-15"]],
+                  dtype="datetime64[D]"), 0,
+         np.array([["2023-08-31", "2000-02-29"], ["2023-05-31", "2023-12-31"]],
+                  dtype="datetime64[D]")),
+
+        (np.array([datetime(2023, 1, 15), 42, None], dtype=object), 1,
+         np.array(["2023-02-28", "NaT", "NaT"], dtype="datetime64[D]")),
+    ]
+)
+def test_eomonth_datetime64(start_dates, months, expected):
+    """Test eomonth with NumPy arrays returns a datetime64[D] array."""
+    result = eomonth(start_dates, months)
+
+    assert result.dtype == np.dtype("datetime64[D]")
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_eomonth_pandas():
+    """Test eomonth with a pandas DatetimeIndex and Series."""
+    pd = pytest.importorskip("pandas")
+    index = pd.DatetimeIndex(["2023-01-15", None, "2024-02-10"])
+    expected = np.array(["2023-04-30", "NaT", "2024-05-31"], dtype="datetime64[D]")
+
+    np.testing.assert_array_equal(eomonth(index, 3), expected)
+    np.testing.assert_array_equal(eomonth(pd.Series(index), 3), expected)
+
+
+# Test broadcasting arrays of months against start dates
+@pytest.mark.parametrize(
+    "start_dates, months, expected",
+    [
+        (datetime(2024, 1, 15), np.array([0, 1, -1]),
+         np.array(["2024-01-31", "2024-02-29", "2023-12-31"], dtype="datetime64[D]")),
+
+        ([datetime(2023, 1, 15), "invalid"], np.array([1, 2]),
+         np.array(["2023-02-28", "NaT"], dtype="datetime64[D]")),
+
+        (np.array(["2023-01-15", "2024-01-15"], dtype="datetime64[D]")[:, None],
+         np.array([[1, 13]]),
+         np.array([["2023-02-28", "2024-02-29"],
+                   ["2024-02-29", "2025-02-28"]], dtype="datetime64[D]")),
+    ]
+)
+def test_eomonth_broadcast_months(start_dates, months, expected):
+    """Test eomonth with arrays of months broadcast against the start dates."""
+    result = eomonth(start_dates, months)
+
+    assert result.dtype == np.dtype("datetime64[D]")
+    np.testing.assert_array_equal(result, expected)
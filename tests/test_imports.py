@@ -0,0 +1,30 @@
+"""Tests for the import cost of the excel_in_python package."""
+import subprocess
+import sys
+
+IMPORT_BUDGET = 0.5  # Seconds allowed for importing excel_in_python once NumPy is loaded
+
+IMPORT_SCRIPT = """
+import sys
+import time
+import numpy
+start = time.perf_counter()
+import excel_in_python
+import excel_in_python.date
+import excel_in_python.sequence
+elapsed = time.perf_counter() - start
+print(elapsed, "pandas" in sys.modules, "dateutil" in sys.modules)
+"""
+
+
+def test_import_time_and_heavy_dependencies():
+    """Test that importing the package is fast and does not load pandas or dateutil."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    elapsed, pandas_loaded, dateutil_loaded = float(output[0]), output[1], output[2]
+
+    assert elapsed < IMPORT_BUDGET
+    assert pandas_loaded == "False"
+    assert dateutil_loaded == "False"
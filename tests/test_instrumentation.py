@@ -0,0 +1,241 @@
+"""Tests for the opt-in instrumentation of the lookup hot paths."""
+import importlib
+import pytest
+import numpy as np
+from excel_in_python import LookupIndex, instrumentation, xlookup, xmatch, xmatch_many
+from excel_in_python.cache import cache_clear
+from excel_in_python.enums import MatchMode, SearchMode
+
+xmatch_module = importlib.import_module("excel_in_python.xmatch")
+utils_module = importlib.import_module("excel_in_python.utils")
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    """Fixture to start each test with instrumentation disabled and nothing recorded."""
+    instrumentation.disable()
+    instrumentation.reset()
+    cache_clear()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_by_default_and_records_nothing():
+    """Test that nothing is recorded and the original functions run while disabled."""
+    original = xmatch_module._argsort
+    xlookup(3, [1, 2, 3], [4, 5, 6])
+
+    assert not instrumentation.enabled
+    assert not hasattr(original, "__wrapped__")
+    assert instrumentation.stats().calls == {}
+    assert instrumentation.stats().phases == {}
+
+
+def test_enable_and_disable_swap_phase_functions():
+    """Test that enable() times the registered functions everywhere and disable() restores them."""
+    original = xmatch_module._argsort
+    ensure_numpy_array = utils_module.ensure_numpy_array
+
+    instrumentation.enable()
+    assert xmatch_module._argsort.__wrapped__ is original
+    assert importlib.import_module("excel_in_python.lookup_index")._argsort.__wrapped__ is original
+    assert xmatch_module.ensure_numpy_array.__wrapped__ is ensure_numpy_array
+
+    instrumentation.disable()
+    assert xmatch_module._argsort is original
+    assert importlib.import_module("excel_in_python.lookup_index")._argsort is original
+
+
+@pytest.mark.parametrize(
+    "function, args, phases",
+    [
+        (xmatch, (2, np.arange(10), MatchMode.NEXT_LARGER),
+         {"validation", "conversion", "sort", "search"}),
+        (xmatch, (2, [5, 2, 9]), {"validation", "conversion", "sort", "search"}),
+        (xmatch_many, ([2, 7], np.arange(10)), {"validation", "conversion", "sort", "search"}),
+        (xlookup, ([2, 7], np.arange(10), np.arange(10) * 2),
+         {"validation", "conversion", "sort", "search", "extraction"}),
+    ],
+)
+def test_phases_are_timed(function, args, phases):
+    """Test that the phases a lookup goes through are counted and timed."""
+    instrumentation.enable()
+    function(*args)
+
+    stats = instrumentation.stats()
+    assert set(stats.phases) == phases
+    assert all(phase.calls >= 1 and phase.seconds >= 0 for phase in stats.phases.values())
+
+
+def test_calls_modes_and_sizes():
+    """Test that calls are counted per function and per match and search mode, with sizes."""
+    lookup_array = np.arange(100)
+    instrumentation.enable()
+
+    xmatch(5, lookup_array)
+    xmatch(5, lookup_array, MatchMode.NEXT_SMALLER, SearchMode.FROM_LAST)
+    xmatch_many(np.arange(10), lookup_array[:50])
+
+    stats = instrumentation.stats()
+    assert stats.calls == {"xmatch": 2, "xmatch_many": 1}
+    assert stats.modes == {
+        (MatchMode.EXACT, SearchMode.FROM_FIRST): 2,
+        (MatchMode.NEXT_SMALLER, SearchMode.FROM_LAST): 1,
+    }
+    assert stats.lookup_values == 12
+    assert stats.lookup_array_elements == 250
+    assert stats.largest_lookup_array == 100
+
+
+def test_nested_calls_are_counted():
+    """Test that a batch xlookup counts both itself and the xmatch_many call it makes."""
+    instrumentation.enable()
+    xlookup([1, 2], np.arange(10), np.arange(10))
+
+    assert instrumentation.stats().calls == {"xlookup": 1, "xmatch_many": 1}
+
+
+def test_lookup_index_calls():
+    """Test that LookupIndex lookups are counted under their own names."""
+    index = LookupIndex(np.arange(10))
+    instrumentation.enable()
+
+    index.xmatch(3)
+    index.xlookup([3, 4], np.arange(10))
+
+    calls = instrumentation.stats().calls
+    assert calls["LookupIndex.xmatch"] == 1
+    assert calls["LookupIndex.xlookup"] == 1
+    assert calls["LookupIndex.xmatch_many"] == 1
+
+
+def test_copies():
+    """Test that arrays built from Python sequences and promoted results count as copies."""
+    instrumentation.enable()
+
+    xmatch_many(np.array([1, 2]), np.arange(10))
+    assert instrumentation.stats().copies == 1  # the sorted copy of the lookup array
+
+    xmatch_many(np.array([1, 2]), np.arange(10))
+    assert instrumentation.stats().copies == 1  # the sort is cached
+
+    xlookup(np.array([1, 20]), list(range(10)), np.arange(10.0), default="missing")
+    stats = instrumentation.stats()
+    assert stats.copies == 3  # the lookup array and the results promoted to object
+    assert stats.copied_bytes == 2 * 10 * 8 + 2 * np.dtype(object).itemsize
+
+
+def test_copies_of_lookup_arrays():
+    """Test that checksummed, sorted and lower-cased copies of lookup arrays are counted."""
+    events = []
+    instrumentation.add_hook(events.append)
+    try:
+        instrumentation.enable()
+        xmatch(3, np.arange(20)[::2], MatchMode.NEXT_LARGER)
+        xmatch("b*", np.array(["apple", "Banana", "cherry"]), MatchMode.WILDCARD)
+    finally:
+        instrumentation.remove_hook(events.append)
+
+    copies = [(event.name, event.value) for event in events if event.kind == "copy"]
+    assert ("array_fingerprint", 80) in copies  # a strided view is copied to checksum it
+    assert ("_argsort", 80) in copies
+    assert ("_folded_sort", 3 * 6 * 4) in copies
+
+
+def test_cache_hit_rate():
+    """Test that lookup cache hits and misses are counted per cached structure."""
+    lookup_array = np.arange(10)[::-1].copy()
+    instrumentation.enable()
+
+    for _ in range(4):
+        xmatch(3, lookup_array, MatchMode.NEXT_LARGER)
+
+    stats = instrumentation.stats()
+    assert stats.cache["sort"] == (3, 1, 0.75)
+    assert stats.cache_hit_rate == 0.75
+
+
+def test_nested_phases_are_exclusive():
+    """Test that time in a nested phase is not also counted in the enclosing phase."""
+    events = []
+    instrumentation.add_hook(events.append)
+    try:
+        instrumentation.enable()
+        xmatch(2, list(range(100_000)))
+    finally:
+        instrumentation.remove_hook(events.append)
+
+    phases = [event for event in events if event.kind == "phase"]
+    validation = sum(event.value for event in phases if event.name == "validation")
+    conversion = sum(event.value for event in phases if event.name == "conversion")
+    assert conversion > validation  # converting the list dominates the validation
+
+
+def test_hooks_receive_events():
+    """Test that hooks receive each event while enabled, and none once removed."""
+    events = []
+    instrumentation.add_hook(events.append)
+    instrumentation.enable()
+
+    xmatch(3, np.arange(10))
+    kinds = {event.kind for event in events}
+    call = next(event for event in events if event.kind == "call")
+
+    instrumentation.remove_hook(events.append)
+    count = len(events)
+    xmatch(3, np.arange(10))
+
+    assert kinds == {"call", "phase"}
+    assert call.name == "xmatch"
+    assert call.details == {"match_mode": MatchMode.EXACT, "search_mode": SearchMode.FROM_FIRST,
+                            "lookup_array_size": 10}
+    assert len(events) == count
+
+
+def test_profile_scopes_its_stats():
+    """Test that profile() records only its block and restores the disabled state."""
+    lookup_array = np.arange(10)
+    instrumentation.enable()
+    xmatch(1, lookup_array)
+    instrumentation.disable()
+
+    with instrumentation.profile() as profiler:
+        assert instrumentation.enabled
+        xmatch(2, lookup_array)
+        xmatch(3, lookup_array)
+
+    assert not instrumentation.enabled
+    assert profiler.stats().calls == {"xmatch": 2}
+    assert instrumentation.stats().calls == {"xmatch": 3}
+
+    xmatch(4, lookup_array)
+    assert profiler.stats().calls == {"xmatch": 2}
+
+
+def test_profile_keeps_instrumentation_enabled():
+    """Test that profile() leaves instrumentation enabled if it already was."""
+    instrumentation.enable()
+    with instrumentation.profile():
+        pass
+    assert instrumentation.enabled
+
+
+def test_results_are_unchanged():
+    """Test that instrumented lookups return the same results."""
+    rng = np.random.default_rng(0)
+    lookup_array, lookup_values = rng.integers(0, 50, 200), rng.integers(-5, 55, 100)
+    expected = xlookup(lookup_values, lookup_array, np.arange(200), default=-1,
+                       match_mode=MatchMode.NEXT_LARGER)
+
+    with instrumentation.profile():
+        result = xlookup(lookup_values, lookup_array, np.arange(200), default=-1,
+                         match_mode=MatchMode.NEXT_LARGER)
+
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_invalid_phase():
+    """Test that registering a function for an unknown phase raises a ValueError."""
+    with pytest.raises(ValueError, match="phase must be one of"):
+        instrumentation.phase("parsing")
@@ -0,0 +1,204 @@
+"""Test cases for the LookupIndex class."""
+import pytest
+import numpy as np
+from excel_in_python import LookupIndex, lookup_index, xlookup, xmatch, xmatch_many
+from excel_in_python.cache import cache_clear, cache_info
+from excel_in_python.enums import MatchMode, SearchMode
+
+
+@pytest.fixture
+def data():
+    """Fixture to provide a numeric lookup array with duplicates."""
+    lookup = [133, 306, 533, 273, 657, 671, 751, 893, 956, 504, 11,
+              767, 170, 27, 433, 826, 427, 209, 645, 136, 362, 582,
+              862, 313, 197, 1, 715, 54, 397, 178, 209]
+
+    return lookup
+
+
+@pytest.mark.parametrize("match_mode", [MatchMode.EXACT, MatchMode.NEXT_LARGER,
+                                        MatchMode.NEXT_SMALLER])
+@pytest.mark.parametrize("search_mode", list(SearchMode))
+def test_lookup_index_xmatch(data, match_mode, search_mode):
+    """Test that LookupIndex.xmatch agrees with xmatch for every mode combination."""
+    binary = search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.BINARY_FROM_LAST)
+    lookup_array = np.sort(np.array(data)) if binary else np.array(data)
+    index = LookupIndex(lookup_array)
+
+    for lookup_value in [209, 10, 1, 0, 956, 1000, 500, 27, 133]:
+        assert (index.xmatch(lookup_value, match_mode, search_mode)
+                == xmatch(lookup_value, lookup_array, match_mode, search_mode))
+
+
+@pytest.mark.parametrize("match_mode", [MatchMode.EXACT, MatchMode.NEXT_LARGER,
+                                        MatchMode.NEXT_SMALLER])
+@pytest.mark.parametrize("search_mode", list(SearchMode))
+def test_lookup_index_xmatch_many(data, match_mode, search_mode):
+    """Test that LookupIndex.xmatch_many agrees with xmatch_many for every mode combination."""
+    binary = search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.BINARY_FROM_LAST)
+    lookup_array = np.sort(np.array(data)) if binary else np.array(data)
+    lookup_values = [209, 10, 1, 0, 956, 1000, 500, 27, 133]
+
+    result = LookupIndex(lookup_array).xmatch_many(lookup_values, match_mode, search_mode)
+
+    assert result.tolist() == xmatch_many(
+        lookup_values, lookup_array, match_mode, search_mode).tolist()
+
+
+def test_lookup_index_text():
+    """Test LookupIndex with exact, wildcard and regex matches on text."""
+    index = LookupIndex(["555 Birch Blvd", "101 Pine Rd", "56 Third Blvd", "101 Pine Rd"])
+
+    assert index.xmatch("101 Pine Rd") == 1
+    assert index.xmatch("101 Pine Rd", search_mode=SearchMode.FROM_LAST) == 3
+    assert index.xmatch("* Blvd", MatchMode.WILDCARD, SearchMode.FROM_LAST) == 2
+    assert index.xmatch(".*Rd$", MatchMode.REGEX) == 1
+    assert index.xmatch("1 Main St") is None
+
+
+def test_lookup_index_xlookup(data):
+    """Test that LookupIndex.xlookup agrees with xlookup for single and multiple values."""
+    lookup_array = np.array(data)
+    return_array = np.arange(len(data) * 2).reshape(len(data), 2)
+    index = LookupIndex(lookup_array)
+
+    assert np.all(index.xlookup(209, return_array) == xlookup(209, lookup_array, return_array))
+    assert index.xlookup(1000, return_array, default=-1) == -1
+    assert np.all(index.xlookup([209, 1000, 11], return_array.T, default=-1)
+                  == xlookup([209, 1000, 11], lookup_array, return_array.T, default=-1))
+
+
+def test_lookup_index_unhashable_lookup_value(data):
+    """Test that unhashable lookup values fall back to the binary search."""
+    index = LookupIndex(np.array(data))
+
+    assert index.xmatch(np.array(209)) == 17
+
+
+def test_lookup_index_unsortable_objects():
+    """Test that an index over objects that cannot be ordered matches like the free functions."""
+    lookup_array = np.array(["a", None, "b", "a"], dtype=object)
+    index = LookupIndex(lookup_array)
+
+    assert index.sorted_indices is None
+    assert index.xmatch("b") == xmatch("b", lookup_array) == 2
+    assert index.xmatch("a", search_mode=SearchMode.FROM_LAST) == 3
+    assert index.xmatch("c") is None
+    np.testing.assert_array_equal(index.xmatch_many(["a", "b", "c"]), [0, 2, -1])
+    assert index.xlookup("b", [1, 2, 3, 4]) == xlookup("b", lookup_array, [1, 2, 3, 4]) == 3
+    assert index.xmatch("a*", MatchMode.WILDCARD) == 0
+
+
+def test_lookup_index_invalid_lookup_array():
+    """Test that LookupIndex validates the lookup array like xmatch."""
+    with pytest.raises(ValueError, match="lookup_array must not be empty"):
+        LookupIndex([])
+
+    with pytest.raises(ValueError, match="lookup_array must be 1D"):
+        LookupIndex([[1, 2], [3, 4]])
+
+
+@pytest.fixture
+def saved_index(tmp_path):
+    """Fixture to save a lookup array with duplicates and its index sidecar to a .npy file."""
+    lookup_array = np.random.default_rng(0).integers(0, 500, 2_000)
+    path = tmp_path / "lookup.npy"
+    LookupIndex(lookup_array).save(path)
+    return path, lookup_array
+
+
+def sidecar_mtimes(path):
+    """Returns the modification times of the files in the sidecar of path."""
+    sidecar = path.parent / (path.name + ".index")
+    return {file.name: file.stat().st_mtime_ns for file in sidecar.iterdir()}
+
+
+@pytest.mark.parametrize("match_mode", [MatchMode.EXACT, MatchMode.NEXT_LARGER,
+                                        MatchMode.NEXT_SMALLER])
+@pytest.mark.parametrize("search_mode", [SearchMode.FROM_FIRST, SearchMode.FROM_LAST])
+def test_lookup_index_open(saved_index, match_mode, search_mode):
+    """Test that an opened index is memory-mapped and agrees with xmatch."""
+    path, lookup_array = saved_index
+    index = LookupIndex.open(path)
+
+    assert isinstance(index.lookup_array, np.memmap)
+    assert isinstance(index.sorted_indices, np.memmap)
+    for lookup_value in [0, 17, 250, 499, 500, -3]:
+        assert (index.xmatch(lookup_value, match_mode, search_mode)
+                == xmatch(lookup_value, lookup_array, match_mode, search_mode))
+    np.testing.assert_array_equal(
+        index.xmatch_many([3, 250, 600], match_mode, search_mode),
+        xmatch_many([3, 250, 600], lookup_array, match_mode, search_mode),
+    )
+
+
+def test_lookup_index_open_reuses_sidecar(saved_index):
+    """Test that opening an index with a valid sidecar does not rebuild it."""
+    path, _ = saved_index
+    mtimes = sidecar_mtimes(path)
+
+    LookupIndex.open(path)
+    LookupIndex.open(path, rebuild=False, verify_hash=True)
+    assert sidecar_mtimes(path) == mtimes
+
+
+def test_lookup_index_open_seeds_cache(saved_index):
+    """Test that xmatch on an opened lookup array uses the sidecar instead of sorting."""
+    path, lookup_array = saved_index
+    cache_clear()
+    index = LookupIndex.open(path)
+    misses = cache_info().misses
+    assert cache_info().nbytes < 1_000  # the memory-mapped index is not counted
+
+    assert (xmatch(250, index.lookup_array, MatchMode.NEXT_LARGER)
+            == xmatch(250, lookup_array, MatchMode.NEXT_LARGER))
+    assert xmatch(17, index.lookup_array) == xmatch(17, lookup_array)
+    assert cache_info().misses == misses + 1  # only the in-memory array was sorted
+
+
+def test_lookup_index_open_rebuilds_stale_sidecar(saved_index):
+    """Test that a sidecar is rebuilt when the lookup array file changes."""
+    path, _ = saved_index
+    np.save(path, np.array([5, 3, 9, 3, 1]))
+
+    with pytest.raises(ValueError, match="missing or out of date"):
+        LookupIndex.open(path, rebuild=False)
+
+    index = LookupIndex.open(path)
+    assert index.xmatch(3, search_mode=SearchMode.FROM_LAST) == 3
+    assert LookupIndex.open(path, rebuild=False).xmatch(9) == 2
+
+
+def test_lookup_index_open_rebuilds_other_versions(saved_index, monkeypatch):
+    """Test that a sidecar from another format version is not used."""
+    path, _ = saved_index
+    monkeypatch.setattr(lookup_index, "SIDECAR_VERSION", lookup_index.SIDECAR_VERSION + 1)
+
+    with pytest.raises(ValueError, match="missing or out of date"):
+        LookupIndex.open(path, rebuild=False)
+
+
+def test_lookup_index_open_without_sidecar(tmp_path):
+    """Test that opening a .npy file without a sidecar builds one."""
+    path = tmp_path / "words.npy"
+    np.save(path, np.array(["pear", "apple", "fig", "apple"]))
+
+    index = LookupIndex.open(path)
+    assert (path.parent / "words.npy.index" / "meta.json").exists()
+    assert index.xmatch("apple") == 1
+    assert index.xmatch("apple", search_mode=SearchMode.FROM_LAST) == 3
+    assert index.xlookup("fig", np.array([10, 20, 30, 40])) == 30
+
+
+def test_lookup_index_save_objects(tmp_path):
+    """Test that lookup arrays of Python objects cannot be saved."""
+    with pytest.raises(ValueError, match="cannot be saved"):
+        LookupIndex(np.array(["a", "b"], dtype=object)).save(tmp_path / "objects.npy")
+
+
+def test_lookup_index_save_appends_npy(tmp_path):
+    """Test that, as with np.save, saving to a path without .npy writes path + ".npy"."""
+    LookupIndex(np.array([30, 10, 20])).save(tmp_path / "noext")
+
+    assert (tmp_path / "noext.npy.index" / "meta.json").exists()
+    assert LookupIndex.open(tmp_path / "noext.npy", rebuild=False).xmatch(20) == 2
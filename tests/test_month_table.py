@@ -0,0 +1,61 @@
+"""Tests for the precomputed month table used by EDATE and EOMONTH."""
+from datetime import datetime, timedelta
+import time
+import pytest
+import numpy as np
+from excel_in_python import date as date_module
+from excel_in_python.date import _adjust_date, _shift_months_general, edate, eomonth, month_table
+
+
+def test_month_table():
+    """Test the month starts and day to month mapping of the month table."""
+    first_day, month_starts, day_months = month_table(2023, 2024)
+
+    assert first_day == np.datetime64("2023-01-01", "D").astype(np.int64)
+    assert len(month_starts) == 25
+    assert np.diff(month_starts)[[0, 1, 13]].tolist() == [31, 28, 29]
+    assert day_months[[0, 30, 31, 730]].tolist() == [0, 0, 1, 23]
+    assert month_table(2023, 2024) is month_table(2023, 2024)  # shared across calls
+
+
+@pytest.mark.parametrize("months", [0, 1, -1, 25, -1200, 2400])
+@pytest.mark.parametrize("end_of_month", [False, True])
+def test_month_table_matches_general_path(months, end_of_month):
+    """Test that table lookups agree with the general path, inside and outside the table."""
+    rng = np.random.default_rng(0)
+    start_dates = np.datetime64("1700-01-01") + rng.integers(0, 250_000, 5_000)
+    start_dates[::50] = np.datetime64("NaT")
+
+    in_table = ((start_dates > np.datetime64("2000-01-01"))
+                & (start_dates < np.datetime64("2100-01-01")))
+
+    for dates in (start_dates, start_dates[in_table]):
+        result = date_module._shift_months(dates, months, end_of_month)
+        expected = _shift_months_general(dates, months, end_of_month)
+        np.testing.assert_array_equal(result, expected)
+
+
+def test_month_table_years_configurable(monkeypatch):
+    """Test that the years covered by the month table can be changed."""
+    monkeypatch.setattr(date_module, "MONTH_TABLE_YEARS", (1600, 1700))
+    start_dates = np.array(["1650-01-31", "1699-12-15"], dtype="datetime64[D]")
+
+    np.testing.assert_array_equal(
+        edate(start_dates, 1), np.array(["1650-02-28", "1700-01-15"], dtype="datetime64[D]"))
+
+
+def test_month_table_speedup():
+    """Test that the month table path is much faster than the relativedelta path."""
+    start_dates = [datetime(2000, 1, 1) + timedelta(days=i) for i in range(20_000)]
+    start_array = np.array(start_dates, dtype="datetime64[D]")
+
+    start = time.perf_counter()
+    expected = [_adjust_date(start_date, 7, day=31) for start_date in start_dates]
+    relativedelta_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = eomonth(start_array, 7)
+    table_time = time.perf_counter() - start
+
+    assert result.tolist() == expected
+    assert table_time * 10 < relativedelta_time
@@ -0,0 +1,228 @@
+"""Tests for parallel batch lookups on thread and process pools."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import pytest
+import numpy as np
+from excel_in_python import LookupIndex, parallel, xlookup, xmatch, xmatch_many
+from excel_in_python.cache import lookup_cache
+from excel_in_python.enums import MatchMode, SearchMode
+from excel_in_python.parallel import (
+    SharedArray,
+    attach_shared_array,
+    chunk_bounds,
+    clear_shared_arrays,
+    run_chunks,
+    shared_array_names,
+    shared_process_pool,
+)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Fixture to split even small batches into chunks."""
+    monkeypatch.setattr(parallel, "MIN_CHUNK_SIZE", 10)
+
+
+@pytest.fixture
+def data():
+    """Fixture to provide a lookup array with duplicates and a batch of lookup values."""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 400, 500), rng.integers(-10, 410, 1_000)
+
+
+@pytest.mark.parametrize("size, chunks, expected", [
+    (10, 3, [(0, 3), (3, 6), (6, 10)]),
+    (4, 4, [(0, 1), (1, 2), (2, 3), (3, 4)]),
+    (0, 2, [(0, 0), (0, 0)]),
+])
+def test_chunk_bounds(size, chunks, expected):
+    """Test that chunk bounds are contiguous and cover the whole range."""
+    assert chunk_bounds(size, chunks) == expected
+
+
+def test_run_chunks_uses_threads_in_order(small_chunks):
+    """Test that run_chunks spreads chunks over threads and keeps their order."""
+    threads = set()
+
+    def record(start, stop):
+        threads.add(threading.get_ident())
+        return (start, stop)
+
+    assert run_chunks(record, 100, workers=4) == chunk_bounds(100, 4)
+    assert threading.get_ident() not in threads
+    assert run_chunks(record, 100) == [(0, 100)]
+    assert run_chunks(record, 5, workers=4) == [(0, 5)]  # too small to split
+
+
+@pytest.mark.parametrize("workers", [0, -1, 1.5, True, "2"])
+def test_run_chunks_invalid_workers(workers):
+    """Test that workers must be a positive integer."""
+    with pytest.raises(ValueError, match="workers must be a positive integer"):
+        run_chunks(lambda start, stop: None, 100, workers=workers)
+
+
+@pytest.mark.parametrize("match_mode", [MatchMode.EXACT, MatchMode.NEXT_LARGER,
+                                        MatchMode.NEXT_SMALLER])
+@pytest.mark.parametrize("search_mode", [SearchMode.FROM_FIRST, SearchMode.FROM_LAST])
+def test_parallel_xmatch_many(small_chunks, data, match_mode, search_mode):
+    """Test that parallel xmatch_many gives the same result as the serial version."""
+    lookup_array, lookup_values = data
+    expected = xmatch_many(lookup_values, lookup_array, match_mode, search_mode)
+
+    np.testing.assert_array_equal(
+        xmatch_many(lookup_values, lookup_array, match_mode, search_mode, workers=4), expected)
+    np.testing.assert_array_equal(
+        LookupIndex(lookup_array).xmatch_many(lookup_values, match_mode, search_mode,
+                                              workers=3), expected)
+
+
+def test_parallel_xmatch_many_wildcard(small_chunks):
+    """Test that parallel pattern matching gives the same result as the serial version."""
+    lookup_array = np.array(["apple", "banana", "cherry", "date"] * 10)
+    lookup_values = np.array(["b*", "?ate", "c*y", "z*"] * 10)
+
+    np.testing.assert_array_equal(
+        xmatch_many(lookup_values, lookup_array, MatchMode.WILDCARD, workers=2),
+        xmatch_many(lookup_values, lookup_array, MatchMode.WILDCARD),
+    )
+
+
+def test_parallel_xlookup(small_chunks, data):
+    """Test that parallel xlookup gives the same results for 1D and 2D return arrays."""
+    lookup_array, lookup_values = data
+    return_1d = lookup_array * 10
+    return_2d = np.stack([lookup_array, -lookup_array])
+
+    for return_array, default in [(return_1d, None), (return_1d, -1), (return_2d, 0)]:
+        expected = xlookup(lookup_values, lookup_array, return_array, default)
+        result = xlookup(lookup_values, lookup_array, return_array, default, workers=4)
+        assert result.dtype == expected.dtype
+        np.testing.assert_array_equal(result, expected)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        np.testing.assert_array_equal(
+            xlookup(lookup_values, lookup_array, return_2d, 0, executor=executor),
+            xlookup(lookup_values, lookup_array, return_2d, 0),
+        )
+        np.testing.assert_array_equal(
+            LookupIndex(lookup_array).xlookup(lookup_values, return_1d, executor=executor),
+            xlookup(lookup_values, lookup_array, return_1d),
+        )
+
+
+def test_parallel_xlookup_scalar(data):
+    """Test that a single lookup value ignores workers."""
+    lookup_array, _ = data
+    assert (xlookup(int(lookup_array[3]), lookup_array, lookup_array * 2, workers=4)
+            == lookup_array[3] * 2)
+
+
+@pytest.fixture(scope="module")
+def words():
+    """Fixture to provide a string lookup array with repeated words."""
+    rng = np.random.default_rng(1)
+    vocabulary = np.array(["apple", "Banana", "cherry", "date", "elderberry", "fig", "grape",
+                           "kiwi*", "lemon", "mango"])
+    return vocabulary[rng.integers(0, len(vocabulary), 5_000)]
+
+
+@pytest.mark.parametrize("match_mode, lookup_values", [
+    (MatchMode.WILDCARD, ["b*", "?ig", "*err*", "kiwi~*", "z*", "*"]),
+    (MatchMode.REGEX, ["b.n.*", "[fg].*", "LEMON", "x+", ".*o$"]),
+])
+@pytest.mark.parametrize("search_mode", [SearchMode.FROM_FIRST, SearchMode.FROM_LAST])
+def test_process_pool_patterns(words, match_mode, lookup_values, search_mode):
+    """Test that pattern scans on a process pool agree with the serial scan."""
+    expected = xmatch_many(lookup_values, words, match_mode, search_mode)
+
+    np.testing.assert_array_equal(
+        xmatch_many(lookup_values, words, match_mode, search_mode, processes=3), expected)
+    assert ([xmatch(value, words, match_mode, search_mode, processes=2)
+             for value in lookup_values]
+            == [None if idx == -1 else idx for idx in expected])
+
+
+def test_process_pool_xlookup(words):
+    """Test that xlookup accepts processes for pattern matches."""
+    return_array = np.arange(len(words))
+    lookup_values = ["ch*", "m?ngo", "none"]
+
+    np.testing.assert_array_equal(
+        xlookup(lookup_values, words, return_array, -1, MatchMode.WILDCARD, processes=2),
+        xlookup(lookup_values, words, return_array, -1, MatchMode.WILDCARD),
+    )
+
+
+def test_process_pool_reused(words, monkeypatch):
+    """Test that process pools and shared copies of the lookup array are reused, even when
+    the copy is too large for the lookup cache."""
+    monkeypatch.setattr(lookup_cache, "max_bytes", 1_000)
+    clear_shared_arrays()
+    xmatch_many(["a*"], words, MatchMode.WILDCARD, processes=2)
+    names = shared_array_names()
+
+    xmatch_many(["b*"], words, MatchMode.WILDCARD, processes=2)
+    assert shared_array_names() == names and len(names) == 1
+    assert shared_process_pool(2) is shared_process_pool(2)
+
+
+def test_shared_arrays_bounded(words, monkeypatch):
+    """Test that only SHARED_ARRAYS shared copies are kept and older ones are removed."""
+    monkeypatch.setattr(parallel, "SHARED_ARRAYS", 2)
+    clear_shared_arrays()
+    names = []
+    for i in range(4):
+        xmatch_many(["a*"], np.char.add(words, str(i)), MatchMode.WILDCARD, processes=2)
+        names.extend(shared_array_names() - set(names))
+
+    assert shared_array_names() == set(names[-2:])
+    for name in names[:-2]:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+def test_attach_shared_array_releases_stale():
+    """Test that workers unmap shared arrays the parent no longer keeps."""
+    first, second = SharedArray(np.array(["a"])), SharedArray(np.array(["b"]))
+    attach_shared_array(first.descriptor)
+    attach_shared_array(second.descriptor, {first.descriptor[0], second.descriptor[0]})
+    assert {first.descriptor[0], second.descriptor[0]} <= set(parallel._attached)
+
+    attach_shared_array(second.descriptor, {second.descriptor[0]})
+    assert first.descriptor[0] not in parallel._attached
+    assert second.descriptor[0] in parallel._attached
+
+
+def test_process_pool_objects():
+    """Test that object arrays are shared as strings, or scanned serially if not all strings."""
+    strings = np.array(["alpha", "beta", "gamma"], dtype=object)
+    mixed = np.array([1, "beta", None, "bet"], dtype=object)
+
+    assert xmatch("g*", strings, MatchMode.WILDCARD, processes=2) == 2
+    assert xmatch("bet*", mixed, MatchMode.WILDCARD, SearchMode.FROM_LAST, processes=2) == 3
+    assert xmatch("1", mixed, MatchMode.WILDCARD, processes=2) is None
+
+
+def test_process_pool_invalid():
+    """Test that invalid process counts and BINARY search modes raise errors."""
+    with pytest.raises(ValueError, match="processes must be a positive integer"):
+        xmatch("a*", np.array(["a"]), MatchMode.WILDCARD, processes=0)
+    with pytest.raises(ValueError, match="BINARY search modes are not supported"):
+        xmatch_many(["a*"], np.array(["a"]), MatchMode.WILDCARD,
+                    SearchMode.BINARY_FROM_FIRST, processes=2)
+
+
+def test_shared_array():
+    """Test that a SharedArray holds a copy of the array and is removed when collected."""
+    array = np.array(["one", "two", "three"])
+    shared = SharedArray(array)
+    name, shape, dtype = shared.descriptor
+
+    np.testing.assert_array_equal(attach_shared_array(shared.descriptor), array)
+    assert (shape, dtype) == (array.shape, array.dtype.str)
+    assert shared.nbytes >= array.nbytes
+
+    del shared
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
@@ -1,7 +1,9 @@
 """Tests for the sequence module."""
+from datetime import date, datetime, timedelta
+import tracemalloc
 import pytest
 import numpy as np
-from excel_in_python.sequence import sequence, MAX_ELEMENTS
+from excel_in_python.sequence import sequence, sequence_chunks, SequenceArray, MAX_ELEMENTS
 
 
 # create parameterized inputs for sequence with expected results
@@ -117,3 +119,249 @@ def test_sequence_negative_rows_columns(rows, columns):
     """Test that sequence raises ValueError for negative row or column values."""
     with pytest.raises(ValueError, match="rows and columns must be at least 1"):
         sequence(rows, columns)
+
+
+@pytest.mark.parametrize(
+    "rows, columns, start, step",
+    [(1, 1, 1, 1), (3, 4, 1, 1), (3, 2, 1.5, -0.1), (2.5, 3, -1, 0.5), (3, 3, 5, 0)]
+)
+def test_lazy_sequence_matches_eager(rows, columns, start, step):
+    """Test that a materialized SequenceArray equals the eager sequence."""
+    lazy = sequence(rows, columns, start, step, lazy=True)
+    expected = sequence(rows, columns, start, step)
+
+    assert isinstance(lazy, SequenceArray)
+    assert lazy.shape == expected.shape
+    assert lazy.dtype == expected.dtype
+    assert np.asarray(lazy).tolist() == expected.tolist()
+    assert [row.tolist() for row in lazy] == expected.tolist()
+
+
+def test_lazy_sequence_indexing():
+    """Test that indexing a SequenceArray matches indexing the eager sequence."""
+    lazy = sequence(6, 5, 10, 3, lazy=True)
+    expected = sequence(6, 5, 10, 3)
+
+    for key in [(2, 3), (-1, -1), 4, -2, slice(1, 4), (slice(None), 0),
+                (slice(None, None, -2), slice(1, None, 2)), (3, slice(None, 2))]:
+        np.testing.assert_array_equal(lazy[key], expected[key])
+
+    assert isinstance(lazy[2, 3], np.integer)
+    with pytest.raises(IndexError):
+        lazy[6, 0]
+    with pytest.raises(IndexError):
+        lazy[[0, 1]]
+
+
+def test_lazy_sequence_beyond_max_elements():
+    """Test that a lazy sequence may describe far more than MAX_ELEMENTS elements."""
+    lazy = sequence(10**5, 10**5, lazy=True)
+
+    assert lazy.size == 10**10 > MAX_ELEMENTS
+    assert len(lazy) == 10**5
+    assert lazy[-1, -1] == 10**10
+    assert lazy[12_345, 6:9].tolist() == [1_234_500_007, 1_234_500_008, 1_234_500_009]
+
+
+def test_lazy_sequence_arithmetic():
+    """Test that scalar arithmetic keeps a SequenceArray lazy and matches the eager result."""
+    lazy = sequence(3, 4, 2, 3, lazy=True)
+    expected = sequence(3, 4, 2, 3)
+
+    for result, eager in [(lazy + 1, expected + 1), (1 + lazy, 1 + expected),
+                          (lazy - 2, expected - 2), (10 - lazy, 10 - expected),
+                          (lazy * 2, expected * 2), (np.int64(2) * lazy, expected * 2),
+                          (lazy / 4, expected / 4), (-lazy, -expected)]:
+        assert isinstance(result, SequenceArray)
+        np.testing.assert_allclose(np.asarray(result), eager)
+
+    np.testing.assert_array_equal(lazy + np.arange(4), expected + np.arange(4))
+    np.testing.assert_allclose(np.sqrt(lazy), np.sqrt(expected))
+
+
+@pytest.mark.parametrize(
+    "rows, columns, start, step, chunk_rows",
+    [(7, 3, 1, 1, 3), (7, 3, 1.5, -0.1, 2), (5, 4, 2, 0, 5), (1, 1, 1, 1, 10), (10, 2, 1, 1, None)]
+)
+def test_sequence_chunks(rows, columns, start, step, chunk_rows):
+    """Test that the blocks of sequence_chunks stack up to the eager sequence."""
+    blocks = [block.copy() for block in sequence_chunks(rows, columns, start, step, chunk_rows)]
+    expected = sequence(rows, columns, start, step)
+
+    assert np.vstack(blocks).tolist() == expected.tolist()
+    assert all(block.dtype == expected.dtype for block in blocks)
+    assert all(len(block) == (chunk_rows or rows) for block in blocks[:-1])
+
+
+def test_sequence_chunks_reuse_buffer():
+    """Test that every block is a view of the same buffer."""
+    blocks = list(sequence_chunks(10, 2, chunk_rows=4))
+
+    assert all(np.shares_memory(block, blocks[0]) for block in blocks)
+    assert next(sequence(3, 2, lazy=True).chunks(2)).tolist() == [[1, 2], [3, 4]]
+
+
+def test_sequence_chunks_invalid():
+    """Test that invalid arguments raise errors before any block is produced."""
+    with pytest.raises(ValueError, match="chunk_rows must be an integer of at least 1"):
+        sequence_chunks(10, 2, chunk_rows=0)
+    with pytest.raises(ValueError, match="rows and columns must be at least 1"):
+        sequence_chunks(0, 2)
+
+
+def peak_memory_of_chunks(rows):
+    """Returns the peak traced memory while summing a chunked sequence of rows rows."""
+    tracemalloc.start()
+    try:
+        total = sum(int(block.sum()) for block in sequence_chunks(rows, 10, chunk_rows=1_000))
+        return tracemalloc.get_traced_memory()[1], total
+    finally:
+        tracemalloc.stop()
+
+
+def test_sequence_chunks_constant_memory():
+    """Test that the peak memory of a chunked sequence does not grow with its rows."""
+    small_peak, small_total = peak_memory_of_chunks(10_000)
+    large_peak, large_total = peak_memory_of_chunks(2_000_000)
+
+    assert small_total == 100_000 * 100_001 // 2
+    assert large_total == 20_000_000 * 20_000_001 // 2
+    assert large_peak < small_peak * 1.5
+    assert large_peak < 20_000_000 * 8 / 100  # far below the 160 MB of the whole sequence
+
+
+@pytest.mark.parametrize(
+    "start, step, dtype",
+    [(1, 1, np.int32), (-5, 3, np.int16), (1, 0.1, np.float32), (1.5, -0.5, np.float64),
+     (1, 1, np.uint64), (7, 0, np.int8)]
+)
+def test_sequence_dtype(start, step, dtype):
+    """Test that dtype sets the dtype of eager, lazy and chunked sequences."""
+    expected = sequence(40, 30, start, step).astype(dtype)
+
+    for result in [sequence(40, 30, start, step, dtype=dtype),
+                   np.asarray(sequence(40, 30, start, step, lazy=True, dtype=dtype)),
+                   np.vstack([block.copy() for block in
+                              sequence_chunks(40, 30, start, step, 7, dtype=dtype)])]:
+        assert result.dtype == dtype
+        np.testing.assert_array_equal(result, expected)
+
+
+def test_sequence_dtype_overflow():
+    """Test that values outside the range of an integer dtype raise an error."""
+    with pytest.raises(ValueError, match="sequence values do not fit in dtype int32"):
+        sequence(2, 2, 2**31 - 2, dtype=np.int32)
+    with pytest.raises(ValueError, match="sequence values do not fit in dtype uint8"):
+        sequence_chunks(2, 2, 2, -1, dtype=np.uint8)
+
+
+@pytest.mark.parametrize(
+    "start, step, expected",
+    [
+        (np.datetime64("2024-01-30"), np.timedelta64(1, "D"),
+         [["2024-01-30", "2024-01-31"], ["2024-02-01", "2024-02-02"]]),
+        (date(2024, 1, 31), timedelta(days=7),
+         [["2024-01-31", "2024-02-07"], ["2024-02-14", "2024-02-21"]]),
+        (datetime(2024, 1, 1), timedelta(hours=6),
+         [["2024-01-01T00", "2024-01-01T06"], ["2024-01-01T12", "2024-01-01T18"]]),
+    ]
+)
+def test_date_sequence(start, step, expected):
+    """Test sequences of dates with a timedelta step."""
+    expected = np.array(expected, dtype="datetime64")
+
+    np.testing.assert_array_equal(sequence(2, 2, start, step), expected)
+    np.testing.assert_array_equal(sequence(2, 2, start, step, lazy=True)[1], expected[1])
+    assert sequence(2, 2, start, step, dtype="datetime64[s]").dtype == "datetime64[s]"
+
+
+def test_date_sequence_needs_timedelta_step():
+    """Test that a date start with a numeric step raises an error."""
+    with pytest.raises(ValueError, match="step must be a timedelta when start is a date"):
+        sequence(2, 2, date(2024, 1, 1), 1)
+
+
+def test_sequence_out(tmp_path):
+    """Test that out is filled in place and returned, including memory maps."""
+    out = np.zeros((300, 400), dtype=np.int32)
+    assert sequence(300, 400, out=out) is out
+    np.testing.assert_array_equal(out, sequence(300, 400))
+
+    transposed = np.zeros((4, 3)).T
+    np.testing.assert_array_equal(sequence(3, 4, 2, 0.5, out=transposed), sequence(3, 4, 2, 0.5))
+
+    mapped = np.lib.format.open_memmap(tmp_path / "sequence.npy", mode="w+",
+                                       dtype=np.int64, shape=(MAX_ELEMENTS // 1000 + 1, 1000))
+    sequence(*mapped.shape, out=mapped)  # beyond MAX_ELEMENTS, in memory the caller owns
+    mapped.flush()
+    assert np.load(tmp_path / "sequence.npy", mmap_mode="r")[-1, -1] == mapped.size
+
+
+def test_sequence_out_invalid():
+    """Test that an out array of the wrong shape or dtype raises an error."""
+    with pytest.raises(ValueError, match="out must have shape"):
+        sequence(2, 3, out=np.zeros((3, 2)))
+    with pytest.raises(ValueError, match="dtype must match the dtype of out"):
+        sequence(2, 3, out=np.zeros((2, 3)), dtype=np.int32)
+    with pytest.raises(ValueError, match="out cannot be used with lazy=True"):
+        sequence(2, 3, out=np.zeros((2, 3)), lazy=True)
+
+
+@pytest.mark.parametrize(
+    "rows, columns, start, step, expected",
+    [
+        (3, 4, [100, 200, 300], 1,
+         [[100, 101, 102, 103], [200, 201, 202, 203], [300, 301, 302, 303]]),
+        (2, 3, [[1], [10]], [[1], [-1]], [[1, 2, 3], [10, 9, 8]]),
+        (3, 2, 1, [1, 2, 3], [[1, 2], [1, 3], [1, 4]]),
+        (3, 3, [[0, 10, 20]], [[1, 2, 3]], [[0, 10, 20], [1, 12, 23], [2, 14, 26]]),
+        (2, 2, [1.5, 2.5], 0.5, [[1.5, 2.0], [2.5, 3.0]]),
+        (2, 2, [[7]], 1, [[7, 8], [9, 10]]),  # a single value behaves like a scalar
+    ]
+)
+def test_sequence_array_start_step(rows, columns, start, step, expected):
+    """Test per-row and per-column start and step arrays in every sequence form."""
+    assert sequence(rows, columns, start, step).tolist() == expected
+    assert np.asarray(sequence(rows, columns, start, step, lazy=True)).tolist() == expected
+    assert [row.tolist() for row in sequence(rows, columns, start, step, lazy=True)] == expected
+    blocks = [block.copy() for block in sequence_chunks(rows, columns, start, step, 1)]
+    assert np.vstack(blocks).tolist() == expected
+
+
+def test_sequence_array_start_step_indexing():
+    """Test indexing a lazy sequence of per-row ranges."""
+    lazy = sequence(1_000, 10**9, start=np.arange(1_000) * 10**9, lazy=True)
+
+    assert lazy[123, 456] == 123 * 10**9 + 456
+    assert lazy[-1, -2:].tolist() == [10**12 - 2, 10**12 - 1]
+    assert lazy[:3, 0].tolist() == [0, 10**9, 2 * 10**9]
+    np.testing.assert_array_equal(lazy[2:5, 7:9], [[2 * 10**9 + 7, 2 * 10**9 + 8],
+                                                   [3 * 10**9 + 7, 3 * 10**9 + 8],
+                                                   [4 * 10**9 + 7, 4 * 10**9 + 8]])
+
+
+def test_sequence_array_start_dates():
+    """Test per-row date starts with a timedelta step."""
+    starts = np.array(["2024-01-01", "2024-02-01"], dtype="datetime64[D]")
+    expected = np.array([["2024-01-01", "2024-01-08"], ["2024-02-01", "2024-02-08"]],
+                        dtype="datetime64[D]")
+
+    np.testing.assert_array_equal(sequence(2, 2, starts, timedelta(days=7)), expected)
+
+
+@pytest.mark.parametrize(
+    "rows, columns, start, step, message",
+    [
+        (2, 3, [1, 2, 3], 1, "one value per row or one value per column"),
+        (2, 3, [[1, 2, 3], [4, 5, 6]], 1, "one value per row or one value per column"),
+        (2, 3, [1, 2], [[1, 2, 3]], "one value per row or one value per column"),
+        (2, 3, ["a", "b"], 1, "All arguments must be numeric"),
+        (2, 3, np.array(["2024-01-01", "2024-01-02"], dtype="datetime64[D]"), 1,
+         "step must be a timedelta when start is a date"),
+        (2, 3, [2**31 - 3, 2**31 - 2], 1, "sequence values do not fit in dtype int32"),
+    ]
+)
+def test_sequence_array_start_step_invalid(rows, columns, start, step, message):
+    """Test that start and step arrays of the wrong shape or type raise errors."""
+    with pytest.raises(ValueError, match=message):
+        sequence(rows, columns, start, step, dtype=np.int32)
@@ -0,0 +1,98 @@
+"""Tests for the Excel serial number conversions in the date module."""
+from datetime import datetime
+import math
+import pytest
+import numpy as np
+from excel_in_python.date import date, edate, eomonth, from_serial, to_serial
+
+
+@pytest.mark.parametrize(
+    "dates, date_system, expected",
+    [
+        (datetime(2024, 1, 1), 1900, 45292.0),
+        (datetime(2024, 1, 1, 18), 1900, 45292.75),
+        (datetime(1900, 1, 1), 1900, 1.0),
+        (datetime(1900, 2, 28), 1900, 59.0),
+        (datetime(1900, 3, 1), 1900, 61.0),  # Excel's fictitious 1900-02-29 is serial 60
+        (datetime(1904, 1, 1), 1904, 0.0),
+        (datetime(2024, 1, 1), 1904, 43830.0),
+        (datetime(1899, 12, 1), 1900, math.nan),  # before the 1900 date system
+        (datetime(1903, 12, 31), 1904, math.nan),  # before the 1904 date system
+    ]
+)
+def test_to_serial(dates, date_system, expected):
+    """Test the conversion of single dates to Excel serial numbers."""
+    result = to_serial(dates, date_system)
+    if math.isnan(expected):
+        assert math.isnan(result)
+    else:
+        assert result == expected
+
+
+def test_to_serial_arrays():
+    """Test the conversion of datetime64 arrays and lists to Excel serial numbers."""
+    dates = np.array(["2024-01-01T06:00", "NaT", "1900-03-01T00:00"], dtype="datetime64[ns]")
+
+    np.testing.assert_array_equal(to_serial(dates), [45292.25, np.nan, 61.0])
+    np.testing.assert_array_equal(to_serial([datetime(2024, 1, 1), "invalid"]),
+                                  [45292.0, np.nan])
+
+
+@pytest.mark.parametrize(
+    "serials, date_system, expected",
+    [
+        (45292, 1900, "2024-01-01T00:00"),
+        (45292.75, 1900, "2024-01-01T18:00"),
+        (1, 1900, "1900-01-01T00:00"),
+        (59, 1900, "1900-02-28T00:00"),
+        (60, 1900, "1900-02-28T00:00"),  # Excel's fictitious 1900-02-29
+        (61, 1900, "1900-03-01T00:00"),
+        (0, 1904, "1904-01-01T00:00"),
+        (43830.5, 1904, "2024-01-01T12:00"),
+        (-1, 1900, "NaT"),
+        (np.nan, 1900, "NaT"),
+    ]
+)
+def test_from_serial(serials, date_system, expected):
+    """Test the conversion of single Excel serial numbers to datetime64 values."""
+    result = from_serial(serials, date_system)
+    np.testing.assert_array_equal(result, np.datetime64(expected, "ms"))
+
+
+def test_serial_round_trip():
+    """Test that to_serial and from_serial round trip in both date systems."""
+    serials = np.array([1.0, 59.0, 61.0, 45292.5, 2958465.999988426])
+    for date_system in (1900, 1904):
+        np.testing.assert_allclose(to_serial(from_serial(serials, date_system), date_system),
+                                   serials)
+
+    dates = from_serial(serials, unit="D")
+    assert dates.dtype == np.dtype("datetime64[D]")
+    assert dates[-1] == np.datetime64("9999-12-31")
+
+
+def test_serial_invalid_date_system():
+    """Test that only the 1900 and 1904 date systems are accepted."""
+    with pytest.raises(ValueError, match="date_system must be 1900 or 1904."):
+        to_serial(datetime(2024, 1, 1), 1902)
+
+    with pytest.raises(ValueError, match="date_system must be 1900 or 1904."):
+        from_serial(45292, 1902)
+
+
+def test_serial_inputs_and_outputs():
+    """Test that edate, eomonth and date accept and return serial numbers."""
+    serials = np.array([45322.0, 45351.5])  # 2024-01-31 and 2024-02-29 12:00
+
+    np.testing.assert_array_equal(
+        edate(serials, 1), np.array(["2024-02-29", "2024-03-29"], dtype="datetime64[D]"))
+    np.testing.assert_array_equal(edate(serials, 1, as_serial=True), [45351.0, 45380.0])
+    np.testing.assert_array_equal(eomonth(serials, 0, as_serial=True), [45322.0, 45351.0])
+    np.testing.assert_array_equal(
+        eomonth(serials - 1462, 0, as_serial=True, date_system=1904),
+        [45322.0 - 1462, 45351.0 - 1462])
+    assert edate(datetime(2024, 1, 31), 1, as_serial=True) == 45351.0
+
+    assert date(2024, 1, 1, as_serial=True) == 45292.0
+    np.testing.assert_array_equal(date(2024, np.array([1, 13]), 1, as_serial=True),
+                                  [45292.0, 45658.0])
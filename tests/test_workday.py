@@ -0,0 +1,188 @@
+"""Tests for the WORKDAY and NETWORKDAYS functions and holiday calendars in the date module."""
+from datetime import date, datetime, timedelta
+import pytest
+import numpy as np
+from excel_in_python.date import (
+    HolidayCalendar,
+    holiday_calendar,
+    networkdays,
+    networkdays_intl,
+    workday,
+    workday_intl,
+)
+
+CHRISTMAS = [datetime(2024, 12, 25), datetime(2024, 12, 26)]
+
+
+def reference_workday(start_date, days, weekend_days=(5, 6), holidays=()):
+    """Steps one day at a time, as a reference for WORKDAY.INTL."""
+    step = 1 if days > 0 else -1
+    current = start_date
+    while days != 0:
+        current += timedelta(days=step)
+        if current.weekday() not in weekend_days and current not in holidays:
+            days -= step
+    return current
+
+
+@pytest.mark.parametrize(
+    "start_date, days, holidays, expected",
+    [
+        (datetime(2024, 1, 5), 1, None, datetime(2024, 1, 8)),  # Friday to Monday
+        (datetime(2024, 1, 6), 1, None, datetime(2024, 1, 8)),  # Saturday to Monday
+        (datetime(2024, 1, 6), -1, None, datetime(2024, 1, 5)),  # Saturday to Friday
+        (datetime(2024, 1, 6), 0, None, datetime(2024, 1, 6)),  # No offset keeps the date
+        (datetime(2024, 1, 1), 10, None, datetime(2024, 1, 15)),
+        (datetime(2024, 1, 1), 2.9, None, datetime(2024, 1, 3)),  # Days are truncated
+        (datetime(2024, 12, 24), 1, CHRISTMAS, datetime(2024, 12, 27)),
+        (datetime(2024, 12, 27), -1, CHRISTMAS, datetime(2024, 12, 24)),
+    ]
+)
+def test_workday(start_date, days, holidays, expected):
+    """Test WORKDAY with scalar arguments."""
+    assert workday(start_date, days, holidays) == expected
+
+
+@pytest.mark.parametrize(
+    "weekend, weekend_days",
+    [
+        (1, (5, 6)),
+        (2, (6, 0)),
+        (7, (4, 5)),
+        (11, (6,)),
+        (17, (5,)),
+        ("0000011", (5, 6)),
+        ("1010100", (0, 2, 4)),
+    ]
+)
+def test_workday_intl_matches_reference(weekend, weekend_days):
+    """Test WORKDAY.INTL against a day-by-day reference for several weekends."""
+    start = datetime(2024, 2, 1)
+    for days in (-15, -3, -1, 1, 4, 23):
+        expected = reference_workday(start, days, weekend_days, CHRISTMAS)
+        assert workday_intl(start, days, weekend, CHRISTMAS) == expected
+
+
+def test_workday_arrays():
+    """Test that start dates, days and weekends are broadcast against each other."""
+    starts = np.array(["2024-01-05", "2024-01-06", "NaT"], dtype="datetime64[D]")
+
+    np.testing.assert_array_equal(
+        workday(starts, 1),
+        np.array(["2024-01-08", "2024-01-08", "NaT"], dtype="datetime64[D]"),
+    )
+    np.testing.assert_array_equal(
+        workday(starts[:1], [[-1], [1]]),
+        np.array([["2024-01-04"], ["2024-01-08"]], dtype="datetime64[D]"),
+    )
+    np.testing.assert_array_equal(
+        workday_intl(starts[0], 1, weekend=[1, 11, 16, "0000000"]),
+        np.array(["2024-01-08", "2024-01-06", "2024-01-06", "2024-01-06"],
+                 dtype="datetime64[D]"),
+    )
+
+
+def test_workday_serial_numbers():
+    """Test that numeric arrays are read as serial numbers and as_serial returns them."""
+    np.testing.assert_array_equal(workday(np.array([45296.0]), 1), np.array(["2024-01-08"],
+                                                                           dtype="datetime64[D]"))
+    assert workday(datetime(2024, 1, 5), 1, as_serial=True) == 45299.0
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, holidays, expected",
+    [
+        (datetime(2024, 1, 1), datetime(2024, 1, 31), None, 23),
+        (datetime(2024, 1, 31), datetime(2024, 1, 1), None, -23),
+        (datetime(2024, 1, 6), datetime(2024, 1, 6), None, 0),  # A Saturday
+        (datetime(2024, 1, 8), datetime(2024, 1, 8), None, 1),  # A Monday
+        (datetime(2024, 12, 23), datetime(2024, 12, 27), CHRISTMAS, 3),
+    ]
+)
+def test_networkdays(start_date, end_date, holidays, expected):
+    """Test NETWORKDAYS with scalar arguments."""
+    result = networkdays(start_date, end_date, holidays)
+    assert result == expected
+    assert isinstance(result, int)
+
+
+def test_networkdays_arrays():
+    """Test NETWORKDAYS.INTL with arrays of dates and weekends, and NaN for invalid dates."""
+    starts = np.array(["2024-01-01", "NaT", "2024-01-31"], dtype="datetime64[D]")
+    end = np.datetime64("2024-01-07")
+
+    np.testing.assert_array_equal(networkdays(starts, end), [5, np.nan, -18])
+    np.testing.assert_array_equal(networkdays_intl(starts[0], end, weekend=[1, 11, "1111100"]),
+                                  [5, 6, 2])
+    assert networkdays(starts[[0, 2]], end).dtype == np.int64
+
+
+def test_holiday_calendar_is_cached():
+    """Test that the same holiday set gives the same calendar, whatever its order or form."""
+    calendar = holiday_calendar(CHRISTMAS)
+
+    assert isinstance(calendar, HolidayCalendar)
+    assert holiday_calendar(CHRISTMAS[::-1] + CHRISTMAS) is calendar
+    assert holiday_calendar(np.array(CHRISTMAS, dtype="datetime64[D]")) is calendar
+    assert holiday_calendar(calendar) is calendar
+    assert holiday_calendar(calendar, weekend=11) is holiday_calendar(CHRISTMAS, 11)
+    assert workday(datetime(2024, 12, 24), 1, calendar) == datetime(2024, 12, 27)
+
+
+@pytest.mark.parametrize(
+    "holidays",
+    [
+        [date(2024, 1, 8)],
+        date(2024, 1, 8),
+        {date(2024, 1, 8)},
+        [45299],  # Excel serial number of 2024-01-08
+        np.array([45299.0, np.nan]),
+        [datetime(2024, 1, 8), None, np.datetime64("NaT")],
+    ],
+)
+def test_holiday_forms(holidays):
+    """Test that holidays may be dates, datetimes or serial numbers, ignoring missing values."""
+    assert workday(datetime(2024, 1, 5), 1, holidays) == datetime(2024, 1, 9)
+    assert networkdays(datetime(2024, 1, 1), datetime(2024, 1, 12), holidays) == 9
+
+
+def test_serial_holidays_in_1904_date_system():
+    """Test that serial number holidays are read in the given date system."""
+    assert workday(datetime(2024, 1, 5), 1, [45299 - 1462], date_system=1904) == datetime(
+        2024, 1, 9
+    )
+
+
+@pytest.mark.parametrize("holidays", [["2024-01-08"], [date(2024, 1, 8), "soon"], [-5]])
+def test_invalid_holidays(holidays):
+    """Test that holidays that are not dates raise an error instead of being dropped."""
+    with pytest.raises(ValueError, match="holidays must be dates or Excel serial numbers."):
+        workday(datetime(2024, 1, 5), 1, holidays)
+
+
+def test_date_arguments():
+    """Test that datetime.date start and end dates are accepted."""
+    assert networkdays(date(2024, 1, 1), date(2024, 1, 31)) == 23
+    assert workday(date(2024, 1, 5), 1) == datetime(2024, 1, 8)
+
+
+@pytest.mark.parametrize("weekend", [0, 8, "1111111", "000001", "0000012", None])
+def test_invalid_weekend(weekend):
+    """Test that invalid weekend codes and strings raise an error."""
+    with pytest.raises(ValueError, match="weekend must be"):
+        workday_intl(datetime(2024, 1, 1), 1, weekend)
+
+
+@pytest.mark.parametrize("days", ["one", np.nan, [1, None]])
+def test_invalid_days(days):
+    """Test that non-numeric days raise an error."""
+    with pytest.raises(ValueError, match="days must be numeric."):
+        workday(datetime(2024, 1, 1), days)
+
+
+def test_invalid_scalar_dates():
+    """Test that scalar non-dates raise an error."""
+    with pytest.raises(ValueError, match="start_date must be a datetime object."):
+        workday("2024-01-01", 1)
+    with pytest.raises(ValueError, match="must be datetime objects."):
+        networkdays(datetime(2024, 1, 1), "invalid")
@@ -2,6 +2,7 @@
 import pytest
 import numpy as np
 from excel_in_python import xlookup
+from excel_in_python.cache import cache_clear, cache_info
 from excel_in_python.enums import MatchMode, SearchMode
 
 
@@ -378,3 +379,88 @@ def test_xlookup_return_array_different_length():
         ValueError,
         match="1D return_array must have the same length as lookup_array"):
         xlookup(1, lookup_array, return_array)
+
+# test multiple lookup values with vertical and horizontal return arrays
+@pytest.mark.parametrize("orientation", ["vertical", "horizontal"])
+def test_xlookup_many(data, orientation):
+    """Test that xlookup gathers one result per lookup value and keeps the return dtype."""
+    lookup_array = np.array([i for i, _ in data])
+    return_array = np.array([t for _, t in data])
+    return_array = return_array.T if orientation == "horizontal" else return_array
+
+    result = xlookup([209, 11, 133], lookup_array, return_array)
+
+    assert result.dtype == return_array.dtype
+    assert result.tolist() == [
+        ['xi4', 'omicron4', 'pi4', 'rho4', 'sigma4'],
+        ['gamma3', 'delta3', 'epsilon3', 'zeta3', 'eta3'],
+        ['alpha', 'beta', 'gamma', 'delta', 'epsilon'],
+    ]
+
+
+@pytest.mark.parametrize(
+    "default, expected_result, expected_kind",
+    [
+        (None, [20, None, 40], "O"),
+        (0, [20, 0, 40], "i"),
+        (-1.5, [20, -1.5, 40], "f"),
+        ("missing", [20, "missing", 40], "O"),
+    ]
+)
+def test_xlookup_many_default(default, expected_result, expected_kind):
+    """Test that misses are filled from default without losing the return dtype."""
+    lookup_array = np.array([1, 2, 3, 4])
+    return_array = np.array([10, 20, 30, 40])
+
+    result = xlookup([2, 5, 4], lookup_array, return_array, default=default)
+
+    assert result.dtype.kind == expected_kind
+    assert result.tolist() == expected_result
+
+
+def test_xlookup_default_scalar():
+    """Test that a single lookup value with no match returns default."""
+    lookup_array = np.array([1, 2, 3])
+    return_array = np.array(["a", "b", "c"])
+
+    assert xlookup(5, lookup_array, return_array, default="none") == "none"
+
+
+@pytest.mark.parametrize(
+    "lookup_value, search_mode, expected_result",
+    [
+        ("a", SearchMode.FROM_FIRST, 1),
+        ("a", SearchMode.FROM_LAST, 4),
+        (None, SearchMode.FROM_FIRST, 3),
+        (2, SearchMode.FROM_FIRST, 5),
+        ("z", SearchMode.FROM_FIRST, "none"),
+    ]
+)
+def test_xlookup_object_array_with_none(lookup_value, search_mode, expected_result):
+    """Test exact lookups in an object array mixing strings, None and numbers."""
+    lookup_array = ["a", "b", None, "a", 2]
+    return_array = [1, 2, 3, 4, 5]
+
+    result = xlookup(lookup_value, lookup_array, return_array, default="none",
+                     search_mode=search_mode)
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_xlookup_many_object_array_with_none(workers):
+    """Test that batches against an object array that cannot be sorted match value by value."""
+    lookup_array = np.array(["a", "b", None, "a", 2], dtype=object)
+    lookup_array.flags.writeable = False
+
+    result = xlookup(["a", None, 2, "z"], lookup_array, [1, 2, 3, 4, 5], default=0,
+                     workers=workers)
+
+    assert result.tolist() == [1, 3, 5, 0]
+
+
+def test_xlookup_scalar_does_not_sort():
+    """Test that a single exact lookup in a writeable array does not sort it."""
+    cache_clear()
+    assert xlookup(3, np.array([5, 3, 1]), np.array([10, 20, 30])) == 20
+    assert cache_info().misses == 0
@@ -1,7 +1,11 @@
 """Test cases for the xmatch function."""
 import pytest
 import numpy as np
-from excel_in_python import xmatch
+from excel_in_python import xmatch, xmatch_many
+from excel_in_python.cache import freeze
+from excel_in_python.xmatch import (
+    NOT_FOUND, SCAN_CHUNK_SIZE, compile_pattern, wildcard_prefix, wildcard_to_regex
+)
 from excel_in_python.enums import MatchMode, SearchMode
 
 
@@ -210,3 +214,196 @@ def test_xmatch_lookup_array_not_iterable():
 
     with pytest.raises(TypeError, match="lookup_array must be iterable"):
         xmatch(1, lookup_array)
+
+# test that xmatch_many agrees with xmatch for every match and search mode combination
+@pytest.mark.parametrize("match_mode", [MatchMode.EXACT, MatchMode.NEXT_LARGER,
+                                        MatchMode.NEXT_SMALLER])
+@pytest.mark.parametrize("search_mode", list(SearchMode))
+def test_xmatch_many(data, match_mode, search_mode):
+    """Test that xmatch_many returns the same indices as repeated xmatch calls."""
+    binary = search_mode in (SearchMode.BINARY_FROM_FIRST, SearchMode.BINARY_FROM_LAST)
+    lookup_array = np.sort(np.array(data)) if binary else np.array(data)
+    lookup_values = [209, 10, 1, 0, 956, 1000, 500, 27, 133]
+
+    expected = [xmatch(val, lookup_array, match_mode, search_mode) for val in lookup_values]
+    expected = [NOT_FOUND if idx is None else idx for idx in expected]
+
+    result = xmatch_many(lookup_values, lookup_array, match_mode, search_mode)
+
+    assert result.dtype.kind == "i"
+    assert result.tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "lookup_values, match_mode, search_mode, expected_result",
+    [
+        ([".*Blvd$", ".*Boulvd$", ".*Rd$"], MatchMode.REGEX, SearchMode.FROM_FIRST,
+         [2, NOT_FOUND, 1]),
+        (["* Blvd", "* Rd"], MatchMode.WILDCARD, SearchMode.FROM_LAST, [28, 22]),
+    ]
+)
+def test_xmatch_many_text(text_lookup_data, lookup_values, match_mode,
+                          search_mode, expected_result):
+    """Test xmatch_many with regex and wildcard lookup values."""
+    lookup_array = np.array([street for street, _, _ in text_lookup_data])
+
+    result = xmatch_many(lookup_values, lookup_array, match_mode, search_mode)
+
+    assert result.tolist() == expected_result
+
+
+def test_xmatch_many_empty_lookup_values(data):
+    """Test that xmatch_many returns an empty index array for no lookup values."""
+    result = xmatch_many([], np.array(data))
+
+    assert result.shape == (0,)
+
+
+def test_xmatch_many_2d_lookup_values(data):
+    """Test that xmatch_many raises ValueError when lookup_values is not 1D."""
+    with pytest.raises(ValueError, match="lookup_values must be 1D"):
+        xmatch_many([[1, 2], [3, 4]], np.array(data))
+
+# test exact matches on read-only and frozen arrays; frozen ones use the occurrence tables
+@pytest.mark.parametrize("search_mode, expected_result", [
+    (SearchMode.FROM_FIRST, [17, 10, None, 0]),
+    (SearchMode.FROM_LAST, [30, 10, None, 0]),
+])
+def test_xmatch_exact_read_only(data, search_mode, expected_result):
+    """Test that exact matches on read-only arrays agree with the flatnonzero path."""
+    lookup_array = np.array(data)
+    read_only_array = lookup_array.copy()
+    read_only_array.flags.writeable = False
+    frozen_array = freeze(lookup_array.copy())
+
+    for lookup_value, expected in zip([209, 11, 1000, 133], expected_result):
+        assert xmatch(lookup_value, read_only_array, search_mode=search_mode) == expected
+        assert xmatch(lookup_value, frozen_array, search_mode=search_mode) == expected
+        assert xmatch(lookup_value, lookup_array, search_mode=search_mode) == expected
+
+# test that every search path returns a Python int
+@pytest.mark.parametrize("match_mode", [MatchMode.EXACT, MatchMode.NEXT_LARGER])
+@pytest.mark.parametrize("search_mode", list(SearchMode))
+def test_xmatch_returns_int(match_mode, search_mode):
+    """Test that xmatch returns an int whether or not the lookup array is frozen."""
+    lookup_array = np.array([1, 3, 3, 5])
+
+    for array in (lookup_array, freeze(lookup_array.copy())):
+        result = xmatch(3, array, match_mode, search_mode)
+        assert type(result) is int
+
+# test that strings and numbers cannot be ordered against each other
+@pytest.mark.parametrize("lookup_value, lookup_array", [
+    ("1", np.array([0, 1, 2])),
+    (1, np.array(["a", "b"])),
+])
+@pytest.mark.parametrize("match_mode", [MatchMode.NEXT_LARGER, MatchMode.NEXT_SMALLER])
+def test_xmatch_approximate_mismatched_types(lookup_value, lookup_array, match_mode):
+    """Test that approximate matches of strings against numbers raise, as in Python."""
+    with pytest.raises(TypeError, match="cannot be ordered"):
+        xmatch(lookup_value, lookup_array, match_mode)
+    with pytest.raises(TypeError, match="cannot be ordered"):
+        xmatch_many([lookup_value], lookup_array, match_mode)
+    assert xmatch(lookup_value, lookup_array) is None
+
+@pytest.mark.parametrize("lookup_value, expected_pattern", [
+    ("* Blvd", r".*\ Blvd"),
+    ("INV2024??", "INV2024.."),
+    ("100~%", "100%"),
+    ("what~?", r"what\?"),
+    ("~*star*", r"\*star.*"),
+    ("tilde~~", r"tilde\~"),
+    ("trailing~", r"trailing\~"),
+])
+def test_wildcard_to_regex(lookup_value, expected_pattern):
+    """Test the translation of Excel wildcards, including tilde escapes, to regex."""
+    assert wildcard_to_regex(lookup_value) == expected_pattern
+
+
+@pytest.mark.parametrize("lookup_value, search_mode, expected_result", [
+    ("what~?", SearchMode.FROM_FIRST, 1),
+    ("what?", SearchMode.FROM_FIRST, 0),
+    ("what?", SearchMode.FROM_LAST, 2),
+    ("~*", SearchMode.FROM_FIRST, 3),
+    ("*", SearchMode.FROM_LAST, 4),
+    ("WHAT!", SearchMode.FROM_FIRST, 0),
+    ("nothing", SearchMode.FROM_FIRST, None),
+])
+def test_xmatch_wildcard_escapes(lookup_value, search_mode, expected_result):
+    """Test wildcard matches with escaped wildcards, case and search direction."""
+    lookup_array = np.array(["what!", "what?", "whats", "*", "any"], dtype=object)
+
+    assert xmatch(lookup_value, lookup_array, MatchMode.WILDCARD, search_mode) == expected_result
+
+
+def test_xmatch_pattern_scan_large_array(capsys):
+    """Test that pattern matches scan across chunks and do not write to stdout."""
+    lookup_array = np.array([f"ID-{i:06d}" for i in range(3 * SCAN_CHUNK_SIZE + 5)])
+
+    assert xmatch("ID-0100??", lookup_array, MatchMode.WILDCARD) == 10000
+    assert xmatch("ID-0100??", lookup_array, MatchMode.WILDCARD, SearchMode.FROM_LAST) == 10099
+    assert xmatch(r"ID-\d+5$", lookup_array, MatchMode.REGEX, SearchMode.FROM_LAST) == 12285
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("lookup_value, match_mode, expected_result", [
+    ("ab*", MatchMode.WILDCARD, 0),
+    ("AB*", MatchMode.WILDCARD, 0),
+    ("ab.*", MatchMode.REGEX, 1),
+    ("AB.*", MatchMode.REGEX, 0),
+    ("Ab.", MatchMode.REGEX, None),
+])
+def test_xmatch_pattern_case(lookup_value, match_mode, expected_result):
+    """Test that wildcards ignore case while regular expressions are case-sensitive."""
+    lookup_array = np.array(["ABC", "abc"])
+
+    assert xmatch(lookup_value, lookup_array, match_mode) == expected_result
+
+
+def test_compile_pattern_is_cached():
+    """Test that compiled patterns are reused across calls."""
+    compile_pattern.cache_clear()
+    lookup_array = np.array(["a", "b"])
+
+    for _ in range(3):
+        xmatch("b*", lookup_array, MatchMode.WILDCARD)
+
+    assert compile_pattern.cache_info().hits == 2
+
+
+@pytest.mark.parametrize("lookup_value, expected_prefix", [
+    ("ACME-*", "ACME-"),
+    ("INV2024??", "INV2024"),
+    ("*Blvd", ""),
+    ("100~*-*", "100*-"),
+    ("plain", "plain"),
+])
+def test_wildcard_prefix(lookup_value, expected_prefix):
+    """Test the extraction of the literal prefix of a wildcard pattern."""
+    assert wildcard_prefix(lookup_value) == expected_prefix
+
+
+@pytest.mark.parametrize("lookup_value", ["acme-*", "ACME-1?", "INV2024??", "inv20241*",
+                                          "B*", "ZZZ*", "~*A*", "ACME-10"])
+@pytest.mark.parametrize("search_mode", [SearchMode.FROM_FIRST, SearchMode.FROM_LAST])
+def test_xmatch_wildcard_prefix_range(lookup_value, search_mode):
+    """Test that prefix-narrowed wildcard matches agree with a full scan."""
+    rng = np.random.default_rng(0)
+    values = [f"ACME-{i}" for i in range(40)] + [f"inv2024{i:02d}" for i in range(40)]
+    values += ["b", "Bee", "*A*", "acme", "INV2024"]
+    lookup_array = np.array(rng.permutation(values))
+
+    regex = compile_pattern(lookup_value, MatchMode.WILDCARD)
+    positions = [i for i, value in enumerate(lookup_array.tolist()) if regex.match(value)]
+    expected = None
+    if positions:
+        expected = positions[0] if search_mode == SearchMode.FROM_FIRST else positions[-1]
+
+    assert xmatch(lookup_value, lookup_array, MatchMode.WILDCARD, search_mode) == expected
+
+
+def test_xmatch_wildcard_prefix_non_ascii():
+    """Test that non-ASCII arrays fall back to a full scan for case-insensitive matches."""
+    lookup_array = np.array(["ſtart", "start", "Start"])
+
+    assert xmatch("start*", lookup_array, MatchMode.WILDCARD) == 0
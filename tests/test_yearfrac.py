@@ -0,0 +1,165 @@
+"""Tests for the YEARFRAC and DATEDIF functions in the date module."""
+import calendar
+from datetime import date as pydate, datetime
+import time
+import pytest
+import numpy as np
+from excel_in_python.date import datedif, yearfrac
+
+
+def reference_yearfrac(start, end, basis):
+    """A scalar YEARFRAC, written after Excel's documented day count conventions."""
+    start, end = min(start, end), max(start, end)
+    days = (end - start).days
+    year1, month1, day1 = start.year, start.month, start.day
+    year2, month2, day2 = end.year, end.month, end.day
+
+    def is_feb_end(day):
+        return day.month == 2 and day.day == calendar.monthrange(day.year, 2)[1]
+
+    if basis == 0:
+        if day1 == 31 and day2 == 31:
+            day1 = day2 = 30
+        elif day1 == 31:
+            day1 = 30
+        elif day1 == 30 and day2 == 31:
+            day2 = 30
+        elif is_feb_end(start) and is_feb_end(end):
+            day1 = day2 = 30
+        elif is_feb_end(start):
+            day1 = 30
+        return ((year2 - year1) * 360 + (month2 - month1) * 30 + day2 - day1) / 360
+    if basis == 1:
+        if year1 == year2 or (year1 + 1 == year2 and (month1, day1) >= (month2, day2)):
+            leap_day = (
+                (year1 == year2 and calendar.isleap(year1))
+                or (calendar.isleap(year1) and start < pydate(year1, 3, 1))
+                or (calendar.isleap(year2) and (month2, day2) >= (2, 29))
+            )
+            return days / (366 if leap_day else 365)
+        years_days = (pydate(year2 + 1, 1, 1) - pydate(year1, 1, 1)).days
+        return days / (years_days / (year2 - year1 + 1))
+    if basis == 2:
+        return days / 360
+    if basis == 3:
+        return days / 365
+    day1, day2 = min(day1, 30), min(day2, 30)
+    return ((year2 - year1) * 360 + (month2 - month1) * 30 + day2 - day1) / 360
+
+
+def random_date_pairs(size, seed=0):
+    """Returns random start and end datetime64[D] arrays, rich in month ends."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("1990-01-01") + rng.integers(0, 15_000, size)
+    end = start + rng.integers(-800, 800, size)
+    month_ends = (start.astype("datetime64[M]") + 1).astype("datetime64[D]") - 1
+    start[::3] = month_ends[::3]
+    return start, end
+
+
+@pytest.mark.parametrize(
+    "basis, expected",
+    [(0, 0.58055556), (1, 0.57650273), (2, 0.58611111), (3, 0.57808219), (4, 0.58055556)]
+)
+def test_yearfrac(basis, expected):
+    """Test YEARFRAC against the examples in Excel's documentation."""
+    assert yearfrac(datetime(2012, 1, 1), datetime(2012, 7, 30), basis) == pytest.approx(
+        expected, abs=1e-8)
+    assert yearfrac(datetime(2012, 7, 30), datetime(2012, 1, 1), basis) == pytest.approx(
+        expected, abs=1e-8)
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, expected",
+    [
+        (datetime(2011, 3, 1), datetime(2012, 2, 29), 365 / 366),
+        (datetime(2011, 3, 1), datetime(2012, 2, 28), 364 / 365),
+        (datetime(2012, 2, 29), datetime(2013, 2, 28), 365 / 366),
+        (datetime(2012, 3, 1), datetime(2013, 2, 28), 364 / 365),
+    ]
+)
+def test_yearfrac_actual_leap_day(start_date, end_date, expected):
+    """Test that the actual/actual basis counts a year ending on February 29 as 366 days."""
+    assert yearfrac(start_date, end_date, 1) == pytest.approx(expected, abs=1e-12)
+
+
+@pytest.mark.parametrize("basis", [0, 1, 2, 3, 4])
+def test_yearfrac_matches_reference(basis):
+    """Test that YEARFRAC matches the scalar reference over many random date pairs."""
+    start, end = random_date_pairs(5_000)
+    expected = [reference_yearfrac(s, e, basis) for s, e in zip(start.tolist(), end.tolist())]
+
+    np.testing.assert_allclose(yearfrac(start, end, basis), expected, rtol=0, atol=1e-12)
+
+
+def test_yearfrac_arrays():
+    """Test that YEARFRAC broadcasts its dates and gives NaN for invalid dates."""
+    start = np.array(["2024-01-01", "NaT"], dtype="datetime64[D]")
+    ends = np.array([["2024-07-01"], ["2025-01-01"]], dtype="datetime64[D]")
+
+    np.testing.assert_allclose(yearfrac(start, ends, 3),
+                               [[182 / 365, np.nan], [366 / 365, np.nan]])
+    np.testing.assert_allclose(yearfrac(np.array([45292.0]), np.array([45658.0]), 2),
+                               [366 / 360])
+
+
+@pytest.mark.parametrize("basis", [5, -1, 1.5, "1", True])
+def test_yearfrac_invalid_basis(basis):
+    """Test that an invalid basis raises an error."""
+    with pytest.raises(ValueError, match="basis must be 0, 1, 2, 3 or 4."):
+        yearfrac(datetime(2024, 1, 1), datetime(2024, 7, 1), basis)
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, unit, expected",
+    [
+        (datetime(2001, 1, 1), datetime(2003, 1, 1), "Y", 2),
+        (datetime(2001, 6, 1), datetime(2002, 8, 15), "D", 440),
+        (datetime(2001, 6, 1), datetime(2002, 8, 15), "YD", 75),
+        (datetime(2001, 6, 1), datetime(2002, 8, 15), "md", 14),
+        (datetime(2001, 6, 1), datetime(2002, 5, 31), "M", 11),
+        (datetime(2001, 6, 1), datetime(2002, 5, 31), "YM", 11),
+        (datetime(2015, 1, 31), datetime(2015, 3, 1), "MD", -2),  # Excel's known MD quirk
+        (datetime(2020, 2, 29), datetime(2021, 2, 28), "Y", 0),
+        (datetime(2020, 2, 29), datetime(2021, 3, 1), "Y", 1),
+    ]
+)
+def test_datedif(start_date, end_date, unit, expected):
+    """Test DATEDIF with scalar dates."""
+    result = datedif(start_date, end_date, unit)
+    assert result == expected
+    assert isinstance(result, int)
+
+
+def test_datedif_arrays():
+    """Test that DATEDIF gives NaN where a date is invalid or start_date is after end_date."""
+    start = np.array(["2020-02-29", "NaT", "2021-01-01", "2020-03-15"], dtype="datetime64[D]")
+    end = np.datetime64("2020-12-31")
+
+    np.testing.assert_array_equal(datedif(start, end, "YD"), [306, np.nan, np.nan, 291])
+    assert datedif(start[[0, 3]], end, "M").dtype == np.int64
+
+
+def test_datedif_invalid():
+    """Test that invalid units and scalar dates raise errors."""
+    with pytest.raises(ValueError, match="unit must be one of"):
+        datedif(datetime(2020, 1, 1), datetime(2021, 1, 1), "W")
+    with pytest.raises(ValueError, match="start_date on or before end_date"):
+        datedif(datetime(2021, 1, 1), datetime(2020, 1, 1), "D")
+
+
+def test_yearfrac_speedup():
+    """Test that the vectorized YEARFRAC is much faster than the scalar reference."""
+    start, end = random_date_pairs(20_000, seed=1)
+    start_dates, end_dates = start.tolist(), end.tolist()
+
+    started = time.perf_counter()
+    expected = [reference_yearfrac(s, e, 1) for s, e in zip(start_dates, end_dates)]
+    reference_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = yearfrac(start, end, 1)
+    vectorized_time = time.perf_counter() - started
+
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12)
+    assert vectorized_time * 4 < reference_time